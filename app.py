@@ -4,10 +4,15 @@ Streamlit web application for AI Role Validator.
 Provides an interactive UI for uploading files and viewing validation results.
 """
 
-from config.config import FUZZY_MATCH_THRESHOLD, DEFAULT_XML_XPATH
+from config.config import (
+    FUZZY_MATCH_THRESHOLD,
+    DEFAULT_XML_XPATH,
+    PDF_INCREMENTAL_INDEX,
+    VALIDATE_ONLY
+)
 from src.role_comparer import RoleComparer
 from src.pdf_extractor_rag import RAGPDFExtractor
-from src.xml_parser import extract_roles_from_xml
+from src.pipeline import validate_concurrently
 import streamlit as st
 import os
 import tempfile
@@ -65,6 +70,14 @@ def display_sidebar():
             help="Minimum similarity score (0-100) for fuzzy matching"
         )
 
+        # Skip vector indexing unless Q&A is used
+        validate_only = st.toggle(
+            "Validation Only",
+            value=VALIDATE_ONLY,
+            help="Skip vector indexing (no embeddings, no ChromaDB writes). "
+                 "The PDF is indexed on demand if you ask a RAG question."
+        )
+
         st.divider()
 
         st.header("📚 How It Works")
@@ -91,10 +104,36 @@ def display_sidebar():
         - **Streamlit** - Web interface
         """)
 
-        return threshold
+        return threshold, validate_only
+
+
+def index_pdf(pdf_extractor, pdf_bytes, pdf_id):
+    """
+    Indexes an uploaded PDF into the vector store.
 
+    Args:
+        pdf_extractor: RAGPDFExtractor to index with
+        pdf_bytes: Raw PDF content
+        pdf_id: Identifier for the PDF's chunks
 
-def run_validation(xml_file, pdf_file, threshold):
+    Returns:
+        bool: True if indexing succeeded
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
+        tmp_pdf.write(pdf_bytes)
+        pdf_filepath = tmp_pdf.name
+
+    try:
+        # Incremental indexing re-embeds only changed pages, no clear needed
+        if not PDF_INCREMENTAL_INDEX:
+            pdf_extractor.clear_pdf_data(pdf_id)
+        return pdf_extractor.process_pdf(pdf_filepath, pdf_id)
+    finally:
+        if os.path.exists(pdf_filepath):
+            os.remove(pdf_filepath)
+
+
+def run_validation(xml_file, pdf_file, threshold, validate_only=VALIDATE_ONLY):
     """
     Executes the validation pipeline.
 
@@ -102,6 +141,7 @@ def run_validation(xml_file, pdf_file, threshold):
         xml_file: Uploaded XML file
         pdf_file: Uploaded PDF file
         threshold: Fuzzy matching threshold
+        validate_only: Skip vector indexing (deferred until a RAG question)
 
     Returns:
         dict: Validation results
@@ -115,66 +155,80 @@ def run_validation(xml_file, pdf_file, threshold):
         tmp_pdf.write(pdf_file.getvalue())
         pdf_filepath = tmp_pdf.name
 
+    indexing = None
     try:
         results = {}
 
-        # Step 1: Extract XML roles
-        with st.spinner("📝 Extracting roles from XML..."):
-            xml_roles = extract_roles_from_xml(xml_filepath, DEFAULT_XML_XPATH)
-            results['xml_roles'] = xml_roles
-
-            if not xml_roles:
-                st.warning("⚠️ No roles found in XML file. Check file format.")
-                return None
-
-        st.success(f"✅ Extracted {len(xml_roles)} roles from XML")
-
-        # Step 2: Initialize PDF extractor
         with st.spinner("🔧 Initializing AI components (LangChain + ChromaDB)..."):
             pdf_extractor = RAGPDFExtractor()
             results['pdf_extractor'] = pdf_extractor
 
-        st.success("✅ AI components initialized")
-
-        # Step 3: Process PDF
         pdf_id = "streamlit-upload"
+        results['pdf_id'] = pdf_id
+        results['pdf_indexed'] = False
+
+        if validate_only:
+            # Keep the upload so Q&A can index it later
+            results['pdf_bytes'] = pdf_file.getvalue()
+            st.info("⏭️ Validation only: vector indexing skipped")
+
+        # XML parsing, role extraction and indexing run concurrently;
+        # indexing may still be running when the comparison is done
+        with st.spinner("🔍 Extracting roles from XML and PDF using AI..."):
+            result, indexing = validate_concurrently(
+                xml_filepath,
+                pdf_filepath,
+                pdf_id=None if validate_only else pdf_id,
+                xml_role_xpath=DEFAULT_XML_XPATH,
+                fuzzy_threshold=threshold,
+                pdf_extractor=pdf_extractor
+            )
 
-        with st.spinner("🗑️ Clearing previous data..."):
-            pdf_extractor.clear_pdf_data(pdf_id)
-
-        with st.spinner("📊 Indexing PDF into vector store..."):
-            success = pdf_extractor.process_pdf(pdf_filepath, pdf_id)
-            if not success:
-                st.error("❌ Failed to process PDF")
-                return None
+        xml_roles = result['xml_roles']
+        results['xml_roles'] = xml_roles
+        if not xml_roles:
+            if result.get('error') and result['error'] != "No XML roles":
+                st.error(f"❌ {result['error']}")
+            st.warning("⚠️ No roles found in XML file. Check file format.")
+            return None
 
-        st.success("✅ PDF indexed successfully")
+        st.success(f"✅ Extracted {len(xml_roles)} roles from XML")
 
-        with st.spinner("🔍 Extracting roles from PDF using AI..."):
-            pdf_roles = pdf_extractor.extract_roles_from_pdf(pdf_filepath)
-            results['pdf_roles'] = pdf_roles
+        if result['status'] != "ok":
+            st.error(f"❌ Failed to process PDF: {result['error']}")
+            return None
 
-            if not pdf_roles:
-                st.warning("⚠️ No roles found in PDF. Check PDF content.")
+        pdf_roles = result['pdf_roles']
+        results['pdf_roles'] = pdf_roles
+        if not pdf_roles:
+            st.warning("⚠️ No roles found in PDF. Check PDF content.")
 
         st.success(f"✅ Extracted {len(pdf_roles)} roles from PDF")
 
-        # Step 4: Compare roles
-        with st.spinner("⚖️ Comparing roles with fuzzy matching..."):
-            comparer = RoleComparer(fuzzy_threshold=threshold)
-
-            is_incorrect, matched_roles, incorrect_pdf_roles, fuzzy_matches = comparer.compare_roles(
-                xml_roles, pdf_roles
-            )
+        results['is_incorrect'] = result['is_incorrect']
+        results['matched_roles'] = result['matched_roles']
+        results['incorrect_pdf_roles'] = result['incorrect_roles']
+        results['fuzzy_matches'] = result['fuzzy_matches']
+        comparer = RoleComparer(fuzzy_threshold=threshold)
+        results['comparer'] = comparer
 
-            results['is_incorrect'] = is_incorrect
-            results['matched_roles'] = matched_roles
-            results['incorrect_pdf_roles'] = incorrect_pdf_roles
-            results['fuzzy_matches'] = fuzzy_matches
-            results['comparer'] = comparer
+        # Keep the full score matrix so threshold changes re-classify
+        # without re-running extraction (see rescore_results)
+        results['role_scores'] = comparer.score_roles(xml_roles, pdf_roles)
+        results['threshold'] = threshold
 
         st.success("✅ Comparison complete")
 
+        if result.get('cached'):
+            st.info("⚡ Result served from the validation cache")
+            # Nothing was indexed; Q&A indexes the upload on demand
+            results['pdf_bytes'] = pdf_file.getvalue()
+
+        if indexing is not None:
+            # Q&A waits for this future before querying
+            results['indexing'] = indexing
+            st.info("📊 Indexing PDF into vector store in the background")
+
         return results
 
     except Exception as e:
@@ -184,11 +238,43 @@ def run_validation(xml_file, pdf_file, threshold):
         return None
 
     finally:
-        # Cleanup temporary files
+        # Cleanup temporary files (the PDF once background indexing is done)
         if os.path.exists(xml_filepath):
             os.remove(xml_filepath)
-        if os.path.exists(pdf_filepath):
-            os.remove(pdf_filepath)
+        if indexing is not None:
+            indexing.add_done_callback(lambda _: _remove_file(pdf_filepath))
+        else:
+            _remove_file(pdf_filepath)
+
+
+def _remove_file(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+def rescore_results(results, threshold):
+    """
+    Re-derives matched / incorrect roles for a new threshold from the
+    stored score matrix (no extraction, LLM call or re-indexing).
+
+    Args:
+        results: Validation results from run_validation()
+        threshold: Fuzzy matching threshold to apply
+    """
+    if results.get('threshold') == threshold or 'role_scores' not in results:
+        return
+
+    comparer = results['comparer']
+    is_incorrect, matched_roles, incorrect_pdf_roles, fuzzy_matches = comparer.classify(
+        results['role_scores'], threshold
+    )
+    comparer.fuzzy_threshold = threshold
+
+    results['is_incorrect'] = is_incorrect
+    results['matched_roles'] = matched_roles
+    results['incorrect_pdf_roles'] = incorrect_pdf_roles
+    results['fuzzy_matches'] = fuzzy_matches
+    results['threshold'] = threshold
 
 
 def display_results(results):
@@ -321,7 +407,7 @@ def main():
     """Main application logic."""
     initialize_session_state()
     display_header()
-    threshold = display_sidebar()
+    threshold, validate_only = display_sidebar()
 
     # File upload section
     st.header("📁 Upload Files")
@@ -357,7 +443,8 @@ def main():
         with col2:
             if st.button("🚀 Start Validation", type="primary", use_container_width=True):
                 with st.status("Processing...", expanded=True) as status:
-                    results = run_validation(xml_file, pdf_file, threshold)
+                    results = run_validation(
+                        xml_file, pdf_file, threshold, validate_only)
 
                     if results:
                         st.session_state.validation_results = results
@@ -373,6 +460,8 @@ def main():
     # Display results if available
     if st.session_state.processing_complete and st.session_state.validation_results:
         st.divider()
+        # Moving the threshold slider re-classifies the stored scores
+        rescore_results(st.session_state.validation_results, threshold)
         display_results(st.session_state.validation_results)
 
         # Optional: RAG Query Demo
@@ -388,11 +477,31 @@ def main():
             )
 
             if query and st.button("Ask Question"):
+                results = st.session_state.validation_results
+                pdf_extractor = results['pdf_extractor']
+
+                # Wait for background indexing started by the validation run
+                indexing = results.pop('indexing', None)
+                if indexing is not None:
+                    with st.spinner("📊 Finishing PDF indexing..."):
+                        if not indexing.result():
+                            st.error("❌ Failed to index PDF")
+                            return
+                    results['pdf_indexed'] = True
+
+                # Validation-only runs index the PDF on the first question
+                if not results.get('pdf_indexed'):
+                    with st.spinner("📊 Indexing PDF into vector store..."):
+                        if not index_pdf(pdf_extractor, results['pdf_bytes'], results['pdf_id']):
+                            st.error("❌ Failed to index PDF")
+                            return
+                    results['pdf_indexed'] = True
+                    results.pop('pdf_bytes', None)
+
                 with st.spinner("🔍 Searching document..."):
-                    pdf_extractor = st.session_state.validation_results['pdf_extractor']
                     answer = pdf_extractor.query_pdf_with_rag(
                         query,
-                        pdf_id="streamlit-upload",
+                        pdf_id=results['pdf_id'],
                         top_k=5
                     )
 
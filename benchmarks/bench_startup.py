@@ -0,0 +1,121 @@
+# benchmarks/bench_startup.py
+"""
+Startup benchmark and import-time regression check for the CLI.
+
+Runs `python -m src.main --help` and `python -m src.main inspect-xml` in
+fresh interpreters, reports the median wall time of each, and checks that
+importing src.main does not load the heavy LLM / vector store / PDF stack.
+Exits with status 1 if a command exceeds the time budget or a heavy module
+is imported eagerly, so it can run as a CI gate.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--budget 1.0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Modules that must only be imported by the code paths that use them
+HEAVY_MODULES = [
+    "langchain_openai",
+    "langchain_chroma",
+    "chromadb",
+    "langchain_core",
+    "fitz",
+    "pymupdf",
+    "thefuzz",
+    "numpy",
+    "rapidfuzz",
+]
+
+SAMPLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<roles>
+    <role>Software Engineer</role>
+    <role>Project Manager</role>
+    <role>Data Scientist</role>
+</roles>"""
+
+
+def time_command(args, runs: int, env) -> float:
+    """
+    Returns the median wall time in seconds of running a command.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            args, cwd=PROJECT_ROOT, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def eagerly_imported_modules(env) -> list:
+    """
+    Returns the heavy modules loaded by `import src.main`.
+    """
+    probe = (
+        "import json, sys\n"
+        "import src.main\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=PROJECT_ROOT, env=env,
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="Maximum median seconds per command")
+    args = parser.parse_args()
+
+    # No API key: XML-only commands must not need one
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "roles.xml")
+        with open(xml_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_XML)
+
+        commands = {
+            "--help": [sys.executable, "-m", "src.main", "--help"],
+            "inspect-xml": [sys.executable, "-m", "src.main", "inspect-xml", xml_path],
+        }
+
+        baseline = time_command([sys.executable, "-c", "pass"], args.runs, env)
+        print(f"Interpreter startup: {baseline:.3f}s")
+
+        failed = False
+        for name, command in commands.items():
+            elapsed = time_command(command, args.runs, env)
+            status = "ok" if elapsed <= args.budget else "OVER BUDGET"
+            failed |= elapsed > args.budget
+            print(f"{name:>12}: {elapsed:.3f}s (budget {args.budget:.2f}s) {status}")
+
+    eager = eagerly_imported_modules(env)
+    if eager:
+        failed = True
+        print(f"Heavy modules imported by src.main: {', '.join(eager)}")
+    else:
+        print("No heavy modules imported by src.main")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
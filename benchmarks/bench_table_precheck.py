@@ -0,0 +1,100 @@
+# benchmarks/bench_table_precheck.py
+"""
+Benchmark for the table-presence precheck in src/pdf_pages.py.
+
+Generates two synthetic PDFs (a mostly-text document and a table-heavy one),
+extracts them with and without the precheck, and reports pages/sec along
+with table recall (tables found with the precheck vs. without it).
+
+Usage:
+    python benchmarks/bench_table_precheck.py [--pages 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pdf_pages import extract_page_range  # noqa: E402
+
+ROLES = ["Software Engineer", "Project Manager", "Data Scientist",
+         "QA Tester", "Business Analyst", "Senior Developer"]
+
+
+def build_fixture(path: str, pages: int, table_every: int) -> None:
+    """
+    Writes a PDF where every `table_every`-th page holds a ruled roles table.
+    """
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        paragraph = (
+            f"Section {page_num}. The delivery team is staffed by a "
+            f"{ROLES[page_num % len(ROLES)]} who reports weekly. "
+        ) * 6
+        page.insert_textbox(fitz.Rect(72, 72, 540, 300), paragraph, fontsize=10)
+
+        if page_num % table_every == 0:
+            rows = [["Role", "Headcount", "Location"]] + [
+                [role, str(i + 1), "Remote"] for i, role in enumerate(ROLES)
+            ]
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    rect = fitz.Rect(72 + c * 150, 320 + r * 20,
+                                     72 + (c + 1) * 150, 320 + (r + 1) * 20)
+                    page.draw_rect(rect)
+                    page.insert_text((rect.x0 + 3, rect.y1 - 6), cell, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def run(path: str, pages: int, table_precheck: bool):
+    start = time.perf_counter()
+    extracted = extract_page_range(path, 0, pages, table_precheck=table_precheck)
+    elapsed = time.perf_counter() - start
+    tables = [table for page in extracted for table in page.tables]
+    return pages / elapsed, tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    fixtures = {
+        "mostly-text (1 table page in 10)": 10,
+        "table-heavy (every page)": 1,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, table_every in fixtures.items():
+            path = os.path.join(tmp_dir, f"fixture_{table_every}.pdf")
+            build_fixture(path, args.pages, table_every)
+
+            baseline_rate, baseline_tables = run(path, args.pages, False)
+            precheck_rate, precheck_tables = run(path, args.pages, True)
+
+            found = sum(1 for t in baseline_tables if t in precheck_tables)
+            recall = found / len(baseline_tables) if baseline_tables else 1.0
+
+            print(f"\n📊 {label}, {args.pages} pages")
+            print(f"  • find_tables on every page: {baseline_rate:8.1f} pages/sec")
+            print(f"  • with precheck:             {precheck_rate:8.1f} pages/sec"
+                  f"  ({precheck_rate / baseline_rate:.2f}x)")
+            print(f"  • tables: {len(baseline_tables)} baseline, "
+                  f"{len(precheck_tables)} with precheck, recall {recall:.1%}")
+
+            if precheck_tables != baseline_tables:
+                print("❌ Precheck changed table output")
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
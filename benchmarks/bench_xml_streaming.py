@@ -0,0 +1,102 @@
+# benchmarks/bench_xml_streaming.py
+"""
+Peak-memory benchmark for streaming XML role extraction.
+
+Generates a large synthetic role catalog, then extracts roles and
+statistics in fresh interpreters with the tree parser (etree.parse +
+XPath) and with streaming iterparse. Reports peak RSS, wall time and
+whether both modes return the same roles.
+
+Usage:
+    python benchmarks/bench_xml_streaming.py [--roles 500000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+TITLES = ["Software Engineer", "Project Manager", "Data Scientist",
+          "QA Tester", "Business Analyst", "Senior Developer"]
+
+# Runs in a fresh interpreter so each mode's peak RSS is measured alone
+PROBE = """
+import hashlib, json, resource, sys, time
+from src.xml_parser import extract_roles_from_xml, get_xml_statistics
+
+path, streaming = sys.argv[1], sys.argv[2] == "stream"
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+roles = extract_roles_from_xml(path, "//role/text()", streaming=streaming)
+stats = get_xml_statistics(path, "//role/text()", streaming=streaming)
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+print(json.dumps({
+    "seconds": elapsed,
+    "peak_mb": peak / scale,
+    "growth_mb": (peak - baseline) / scale,
+    "roles": len(roles),
+    "roles_sha256": hashlib.sha256("\\n".join(roles).encode()).hexdigest(),
+    "total_elements": stats["total_elements"],
+}))
+"""
+
+
+def build_fixture(path: str, roles: int) -> None:
+    """
+    Writes a catalog of departments holding role elements with attributes.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<catalog>\n')
+        for i in range(roles):
+            if i % 100 == 0:
+                if i:
+                    f.write("  </department>\n")
+                f.write(f'  <department id="d{i // 100}">\n')
+            title = TITLES[i % len(TITLES)]
+            f.write(f'    <role id="r{i}" level="L{i % 7}">{title} {i}</role>\n')
+        f.write("  </department>\n</catalog>\n")
+
+
+def run_mode(path: str, mode: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, path, mode],
+        cwd=PROJECT_ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--roles", type=int, default=500000)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        sys.exit("Peak RSS is measured with the resource module (POSIX only)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "catalog.xml")
+        build_fixture(path, args.roles)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Catalog: {args.roles} roles, {size_mb:.1f} MB")
+
+        results = {mode: run_mode(path, mode) for mode in ("tree", "stream")}
+
+    for mode, result in results.items():
+        print(f"{mode:>7}: peak RSS {result['peak_mb']:8.1f} MB "
+              f"(+{result['growth_mb']:.1f} MB while parsing), "
+              f"{result['seconds']:.2f}s, {result['roles']} roles")
+
+    same = (results["tree"]["roles_sha256"] == results["stream"]["roles_sha256"]
+            and results["tree"]["total_elements"] == results["stream"]["total_elements"])
+    print(f"Identical roles and statistics: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# benchmarks/eval_span_filter.py
+"""
+Token savings vs. role recall of the candidate-span pre-filter.
+
+Generates a fixture corpus of documents shaped like extractor output
+(prose pages, role mentions in sentences and in tables, catalog roles,
+abbreviated variants and roles missing from the catalog), filters each
+one at several budgets and reports how many prompt tokens are saved and
+what share of the role mentions survive. A mention that is filtered out
+can no longer be found by the LLM, so mention recall is an upper bound
+on extraction recall; no API calls are made.
+
+Usage:
+    python benchmarks/eval_span_filter.py [--documents 40] [--pages 12]
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.extraction_cache import ExtractedDocument, ExtractedPage  # noqa: E402
+from src.role_catalog import RoleCatalogIndex  # noqa: E402
+from src.span_filter import select_spans, estimate_tokens  # noqa: E402
+
+CATALOG = ["Software Engineer", "Project Manager", "Data Scientist",
+           "Quality Assurance Analyst", "Business Analyst", "Senior Developer",
+           "Solutions Architect", "Database Administrator", "Scrum Master",
+           "Product Owner", "Technical Writer", "Security Consultant"]
+
+# Spellings that appear in documents: catalog roles, variants and roles
+# the catalog does not have (which only the LLM can report)
+MENTIONS = CATALOG + ["Sr. Developer", "Project Mgr", "QA Analyst",
+                      "UX Designer", "DevOps Engineer", "Release Coordinator",
+                      "Head of Marketing", "Data Engineer", "Chief of Staff",
+                      "Program Sponsor"]
+
+ROLE_SENTENCES = [
+    "The delivery is owned by the {role}, who reports to the steering committee.",
+    "Our {role} will review the acceptance criteria every sprint.",
+    "Responsibilities of the {role} include estimation and risk tracking.",
+    "A dedicated {role} is assigned to the migration workstream.",
+    "Escalations go to the {role} on call.",
+]
+
+FILLER_SENTENCES = [
+    "The contract term starts on the effective date and runs for twelve months.",
+    "Invoices are payable within thirty days of receipt.",
+    "All deliverables remain the property of Northwind Holdings.",
+    "The parties agree to meet quarterly at the London office.",
+    "Service levels are measured monthly against the agreed baseline.",
+    "Confidential information must not be disclosed to third parties.",
+    "Change requests follow the procedure described in Schedule B.",
+    "This agreement is governed by the laws of the State of New York.",
+    "Travel expenses are reimbursed at cost with prior approval.",
+    "Performance reports are shared through the Contoso Portal.",
+    "Either party may terminate with ninety days written notice.",
+    "Data is stored in the European Union region.",
+    "Any engineering changes require approval from the account team.",
+    "Managed services are billed under the Master Services Agreement.",
+]
+
+
+def build_document(rng: random.Random, doc_id: int, pages: int) -> Tuple[ExtractedDocument, List[str]]:
+    """
+    Builds one document and the role mentions it contains.
+    """
+    mentions: List[str] = []
+    document_pages = []
+    for page_number in range(pages):
+        sentences = [rng.choice(FILLER_SENTENCES) for _ in range(rng.randint(25, 40))]
+        # A couple of role sentences per page, at random positions
+        for _ in range(rng.randint(0, 2)):
+            role = rng.choice(MENTIONS)
+            mentions.append(role)
+            sentences.insert(rng.randrange(len(sentences) + 1),
+                             rng.choice(ROLE_SENTENCES).format(role=role))
+
+        blocks = [" ".join(sentences[i:i + 6]) for i in range(0, len(sentences), 6)]
+
+        tables = []
+        if page_number % 4 == 1:
+            rows = ["Name | Role | Location"]
+            for row in range(rng.randint(3, 6)):
+                role = rng.choice(MENTIONS)
+                mentions.append(role)
+                rows.append(f"Person {doc_id}-{page_number}-{row} | {role} | Remote")
+            tables.append(
+                "\n--- TABLE: ROLES AND INFORMATION ---\n"
+                + "\n".join(rows)
+                + "\n--- END OF TABLE ---\n"
+            )
+
+        document_pages.append(ExtractedPage(page_number, blocks, tables))
+
+    document = ExtractedDocument(pdf_hash=str(doc_id), source=f"doc{doc_id}.pdf",
+                                 pages=document_pages)
+    return document, mentions
+
+
+def count_tokens_function():
+    """
+    Returns a token counter: tiktoken when its encoding is available
+    locally, otherwise the span filter's length-based estimate.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+    except Exception:
+        return estimate_tokens, "estimated (4 chars/token)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--neighbors", type=int, default=1)
+    parser.add_argument("--budgets", type=int, nargs="+",
+                        default=[2000, 4000, 8000, 12000, 16000],
+                        help="Character budgets to evaluate")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [build_document(rng, doc_id, args.pages) for doc_id in range(args.documents)]
+    vocabulary = RoleCatalogIndex(CATALOG).vocabulary
+    count_tokens, token_source = count_tokens_function()
+
+    full_tokens = sum(count_tokens(document.text) for document, _ in corpus)
+    total_mentions = sum(len(mentions) for _, mentions in corpus)
+    average_chars = sum(len(document.text) for document, _ in corpus) / len(corpus)
+    print(f"Corpus: {len(corpus)} documents, {average_chars:,.0f} chars on average, "
+          f"{total_mentions} role mentions")
+    print(f"Tokens: {token_source}; unfiltered prompts total {full_tokens:,} tokens\n")
+
+    print(f"{'budget':>8} {'tokens sent':>12} {'saved':>7} {'mention recall':>15} "
+          f"{'docs w/ full recall':>20}")
+    for budget in args.budgets:
+        sent_tokens = 0
+        kept_mentions = 0
+        complete_documents = 0
+        for document, mentions in corpus:
+            selection = select_spans(document.text, budget, vocabulary, args.neighbors)
+            sent_tokens += count_tokens(selection.text)
+            # Count occurrences, since a role can be mentioned several times
+            kept = 0
+            for role in set(mentions):
+                kept += min(mentions.count(role), selection.text.count(role))
+            kept_mentions += kept
+            complete_documents += kept == len(mentions)
+
+        saved = (1 - sent_tokens / full_tokens) * 100
+        recall = kept_mentions / total_mentions * 100 if total_mentions else 100.0
+        print(f"{budget:>8} {sent_tokens:>12,} {saved:>6.1f}% {recall:>14.1f}% "
+              f"{complete_documents:>13}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,51 +2,50 @@
 """
 Configuration module for AI Role Validator.
 Loads all environment variables and provides centralized configuration management.
+
+Importing this module reads no settings: get_settings() loads the .env
+file on its first call and builds a Settings object. The module-level
+names (e.g. FUZZY_MATCH_THRESHOLD) are resolved from that object on
+access, so `from config.config import X` works but reads the settings
+when that import statement runs and binds the value at that point.
+Modules imported at CLI startup (src.main, src.instrumentation,
+src.xml_parser, src.extraction_cache, src.batch) therefore call
+get_settings() when a value is needed instead. Values that only some
+code paths need (the OpenAI API key) are validated by those code paths.
 """
 
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Optional
 
-# Load environment variables from .env file
-load_dotenv()
 
-# ========================================
-# OpenAI Configuration
-# ========================================
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
 
-# Validate OpenAI API key presence
-if not OPENAI_API_KEY:
-    raise ValueError(
-        "OPENAI_API_KEY not found in environment variables. "
-        "Please set it in your .env file."
-    )
 
-# ========================================
-# Vector Database Configuration
-# ========================================
-VECTOR_DB = os.getenv("VECTOR_DB", "chroma").lower()
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
 
-# ChromaDB specific configuration
-CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_store")
-CHROMA_COLLECTION_NAME = "role_validator"
 
-# ========================================
-# PDF Processing Configuration
-# ========================================
-PDF_CHUNK_SIZE = int(os.getenv("PDF_CHUNK_SIZE", 1000))
-PDF_CHUNK_OVERLAP = int(os.getenv("PDF_CHUNK_OVERLAP", 100))
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
 
 # ========================================
-# LLM Configuration
+# Constants (not configurable)
 # ========================================
-# Model selection for different tasks
-# Cost-effective for role extraction
-LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+CHROMA_COLLECTION_NAME = "role_validator"
 
-# Temperature setting for LLM responses (0.0 = deterministic)
-LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", 0.0))
+# Default XPath for XML role extraction
+DEFAULT_XML_XPATH = '//role/text()'
 
 # ========================================
 # Role Extraction Prompt
@@ -67,24 +66,251 @@ Document Content:
 Roles (comma-separated):
 """
 
-ROLE_EXTRACTION_PROMPT = os.getenv(
-    "ROLE_EXTRACTION_PROMPT", DEFAULT_ROLE_PROMPT)
 
-# ========================================
-# Fuzzy Matching Configuration
-# ========================================
-# Threshold for fuzzy matching (0-100)
-# Higher values require closer matches
-FUZZY_MATCH_THRESHOLD = int(os.getenv("FUZZY_MATCH_THRESHOLD", 80))
+@dataclass(frozen=True)
+class Settings:
+    """
+    Application settings read from environment variables.
 
-# ========================================
-# Retrieval Configuration
-# ========================================
-# Number of document chunks to retrieve for RAG
-TOP_K_RETRIEVAL = int(os.getenv("TOP_K_RETRIEVAL", 5))
+    Each field defaults to its environment variable (or the documented
+    default), evaluated when the Settings object is created.
+    """
 
-# ========================================
-# Application Settings
-# ========================================
-# Default XPath for XML role extraction
-DEFAULT_XML_XPATH = '//role/text()'
+    # ========================================
+    # OpenAI Configuration
+    # ========================================
+    # Optional here; validated by require_openai_api_key() where needed
+    openai_api_key: Optional[str] = field(
+        default_factory=lambda: os.getenv("OPENAI_API_KEY"))
+
+    # ========================================
+    # Vector Database Configuration
+    # ========================================
+    vector_db: str = field(
+        default_factory=lambda: _env_str("VECTOR_DB", "chroma").lower())
+
+    # ChromaDB specific configuration
+    chroma_persist_dir: str = field(
+        default_factory=lambda: _env_str("CHROMA_PERSIST_DIR", "./chroma_store"))
+
+    # ========================================
+    # PDF Processing Configuration
+    # ========================================
+    pdf_chunk_size: int = field(
+        default_factory=lambda: _env_int("PDF_CHUNK_SIZE", 1000))
+    pdf_chunk_overlap: int = field(
+        default_factory=lambda: _env_int("PDF_CHUNK_OVERLAP", 100))
+
+    # Parallel page extraction: worker processes (1 = sequential, 0 = one per CPU)
+    # and number of pages handed to each worker task
+    pdf_extraction_workers: int = field(
+        default_factory=lambda: _env_int("PDF_EXTRACTION_WORKERS", 1))
+    pdf_page_range_size: int = field(
+        default_factory=lambda: _env_int("PDF_PAGE_RANGE_SIZE", 16))
+
+    # Skip page.find_tables() on pages whose drawing list has fewer ruling
+    # edges (lines / rectangle sides) than PDF_TABLE_MIN_EDGES
+    pdf_table_precheck: bool = field(
+        default_factory=lambda: _env_bool("PDF_TABLE_PRECHECK", True))
+    pdf_table_min_edges: int = field(
+        default_factory=lambda: _env_int("PDF_TABLE_MIN_EDGES", 4))
+
+    # Streaming indexing: read uncached PDFs page by page and send chunks to the
+    # vector store in fixed-size batches so memory stays flat for long documents
+    pdf_streaming_index: bool = field(
+        default_factory=lambda: _env_bool("PDF_STREAMING_INDEX", False))
+    pdf_index_batch_size: int = field(
+        default_factory=lambda: _env_int("PDF_INDEX_BATCH_SIZE", 64))
+
+    # Incremental indexing: re-embed only pages whose content hash changed
+    # instead of clearing and rebuilding a PDF's chunks on every run
+    pdf_incremental_index: bool = field(
+        default_factory=lambda: _env_bool("PDF_INCREMENTAL_INDEX", True))
+
+    # On-disk cache of extracted PDF content, keyed by SHA-256 of the PDF bytes
+    extraction_cache_dir: str = field(
+        default_factory=lambda: _env_str("EXTRACTION_CACHE_DIR", "./.cache/extractions"))
+    # Maximum size of the extraction cache in bytes (0 disables the disk store)
+    extraction_cache_max_bytes: int = field(
+        default_factory=lambda: _env_int("EXTRACTION_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+    # ========================================
+    # XML Processing Configuration
+    # ========================================
+    # XML files of at least this size are read with streaming iterparse
+    # (constant memory) when the role XPath is a plain element path ending
+    # in text(), e.g. //role/text() (0 = always, negative = never)
+    xml_streaming_min_bytes: int = field(
+        default_factory=lambda: _env_int("XML_STREAMING_MIN_BYTES", 64 * 1024 * 1024))
+
+    # ========================================
+    # LLM Configuration
+    # ========================================
+    # Model selection for different tasks
+    # Cost-effective for role extraction
+    llm_model: str = field(
+        default_factory=lambda: _env_str("LLM_MODEL", "gpt-4o-mini"))
+    embedding_model: str = field(
+        default_factory=lambda: _env_str("EMBEDDING_MODEL", "text-embedding-3-small"))
+
+    # Persistent embedding cache keyed by (model, text hash)
+    embedding_cache_enabled: bool = field(
+        default_factory=lambda: _env_bool("EMBEDDING_CACHE_ENABLED", True))
+    embedding_cache_path: str = field(
+        default_factory=lambda: _env_str("EMBEDDING_CACHE_PATH", "./.cache/embeddings.sqlite3"))
+    embedding_cache_max_entries: int = field(
+        default_factory=lambda: _env_int("EMBEDDING_CACHE_MAX_ENTRIES", 200000))
+    # Texts sent per embeddings request for cache misses
+    embedding_batch_size: int = field(
+        default_factory=lambda: _env_int("EMBEDDING_BATCH_SIZE", 256))
+
+    # Temperature setting for LLM responses (0.0 = deterministic)
+    llm_temperature: float = field(
+        default_factory=lambda: _env_float("LLM_TEMPERATURE", 0.0))
+
+    # Maximum concurrent LLM calls (map-reduce extraction, async pipeline)
+    llm_max_concurrency: int = field(
+        default_factory=lambda: _env_int("LLM_MAX_CONCURRENCY", 4))
+
+    # Persistent LLM response cache keyed by (model, temperature, prompt)
+    llm_cache_enabled: bool = field(
+        default_factory=lambda: _env_bool("LLM_CACHE_ENABLED", True))
+    llm_cache_path: str = field(
+        default_factory=lambda: _env_str("LLM_CACHE_PATH", "./.cache/llm_responses.sqlite3"))
+    llm_cache_ttl_seconds: float = field(
+        default_factory=lambda: _env_float("LLM_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60))
+    llm_cache_max_entries: int = field(
+        default_factory=lambda: _env_int("LLM_CACHE_MAX_ENTRIES", 10000))
+
+    # Persistent cache of whole validation results keyed by (XML hash, XPath,
+    # PDF hash, model, prompt / extraction settings hash, fuzzy threshold);
+    # a hit skips PDF parsing, the LLM and the vector store
+    validation_cache_enabled: bool = field(
+        default_factory=lambda: _env_bool("VALIDATION_CACHE_ENABLED", True))
+    validation_cache_path: str = field(
+        default_factory=lambda: _env_str("VALIDATION_CACHE_PATH", "./.cache/validations.sqlite3"))
+    validation_cache_max_entries: int = field(
+        default_factory=lambda: _env_int("VALIDATION_CACHE_MAX_ENTRIES", 10000))
+
+    # ========================================
+    # Role Extraction Mode
+    # ========================================
+    # "auto" maps over chunks only when the document exceeds
+    # ROLE_EXTRACTION_MAX_CHARS, "single" always sends one prompt and
+    # "map_reduce" always extracts per chunk and merges the results
+    role_extraction_mode: str = field(
+        default_factory=lambda: _env_str("ROLE_EXTRACTION_MODE", "auto").lower())
+    role_extraction_max_chars: int = field(
+        default_factory=lambda: _env_int("ROLE_EXTRACTION_MAX_CHARS", 48000))
+    role_extraction_chunk_size: int = field(
+        default_factory=lambda: _env_int("ROLE_EXTRACTION_CHUNK_SIZE", 12000))
+    role_extraction_chunk_overlap: int = field(
+        default_factory=lambda: _env_int("ROLE_EXTRACTION_CHUNK_OVERLAP", 200))
+
+    role_extraction_prompt: str = field(
+        default_factory=lambda: _env_str("ROLE_EXTRACTION_PROMPT", DEFAULT_ROLE_PROMPT))
+
+    # Where roles come from: "llm" (model only), "gazetteer" (catalog roles
+    # found in the text, no API call), "gazetteer_first" (skip the LLM when
+    # every job-title word in the document belongs to a catalog role) or
+    # "merge" (LLM roles plus catalog roles found in the text)
+    role_extraction_policy: str = field(
+        default_factory=lambda: _env_str("ROLE_EXTRACTION_POLICY", "llm").lower())
+
+    # Send the LLM only the sentences and table rows most likely to name
+    # roles (plus neighbors for context) when the document exceeds the
+    # budget; the budget is the smaller of the character and token limits
+    # (0 = no limit of that kind)
+    role_span_filter_enabled: bool = field(
+        default_factory=lambda: _env_bool("ROLE_SPAN_FILTER_ENABLED", False))
+    role_span_filter_max_chars: int = field(
+        default_factory=lambda: _env_int("ROLE_SPAN_FILTER_MAX_CHARS", 12000))
+    role_span_filter_max_tokens: int = field(
+        default_factory=lambda: _env_int("ROLE_SPAN_FILTER_MAX_TOKENS", 0))
+    role_span_filter_neighbors: int = field(
+        default_factory=lambda: _env_int("ROLE_SPAN_FILTER_NEIGHBORS", 1))
+
+    # ========================================
+    # Fuzzy Matching Configuration
+    # ========================================
+    # Threshold for fuzzy matching (0-100)
+    # Higher values require closer matches
+    fuzzy_match_threshold: int = field(
+        default_factory=lambda: _env_int("FUZZY_MATCH_THRESHOLD", 80))
+
+    # Catalogs with at least this many roles use n-gram candidate blocking
+    # instead of scoring every XML role (results are identical; 0 = always)
+    fuzzy_blocking_min_roles: int = field(
+        default_factory=lambda: _env_int("FUZZY_BLOCKING_MIN_ROLES", 2000))
+
+    # ========================================
+    # Retrieval Configuration
+    # ========================================
+    # Number of document chunks to retrieve for RAG
+    top_k_retrieval: int = field(
+        default_factory=lambda: _env_int("TOP_K_RETRIEVAL", 5))
+
+    # ========================================
+    # Application Settings
+    # ========================================
+    # Validation-only mode: extract -> LLM -> compare, without vector indexing
+    # (no embedding calls, no Chroma writes; Q&A indexes on demand)
+    validate_only: bool = field(
+        default_factory=lambda: _env_bool("VALIDATE_ONLY", False))
+
+    # Batch validation: documents validated concurrently and the pool type
+    # ("thread" shares one extractor; "process" gives each worker its own)
+    batch_workers: int = field(
+        default_factory=lambda: _env_int("BATCH_WORKERS", 4))
+    batch_executor: str = field(
+        default_factory=lambda: _env_str("BATCH_EXECUTOR", "thread").lower())
+
+    # Record per-stage spans (wall/CPU time, peak RSS, counts, tokens);
+    # the CLI also enables this for --report / --trace
+    instrumentation_enabled: bool = field(
+        default_factory=lambda: _env_bool("INSTRUMENTATION_ENABLED", False))
+
+    def require_openai_api_key(self) -> str:
+        """
+        Returns the OpenAI API key, raising if it is not configured.
+
+        Returns:
+            str: OpenAI API key
+
+        Raises:
+            ValueError: If OPENAI_API_KEY is not set
+        """
+        if not self.openai_api_key:
+            raise ValueError(
+                "OPENAI_API_KEY not found in environment variables. "
+                "Please set it in your .env file."
+            )
+        return self.openai_api_key
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings, loading the .env file on first call.
+
+    Returns:
+        Settings: Application settings
+    """
+    # Imported here so importing this module has no side effects
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+    return Settings()
+
+
+_SETTING_NAMES = {f.name.upper(): f.name for f in fields(Settings)}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Resolves upper-case setting names (e.g. LLM_MODEL) from get_settings().
+    """
+    if name in _SETTING_NAMES:
+        return getattr(get_settings(), _SETTING_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
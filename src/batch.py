@@ -0,0 +1,345 @@
+# src/batch.py
+"""
+Batch validation of many PDFs against one XML catalog.
+Parses the catalog once, validates documents in a worker pool and streams JSON Lines results.
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed
+)
+from typing import List, Dict, Any, Optional, TextIO, Union
+from src.instrumentation import get_recorder, enable_instrumentation
+from src.catalog_artifact import is_catalog_artifact, load_catalog
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.pipeline import validate_pdf
+from src.role_catalog import RoleCatalogIndex
+from src.role_comparer import RoleComparer
+from src.validation_cache import ValidationResultCache
+from src.extraction_cache import compute_file_hash
+from src.xml_parser import extract_roles_from_xml
+from config.config import DEFAULT_XML_XPATH, get_settings
+
+# Per-process state for the process pool (set by _init_worker)
+_worker_state: Dict[str, Any] = {}
+
+
+def resolve_pdf_paths(source: str) -> List[str]:
+    """
+    Expands a directory or glob pattern into a sorted list of PDF paths.
+
+    Args:
+        source (str): Directory (all *.pdf files in it) or glob pattern
+                      (e.g. 'data/**/*.pdf')
+
+    Returns:
+        List[str]: Matching PDF paths
+    """
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "*.pdf")
+    else:
+        pattern = source
+
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and path.lower().endswith(".pdf")
+    )
+
+
+def _make_worker_components(fuzzy_threshold: int):
+    # Batch runs never index, and documents are not kept in memory
+    pdf_extractor = RAGPDFExtractor(keep_documents=False)
+    comparer = RoleComparer(fuzzy_threshold=fuzzy_threshold)
+    return pdf_extractor, comparer
+
+
+def _init_worker(
+    catalog: Union[RoleCatalogIndex, str],
+    fuzzy_threshold: int,
+    instrumented: bool,
+    xml_hash: Optional[str],
+    xml_role_xpath: str
+) -> None:
+    """
+    Process pool initializer: receives the catalog once per worker
+    (or the path of a compiled catalog artifact, loaded in milliseconds).
+    """
+    enable_instrumentation(instrumented)
+    if isinstance(catalog, str):
+        catalog = load_catalog(catalog).index
+    pdf_extractor, comparer = _make_worker_components(fuzzy_threshold)
+    _worker_state["catalog"] = catalog
+    _worker_state["pdf_extractor"] = pdf_extractor
+    _worker_state["comparer"] = comparer
+    # SQLite connections cannot be shared across processes; open one per worker
+    _worker_state["result_cache"] = ValidationResultCache() if xml_hash else None
+    _worker_state["xml_hash"] = xml_hash
+    _worker_state["xml_role_xpath"] = xml_role_xpath
+
+
+def _validate_in_worker(pdf_path: str) -> Dict[str, Any]:
+    result = validate_pdf(
+        pdf_path,
+        _worker_state["catalog"],
+        _worker_state["pdf_extractor"],
+        _worker_state["comparer"],
+        result_cache=_worker_state["result_cache"],
+        xml_hash=_worker_state["xml_hash"],
+        xml_xpath=_worker_state["xml_role_xpath"]
+    )
+
+    # Ship this document's spans back to the parent's recorder
+    recorder = get_recorder()
+    if recorder.enabled:
+        result["_spans"] = recorder.drain()
+    return result
+
+
+def _timed_validate(pdf_path: str, validate) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result = validate(pdf_path)
+    result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(
+    xml_filepath: str,
+    pdf_paths: List[str],
+    output: TextIO,
+    xml_role_xpath: str = DEFAULT_XML_XPATH,
+    fuzzy_threshold: Optional[int] = None,
+    workers: Optional[int] = None,
+    executor_type: Optional[str] = None,
+    use_cache: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Validates many PDFs against one XML catalog.
+
+    The catalog is parsed and indexed once, or loaded from a compiled
+    catalog artifact (see compile-catalog) when xml_filepath is one. With the thread pool all
+    workers share one extractor (LLM calls are I/O bound); with the
+    process pool each worker builds its own and receives the catalog
+    once through the pool initializer. One JSON record per document is
+    written to output as soon as it completes (completion order).
+
+    Args:
+        xml_filepath (str): Path to the XML catalog or a compiled artifact
+        pdf_paths (List[str]): PDFs to validate
+        output (TextIO): Stream receiving the JSON Lines records
+        xml_role_xpath (str): XPath expression for XML roles
+        fuzzy_threshold (Optional[int]): Minimum similarity score for fuzzy matches
+                                         (None = FUZZY_MATCH_THRESHOLD)
+        workers (Optional[int]): Documents validated concurrently (None = BATCH_WORKERS)
+        executor_type (Optional[str]): "thread" or "process" (None = BATCH_EXECUTOR)
+        use_cache (Optional[bool]): Serve unchanged documents from the validation
+                                    result cache (None = VALIDATION_CACHE_ENABLED)
+
+    Returns:
+        Dict: Batch summary (counts, failures, timings)
+    """
+    start = time.perf_counter()
+
+    settings = get_settings()
+    if fuzzy_threshold is None:
+        fuzzy_threshold = settings.fuzzy_match_threshold
+    if workers is None:
+        workers = settings.batch_workers
+    if executor_type is None:
+        executor_type = settings.batch_executor
+    if use_cache is None:
+        use_cache = settings.validation_cache_enabled
+
+    worker_catalog: Union[RoleCatalogIndex, str]
+    if is_catalog_artifact(xml_filepath):
+        # Compiled catalog: no XML parsing or index building
+        compiled = load_catalog(xml_filepath)
+        catalog = compiled.index
+        xml_role_xpath = compiled.xml_xpath
+        xml_hash = compiled.source_sha256 if use_cache else None
+        worker_catalog = xml_filepath
+        print(f"📦 Loaded compiled catalog: {xml_filepath} ({len(catalog)} roles)")
+    else:
+        xml_roles = extract_roles_from_xml(xml_filepath, xml_role_xpath)
+        if not xml_roles:
+            raise ValueError(f"No roles extracted from XML: {xml_filepath}")
+
+        catalog = RoleCatalogIndex(xml_roles)
+        worker_catalog = catalog
+
+        # Unchanged documents validated before against this catalog and
+        # settings are answered from the validation result cache
+        xml_hash = compute_file_hash(xml_filepath) if use_cache else None
+
+    workers = max(1, workers)
+
+    print(f"\n📦 Batch validating {len(pdf_paths)} PDFs "
+          f"({workers} {executor_type} workers)")
+
+    executor: Executor
+    if executor_type == "process":
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(worker_catalog, fuzzy_threshold, get_recorder().enabled,
+                      xml_hash, xml_role_xpath)
+        )
+        validate = _validate_in_worker
+    elif executor_type == "thread":
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pdf_extractor, comparer = _make_worker_components(fuzzy_threshold)
+        result_cache = ValidationResultCache() if use_cache else None
+
+        def validate(pdf_path: str) -> Dict[str, Any]:
+            return validate_pdf(
+                pdf_path, catalog, pdf_extractor, comparer,
+                result_cache=result_cache,
+                xml_hash=xml_hash,
+                xml_xpath=xml_role_xpath
+            )
+    else:
+        raise ValueError(f"Unknown executor type: {executor_type}")
+
+    summary: Dict[str, Any] = {
+        "total": len(pdf_paths),
+        "valid": 0,
+        "invalid": 0,
+        "errors": 0,
+        "cached": 0,
+        "failed_documents": []
+    }
+
+    with executor:
+        futures = {
+            executor.submit(_timed_validate, pdf_path, validate): pdf_path
+            for pdf_path in pdf_paths
+        }
+
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker crashed (e.g. a process died); record and go on
+                result = {"pdf_path": pdf_path, "status": "error", "error": str(e)}
+
+            spans = result.pop("_spans", None)
+            if spans:
+                get_recorder().merge(spans)
+
+            if result.get("cached"):
+                summary["cached"] += 1
+
+            if result["status"] != "ok":
+                summary["errors"] += 1
+                summary["failed_documents"].append(pdf_path)
+            elif result["is_valid"]:
+                summary["valid"] += 1
+            else:
+                summary["invalid"] += 1
+                summary["failed_documents"].append(pdf_path)
+
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+
+    elapsed = time.perf_counter() - start
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["documents_per_second"] = round(
+        len(pdf_paths) / elapsed, 2) if elapsed > 0 else 0
+    summary["failed_documents"].sort()
+
+    return summary
+
+
+def print_batch_summary(summary: Dict[str, Any]) -> None:
+    """
+    Prints a human-readable batch summary.
+
+    Args:
+        summary (Dict): Summary returned by run_batch()
+    """
+    print("\n" + "=" * 60)
+    print("       📦 BATCH VALIDATION SUMMARY")
+    print("=" * 60)
+    print(f"  • Documents: {summary['total']}")
+    print(f"  • Valid: {summary['valid']}")
+    print(f"  • Invalid (incorrect roles): {summary['invalid']}")
+    print(f"  • Errors: {summary['errors']}")
+    print(f"  • From cache: {summary['cached']}")
+    print(f"  • Elapsed: {summary['elapsed_seconds']}s "
+          f"({summary['documents_per_second']} docs/sec)")
+
+    if summary["failed_documents"]:
+        print("\n❌ Failed documents:")
+        for pdf_path in summary["failed_documents"]:
+            print(f"  ✗ {pdf_path}")
+    print("=" * 60 + "\n")
+
+
+def main_batch(
+    xml_filepath: str,
+    pdf_source: str,
+    output_path: str = "batch_results.jsonl",
+    xml_role_xpath: str = DEFAULT_XML_XPATH,
+    fuzzy_threshold: Optional[int] = None,
+    workers: Optional[int] = None,
+    executor_type: Optional[str] = None,
+    use_cache: Optional[bool] = None
+) -> int:
+    """
+    CLI entry point for batch validation.
+
+    Args:
+        xml_filepath (str): Path to the XML catalog
+        pdf_source (str): Directory or glob pattern of PDFs
+        output_path (str): JSON Lines output file
+        xml_role_xpath (str): XPath expression for XML roles
+        fuzzy_threshold (Optional[int]): Minimum similarity score for fuzzy matches
+                                         (None = FUZZY_MATCH_THRESHOLD)
+        workers (Optional[int]): Documents validated concurrently (None = BATCH_WORKERS)
+        executor_type (Optional[str]): "thread" or "process" (None = BATCH_EXECUTOR)
+        use_cache (Optional[bool]): Serve unchanged documents from the validation
+                                    result cache (None = VALIDATION_CACHE_ENABLED)
+
+    Returns:
+        int: Exit status (0 = every document valid, 1 = any invalid or
+             failed document, 2 = nothing to validate)
+    """
+    pdf_paths = resolve_pdf_paths(pdf_source)
+    if not pdf_paths:
+        print(f"❌ No PDF files found for: {pdf_source}")
+        return 2
+
+    if not os.path.exists(xml_filepath):
+        print(f"❌ XML file not found: {xml_filepath}")
+        return 2
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        with open(output_path, "w", encoding="utf-8") as output:
+            summary = run_batch(
+                xml_filepath,
+                pdf_paths,
+                output,
+                xml_role_xpath=xml_role_xpath,
+                fuzzy_threshold=fuzzy_threshold,
+                workers=workers,
+                executor_type=executor_type,
+                use_cache=use_cache
+            )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+
+    print_batch_summary(summary)
+    print(f"📝 Results written to: {output_path}")
+
+    return 1 if summary["failed_documents"] else 0
@@ -0,0 +1,260 @@
+# src/cache_store.py
+"""
+SQLite-backed key/value store shared by the persistent caches.
+Provides LRU eviction by entry count, optional TTL expiry and hit/miss counters.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Any
+
+
+def hash_key(*parts: str) -> str:
+    """
+    Builds a cache key from the SHA-256 of the given parts.
+
+    Args:
+        *parts (str): Key components (joined with a separator before hashing)
+
+    Returns:
+        str: Hex digest usable as a cache key
+    """
+    return hashlib.sha256("\x1f".join(parts).encode('utf-8')).hexdigest()
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache stored in a single SQLite table.
+
+    Features:
+    - Batched lookups and inserts
+    - LRU eviction once the table exceeds max_entries
+    - Optional TTL after which entries count as misses
+    - Hit/miss counters for monitoring
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        table: str,
+        max_entries: int = 0,
+        ttl_seconds: float = 0
+    ):
+        """
+        Initialize (or open) a cache table.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+            table (str): Table name for this cache
+            max_entries (int): Maximum number of entries (0 = unbounded)
+            ttl_seconds (float): Entry lifetime in seconds (0 = never expire)
+        """
+        self.db_path = db_path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, "
+            "value BLOB NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed_at "
+            f"ON {table} (accessed_at)"
+        )
+        self._conn.commit()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Looks up a single entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[bytes]: Stored value or None on a miss
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Looks up several entries at once and refreshes their access time.
+
+        Args:
+            keys (Iterable[str]): Cache keys
+
+        Returns:
+            Dict[str, bytes]: Values for the keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        expired: List[str] = []
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM {self.table} "
+                    f"WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self._is_expired(created_at, now):
+                        expired.append(key)
+                    else:
+                        found[key] = value
+
+            if found:
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+            if expired:
+                self._conn.executemany(
+                    f"DELETE FROM {self.table} WHERE key = ?",
+                    [(key,) for key in expired]
+                )
+            self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Stores a single entry.
+        """
+        self.put_many({key: value})
+
+    def put_many(self, items: Dict[str, bytes]) -> None:
+        """
+        Stores several entries and evicts the least recently used ones
+        if the table grows beyond max_entries.
+
+        Args:
+            items (Dict[str, bytes]): Key -> value pairs to store
+        """
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items.items()]
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        if self.max_entries <= 0:
+            return
+
+        count = self._conn.execute(
+            f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} "
+                "ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def delete(self, key: str) -> bool:
+        """
+        Removes one entry.
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def entries(self, limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Lists entries, most recently used first (does not count as access).
+
+        Args:
+            limit (int): Maximum number of entries (0 = all)
+
+        Returns:
+            List[Dict]: key, value, created_at and accessed_at per entry
+        """
+        query = (f"SELECT key, value, created_at, accessed_at FROM {self.table} "
+                 "ORDER BY accessed_at DESC")
+        params: tuple = ()
+        if limit > 0:
+            query += " LIMIT ?"
+            params = (limit,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {"key": key, "value": value, "created_at": created_at,
+             "accessed_at": accessed_at}
+            for key, value, created_at, accessed_at in rows
+        ]
+
+    def clear(self) -> int:
+        """
+        Removes all entries.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns cache statistics.
+
+        Returns:
+            Dict: Entry count, hit/miss counters and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percentage": round(
+                self.hits / lookups * 100, 2) if lookups else 0
+        }
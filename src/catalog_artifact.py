@@ -0,0 +1,227 @@
+# src/catalog_artifact.py
+"""
+Compiled role catalog artifacts.
+Stores the parsed XML roles, their attributes and the prebuilt match index
+in a versioned binary file that loads without touching the XML.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any
+from src.extraction_cache import compute_file_hash
+from src.instrumentation import span
+from src.role_catalog import RoleCatalogIndex
+from src.xml_parser import XmlRoleSource
+from config.config import DEFAULT_XML_XPATH
+
+# File layout: magic, format version, header length, JSON header, payload.
+# The payload is a pickle of the RoleCatalogIndex and role attributes;
+# the header records the payload checksum and the source XML's SHA-256.
+CATALOG_MAGIC = b"RVCATLG\x00"
+CATALOG_FORMAT_VERSION = 1
+CATALOG_EXTENSION = ".rvcat"
+
+_PREAMBLE = struct.Struct("<8sHI")
+
+
+@dataclass
+class CompiledCatalog:
+    """
+    A loaded catalog artifact.
+
+    Attributes:
+        index: Prebuilt index (roles, normalized forms, n-gram postings)
+        attribute_columns: Role attributes stored column-wise
+                           ("name" plus one list per attribute)
+        source_sha256: SHA-256 of the XML the artifact was compiled from
+        xml_xpath: XPath the roles were extracted with
+        header: Full artifact header
+    """
+    index: RoleCatalogIndex
+    attribute_columns: Dict[str, List[str]] = field(default_factory=dict)
+    source_sha256: str = ""
+    xml_xpath: str = DEFAULT_XML_XPATH
+    header: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def attributes(self) -> List[Dict[str, str]]:
+        """
+        Per-role records as returned by extract_roles_with_attributes().
+        """
+        names = list(self.attribute_columns)
+        return [dict(zip(names, values))
+                for values in zip(*self.attribute_columns.values())]
+
+
+def is_catalog_artifact(path: str) -> bool:
+    """
+    Returns True if the file starts with the catalog artifact magic bytes.
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(CATALOG_MAGIC)) == CATALOG_MAGIC
+    except OSError:
+        return False
+
+
+def compile_catalog(
+    xml_filepath: str,
+    output_path: str,
+    xml_role_xpath: str = DEFAULT_XML_XPATH,
+    attributes: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Compiles an XML role catalog into a binary artifact.
+
+    Args:
+        xml_filepath (str): Path to the XML catalog
+        output_path (str): Artifact file to write
+        xml_role_xpath (str): XPath expression for XML roles
+        attributes (Optional[List[str]]): Role attributes to keep (read from
+                                          the role elements, i.e. the XPath
+                                          without its trailing /text())
+
+    Returns:
+        Dict: The artifact header
+
+    Raises:
+        ValueError: If the XML yields no roles
+    """
+    source = XmlRoleSource(xml_filepath)
+    roles = source.roles(xml_role_xpath)
+    if not roles:
+        raise ValueError(f"No roles extracted from XML: {xml_filepath}")
+
+    # Column-wise: one list per attribute unpickles far faster than a dict per role
+    attribute_columns: Dict[str, List[str]] = {}
+    if attributes:
+        element_xpath = xml_role_xpath
+        if element_xpath.endswith("/text()"):
+            element_xpath = element_xpath[:-len("/text()")]
+        records = source.roles_with_attributes(element_xpath, attributes)
+        for key in ["name"] + list(attributes):
+            attribute_columns[key] = [record[key] for record in records]
+
+    payload = pickle.dumps(
+        {"index": RoleCatalogIndex(roles), "attribute_columns": attribute_columns},
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+    header = {
+        "format_version": CATALOG_FORMAT_VERSION,
+        "source_path": os.path.abspath(xml_filepath),
+        "source_sha256": source.content_hash,
+        "xml_xpath": xml_role_xpath,
+        "attributes": list(attributes or []),
+        "role_count": len(roles),
+        "compiled_at": time.time(),
+        "payload_sha256": hashlib.sha256(payload).hexdigest(),
+        "payload_bytes": len(payload)
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a uniquely named temporary file in the same directory first,
+    # so readers never see a partial artifact and concurrent compiles of
+    # the same path do not write into each other's file
+    tmp_file = tempfile.NamedTemporaryFile(
+        dir=directory or ".",
+        prefix=f"{os.path.basename(output_path)}.",
+        suffix=".tmp",
+        delete=False
+    )
+    try:
+        with tmp_file as f:
+            f.write(_PREAMBLE.pack(CATALOG_MAGIC, CATALOG_FORMAT_VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            f.write(payload)
+        os.replace(tmp_file.name, output_path)
+    except BaseException:
+        os.remove(tmp_file.name)
+        raise
+
+    return header
+
+
+def _read_preamble(f, artifact_path: str) -> Dict[str, Any]:
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError(f"Not a catalog artifact: {artifact_path}")
+
+    magic, version, header_length = _PREAMBLE.unpack(preamble)
+    if magic != CATALOG_MAGIC:
+        raise ValueError(f"Not a catalog artifact: {artifact_path}")
+    if version != CATALOG_FORMAT_VERSION:
+        raise ValueError(
+            f"Catalog artifact format {version} is not supported "
+            f"(expected {CATALOG_FORMAT_VERSION}); recompile {artifact_path}")
+
+    return json.loads(f.read(header_length).decode("utf-8"))
+
+
+def read_catalog_header(artifact_path: str) -> Dict[str, Any]:
+    """
+    Reads an artifact's header without loading the payload.
+
+    Raises:
+        ValueError: If the file is not a supported catalog artifact
+    """
+    with open(artifact_path, "rb") as f:
+        return _read_preamble(f, artifact_path)
+
+
+def load_catalog(
+    artifact_path: str,
+    xml_filepath: Optional[str] = None
+) -> CompiledCatalog:
+    """
+    Loads a compiled catalog artifact.
+
+    The payload checksum is verified before it is unpickled. If the
+    source XML is given, its SHA-256 must match the one recorded at
+    compile time, so a stale artifact is never used. Artifacts are
+    pickles: only load files you compiled yourself.
+
+    Args:
+        artifact_path (str): Artifact written by compile_catalog()
+        xml_filepath (Optional[str]): Source XML to check the artifact against
+
+    Returns:
+        CompiledCatalog: Index, attributes and header
+
+    Raises:
+        ValueError: If the file is not a valid artifact, is corrupt or
+                    does not match the given XML
+    """
+    with span("catalog.load", path=artifact_path) as load_span:
+        with open(artifact_path, "rb") as f:
+            header = _read_preamble(f, artifact_path)
+            payload = f.read()
+
+        if hashlib.sha256(payload).hexdigest() != header["payload_sha256"]:
+            raise ValueError(f"Catalog artifact is corrupt (checksum mismatch): {artifact_path}")
+
+        if xml_filepath is not None and compute_file_hash(xml_filepath) != header["source_sha256"]:
+            raise ValueError(
+                f"Catalog artifact {artifact_path} was compiled from a different "
+                f"version of {xml_filepath}; recompile it")
+
+        data = pickle.loads(payload)
+        load_span.count("roles", len(data["index"]))
+
+    return CompiledCatalog(
+        index=data["index"],
+        attribute_columns=data["attribute_columns"],
+        source_sha256=header["source_sha256"],
+        xml_xpath=header["xml_xpath"],
+        header=header
+    )
@@ -0,0 +1,127 @@
+# src/embedding_cache.py
+"""
+Persistent embedding cache in front of a LangChain embeddings model.
+Stores float32 vectors keyed by (model, text hash) so unchanged text is embedded once.
+"""
+
+from array import array
+from typing import List, Dict, Any
+from langchain_core.embeddings import Embeddings
+from src.cache_store import SQLiteCache, hash_key
+from src.instrumentation import span
+from config.config import (
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_BATCH_SIZE
+)
+
+
+def _to_blob(vector: List[float]) -> bytes:
+    return array('f', vector).tobytes()
+
+
+def _from_blob(blob: bytes) -> List[float]:
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated texts from a local cache.
+
+    Only cache misses are sent to the underlying model, deduplicated and
+    in batches of batch_size. Vectors are stored as float32 blobs in
+    SQLite with LRU eviction once max_entries is exceeded.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        model: str,
+        db_path: str = EMBEDDING_CACHE_PATH,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        batch_size: int = EMBEDDING_BATCH_SIZE
+    ):
+        """
+        Initialize the cached embeddings wrapper.
+
+        Args:
+            underlying (Embeddings): Embeddings model used for cache misses
+            model (str): Model name, part of the cache key
+            db_path (str): Path to the SQLite cache file
+            max_entries (int): Maximum cached vectors (0 = unbounded)
+            batch_size (int): Texts per request to the underlying model
+        """
+        self.underlying = underlying
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.store = SQLiteCache(
+            db_path, "embeddings", max_entries=max_entries)
+
+    def _key(self, text: str) -> str:
+        return hash_key(self.model, text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds texts, fetching only the ones not already cached.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            List[List[float]]: Embedding vectors in input order
+        """
+        if not texts:
+            return []
+
+        with span("embedding", model=self.model) as embed_span:
+            keys = [self._key(text) for text in texts]
+            cached = self.store.get_many(keys)
+
+            # Unique misses, keeping first-seen order
+            missing: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key not in cached and key not in missing:
+                    missing[key] = text
+
+            embed_span.count("texts", len(texts))
+            embed_span.count("embedded", len(missing))
+
+            missing_keys = list(missing)
+            for start in range(0, len(missing_keys), self.batch_size):
+                batch_keys = missing_keys[start:start + self.batch_size]
+                vectors = self.underlying.embed_documents(
+                    [missing[key] for key in batch_keys])
+
+                new_entries = {
+                    key: _to_blob(vector)
+                    for key, vector in zip(batch_keys, vectors)
+                }
+                self.store.put_many(new_entries)
+                cached.update(new_entries)
+
+        if missing and len(texts) > 1:
+            print(
+                f"🧮 Embedded {len(missing)} new texts, "
+                f"reused {len(texts) - len(missing)}")
+
+        return [_from_blob(cached[key]) for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embeds a single query text through the cache.
+
+        Args:
+            text (str): Text to embed
+
+        Returns:
+            List[float]: Embedding vector
+        """
+        return self.embed_documents([text])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns cache hit/miss statistics.
+        """
+        return self.store.stats()
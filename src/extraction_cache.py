@@ -0,0 +1,234 @@
+# src/extraction_cache.py
+"""
+Content-addressed cache for extracted PDF content.
+Keys extracted documents by the SHA-256 of the PDF bytes so a PDF is parsed once.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Any
+from config.config import get_settings
+
+# Bump when the cached document layout changes so stale entries are ignored
+EXTRACTION_FORMAT_VERSION = 1
+
+
+def compute_file_hash(filepath: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 hex digest of a file's bytes.
+
+    Args:
+        filepath (str): Path to the file
+        block_size (int): Number of bytes read per iteration
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class ExtractedPage:
+    """
+    Text blocks and formatted tables extracted from a single PDF page.
+    """
+    page_number: int
+    blocks: List[str] = field(default_factory=list)
+    tables: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Page content in reading order: text blocks followed by tables."""
+        return "\n\n".join(self.blocks + self.tables)
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the page text, used to detect changed pages."""
+        return hashlib.sha256(self.text.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class ExtractedDocument:
+    """
+    Reusable result of parsing a PDF once.
+
+    Holds per-page blocks and tables; the joined document text is
+    built on demand so callers share a single parse.
+    """
+    pdf_hash: str
+    source: str
+    pages: List[ExtractedPage] = field(default_factory=list)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def table_count(self) -> int:
+        return sum(len(page.tables) for page in self.pages)
+
+    @property
+    def text(self) -> str:
+        """Full document text, identical to the legacy extractor output."""
+        return "\n\n".join(
+            part for page in self.pages for part in page.blocks + page.tables
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["version"] = EXTRACTION_FORMAT_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtractedDocument":
+        return cls(
+            pdf_hash=data["pdf_hash"],
+            source=data.get("source", ""),
+            pages=[ExtractedPage(**page) for page in data.get("pages", [])]
+        )
+
+
+class ExtractionCache:
+    """
+    On-disk store of extracted documents with LRU size eviction.
+
+    Each document is stored as one JSON file named after its content hash.
+    File modification times track recency: reads touch the file, and the
+    least recently used files are evicted once the store exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            cache_dir (Optional[str]): Directory holding cached documents
+                                       (None = EXTRACTION_CACHE_DIR)
+            max_bytes (Optional[int]): Maximum total size of the store (0 disables
+                                       the disk store, None = EXTRACTION_CACHE_MAX_BYTES)
+        """
+        settings = get_settings()
+        self.cache_dir = settings.extraction_cache_dir if cache_dir is None else cache_dir
+        self.max_bytes = settings.extraction_cache_max_bytes if max_bytes is None else max_bytes
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _entry_path(self, pdf_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{pdf_hash}.json")
+
+    def get(self, pdf_hash: str) -> Optional[ExtractedDocument]:
+        """
+        Loads a cached document and marks it as recently used.
+
+        Args:
+            pdf_hash (str): SHA-256 of the PDF bytes
+
+        Returns:
+            Optional[ExtractedDocument]: Cached document or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(pdf_hash)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get("version") != EXTRACTION_FORMAT_VERSION:
+                os.remove(path)
+                return None
+
+            # Touch the entry so LRU eviction sees it as fresh
+            os.utime(path, None)
+
+            return ExtractedDocument.from_dict(data)
+
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+
+    def put(self, document: ExtractedDocument) -> None:
+        """
+        Stores a document and evicts old entries if the store is too large.
+
+        Args:
+            document (ExtractedDocument): Document to persist
+        """
+        if not self.enabled:
+            return
+
+        path = self._entry_path(document.pdf_hash)
+        tmp_path = None
+
+        try:
+            # Unique temporary file per write, so threads storing the same
+            # document never write into one file
+            with tempfile.NamedTemporaryFile(
+                'w',
+                encoding='utf-8',
+                dir=self.cache_dir,
+                prefix=f"{document.pdf_hash}.",
+                suffix=".tmp",
+                delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(document.to_dict(), f)
+            # Atomic rename so concurrent readers never see partial files
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️  Could not write extraction cache entry: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Removes least recently used entries until the store fits max_bytes.
+        """
+        entries = []
+        total_bytes = 0
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return
+
+        # Oldest access first
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                continue
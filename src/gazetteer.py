@@ -0,0 +1,206 @@
+# src/gazetteer.py
+"""
+Deterministic role extraction with a multi-pattern automaton.
+Finds catalog roles (and their known variants) in document text in one linear pass.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple
+from src.utils import role_variants, is_title_suffix
+
+# Bump when matching rules or the variant lexicon change (part of the
+# validation cache key, so gazetteer results are not reused across versions)
+GAZETTEER_VERSION = 2
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+@dataclass
+class GazetteerMatch:
+    """
+    One catalog role found in the text.
+
+    Attributes:
+        role: Catalog role (as written in the XML)
+        start: Character offset where the mention starts
+        end: Character offset where the mention ends
+    """
+    role: str
+    start: int
+    end: int
+
+
+@dataclass
+class GazetteerScan:
+    """
+    Result of scanning one text.
+
+    Attributes:
+        roles: Unique catalog roles found, in order of first mention
+        matches: Non-overlapping mentions (leftmost-longest)
+        uncovered_mentions: Job-title words (see ROLE_TITLE_SUFFIXES)
+                            that are not part of any matched role
+    """
+    roles: List[str] = field(default_factory=list)
+    matches: List[GazetteerMatch] = field(default_factory=list)
+    uncovered_mentions: List[str] = field(default_factory=list)
+
+    @property
+    def fully_covered(self) -> bool:
+        """
+        True if roles were found and every job-title word in the text
+        belongs to one of them, i.e. an LLM would have nothing to add.
+        """
+        return bool(self.roles) and not self.uncovered_mentions
+
+
+class RoleGazetteer:
+    """
+    Aho-Corasick automaton over the word sequences of catalog roles.
+
+    Patterns are the token sequences from role_variants() (the role
+    itself, its normalized form and abbreviation variants such as
+    "Sr." or "Mgr"). Matching is word-level, so mentions always start
+    and end on word boundaries, and scanning is linear in the number of
+    words in the text regardless of the catalog size.
+    """
+
+    def __init__(self, roles: List[str]):
+        """
+        Build the automaton.
+
+        Args:
+            roles (List[str]): Catalog roles (extract_roles_from_xml() output)
+        """
+        self.roles: List[str] = list(roles)
+
+        # Trie: per state, token -> next state; terminal states record
+        # (role index, pattern length in tokens)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._terminal: Dict[int, Tuple[int, int]] = {}
+        self.pattern_count = 0
+
+        for index, role in enumerate(self.roles):
+            for variant in role_variants(role):
+                self._add_pattern(variant, index)
+
+        self._fail: List[int] = [0] * len(self._goto)
+        # Per state: every pattern ending here, via failure links included
+        self._outputs: List[List[Tuple[int, int]]] = [[] for _ in self._goto]
+        self._build_failure_links()
+
+    def _add_pattern(self, tokens: Tuple[str, ...], role_index: int) -> None:
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+            state = next_state
+
+        # The first role with a given spelling keeps it
+        if state not in self._terminal:
+            self._terminal[state] = (role_index, len(tokens))
+            self.pattern_count += 1
+
+    def _build_failure_links(self) -> None:
+        queue = deque()
+        for state in self._goto[0].values():
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            if state in self._terminal:
+                self._outputs[state].append(self._terminal[state])
+            # Failure targets are shallower, so their outputs are final
+            self._outputs[state].extend(self._outputs[self._fail[state]])
+
+            for token, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                queue.append(child)
+
+    def scan(self, text: str) -> GazetteerScan:
+        """
+        Finds catalog roles in text.
+
+        Overlapping mentions are resolved leftmost-longest, so "Senior
+        Project Manager" yields one mention of the longest catalog role
+        it contains rather than "Project Manager" and "Manager" both.
+
+        Args:
+            text (str): Document text
+
+        Returns:
+            GazetteerScan: Roles, mentions and uncovered job-title words
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+
+        spans: List[Tuple[int, int]] = []
+        title_words: List[int] = []
+        # (first token, last token, role index) for every pattern hit
+        hits: List[Tuple[int, int, int]] = []
+
+        state = 0
+        for position, token_match in enumerate(_TOKEN_PATTERN.finditer(text)):
+            token = token_match.group().lower()
+            spans.append(token_match.span())
+            if is_title_suffix(token):
+                title_words.append(position)
+
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+
+            for role_index, length in outputs[state]:
+                hits.append((position - length + 1, position, role_index))
+
+        # Leftmost-longest, non-overlapping
+        hits.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+        result = GazetteerScan()
+        seen = set()
+        covered_until = -1
+        covered: List[Tuple[int, int]] = []
+        for first, last, role_index in hits:
+            if first <= covered_until:
+                continue
+            covered_until = last
+            covered.append((first, last))
+
+            role = self.roles[role_index]
+            result.matches.append(
+                GazetteerMatch(role, spans[first][0], spans[last][1]))
+            if role not in seen:
+                seen.add(role)
+                result.roles.append(role)
+
+        # Both lists are sorted by position, so one merge pass suffices
+        i = 0
+        for position in title_words:
+            while i < len(covered) and covered[i][1] < position:
+                i += 1
+            if i == len(covered) or covered[i][0] > position:
+                start, end = spans[position]
+                result.uncovered_mentions.append(text[start:end])
+
+        return result
+
+    def find_roles(self, text: str) -> List[str]:
+        """
+        Returns the unique catalog roles mentioned in text, in order.
+        """
+        return self.scan(text).roles
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __repr__(self) -> str:
+        return f"RoleGazetteer({len(self.roles)} roles, {self.pattern_count} patterns)"
@@ -0,0 +1,384 @@
+# src/instrumentation.py
+"""
+Lightweight span-based instrumentation for the validation pipeline.
+Records wall time, CPU time, peak RSS growth, item counts and LLM tokens per stage.
+"""
+
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config.config import get_settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# Innermost open span of the current thread / asyncio task
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None)
+
+_span_ids = itertools.count(1)
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """
+    Returns the peak resident set size of this process in KiB (None if unknown).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class SpanRecord:
+    """
+    A finished span.
+
+    Attributes:
+        name: Stage name (e.g. "llm.call")
+        span_id / parent_id: Nesting within one process
+        document: PDF path inherited from the enclosing document span
+        start_time: Wall-clock start (seconds since the epoch)
+        wall_seconds: Elapsed wall time
+        cpu_seconds: CPU time of the recording thread
+        rss_peak_delta_kb: Growth of the process peak RSS during the span
+        counts: Item counts (pages, chunks, roles, ...)
+        tokens: LLM token usage (input / output)
+        attributes: Free-form details
+    """
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    document: Optional[str]
+    start_time: float
+    wall_seconds: float
+    cpu_seconds: float
+    rss_peak_delta_kb: Optional[int]
+    pid: int
+    thread_id: int
+    counts: Dict[str, int] = field(default_factory=dict)
+    tokens: Dict[str, int] = field(default_factory=dict)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class Span:
+    """
+    Handle for an open span; used to attach counts, tokens and attributes.
+    """
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent else None
+        self.document = attributes.pop("document", None) or (
+            parent.document if parent else None)
+        self.attributes = attributes
+        self.counts: Dict[str, int] = {}
+        self.tokens: Dict[str, int] = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Adds to an item counter (e.g. span.count("pages", 12)).
+        """
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def add_tokens(self, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        """
+        Adds LLM token usage.
+        """
+        self.tokens["input"] = self.tokens.get("input", 0) + input_tokens
+        self.tokens["output"] = self.tokens.get("output", 0) + output_tokens
+
+    def set(self, **attributes: Any) -> None:
+        """
+        Sets free-form attributes.
+        """
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    """
+    Stand-in returned while instrumentation is disabled.
+    """
+    document = None
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def add_tokens(self, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        pass
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Recorder:
+    """
+    Thread-safe collector of finished spans with JSON / Chrome trace export.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled (bool): Record spans (disabled spans cost one flag check)
+        """
+        self.enabled = enabled
+        self._records: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    @property
+    def records(self) -> List[SpanRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Removes and returns all records as dicts (e.g. to ship them from a
+        worker process to the parent, which calls merge()).
+        """
+        with self._lock:
+            records, self._records = self._records, []
+        return [asdict(record) for record in records]
+
+    def merge(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Adds records drained from another recorder.
+        """
+        with self._lock:
+            self._records.extend(SpanRecord(**record) for record in records)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregates records per stage name.
+
+        Returns:
+            Dict: Stage name -> calls, wall/CPU totals, max RSS growth,
+                  summed counts and tokens
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            stage = stages.setdefault(record.name, {
+                "calls": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "max_rss_peak_delta_kb": 0,
+                "counts": {},
+                "tokens": {}
+            })
+            stage["calls"] += 1
+            stage["wall_seconds"] += record.wall_seconds
+            stage["cpu_seconds"] += record.cpu_seconds
+            stage["max_rss_peak_delta_kb"] = max(
+                stage["max_rss_peak_delta_kb"], record.rss_peak_delta_kb or 0)
+            for totals, values in ((stage["counts"], record.counts),
+                                   (stage["tokens"], record.tokens)):
+                for key, value in values.items():
+                    totals[key] = totals.get(key, 0) + value
+
+        for stage in stages.values():
+            stage["wall_seconds"] = round(stage["wall_seconds"], 6)
+            stage["cpu_seconds"] = round(stage["cpu_seconds"], 6)
+        return stages
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Builds the JSON report: per-stage totals, per-document stage
+        totals and every span.
+        """
+        records = self.records
+        documents: Dict[str, Dict[str, float]] = {}
+        for record in records:
+            if record.document:
+                stages = documents.setdefault(record.document, {})
+                stages[record.name] = round(
+                    stages.get(record.name, 0.0) + record.wall_seconds, 6)
+
+        return {
+            "generated_at": time.time(),
+            "stages": self.summary(),
+            "documents": documents,
+            "spans": [asdict(record) for record in records]
+        }
+
+    def write_json_report(self, path: str) -> None:
+        """
+        Writes report() as JSON.
+        """
+        _ensure_parent_dir(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        print(f"📈 Instrumentation report written to: {path}")
+
+    def write_chrome_trace(self, path: str) -> None:
+        """
+        Writes spans in the Chrome trace event format (open in
+        chrome://tracing or https://ui.perfetto.dev).
+        """
+        events = []
+        for record in self.records:
+            args: Dict[str, Any] = dict(record.attributes)
+            args.update({
+                "cpu_seconds": round(record.cpu_seconds, 6),
+                "rss_peak_delta_kb": record.rss_peak_delta_kb,
+                "counts": record.counts,
+                "tokens": record.tokens,
+            })
+            if record.document:
+                args["document"] = record.document
+            events.append({
+                "name": record.name,
+                "cat": record.name.split(".")[0],
+                "ph": "X",
+                "ts": record.start_time * 1e6,
+                "dur": record.wall_seconds * 1e6,
+                "pid": record.pid,
+                "tid": record.thread_id,
+                "args": args
+            })
+
+        _ensure_parent_dir(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        print(f"📈 Chrome trace written to: {path}")
+
+
+def _ensure_parent_dir(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+# Created on first use so importing this module reads no settings
+_recorder: Optional[Recorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Recorder:
+    """
+    Returns the process-wide recorder (enabled by INSTRUMENTATION_ENABLED).
+    """
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = Recorder(enabled=get_settings().instrumentation_enabled)
+    return _recorder
+
+
+def enable_instrumentation(enabled: bool = True) -> Recorder:
+    """
+    Turns span recording on or off for this process.
+
+    Returns:
+        Recorder: The process-wide recorder
+    """
+    recorder = get_recorder()
+    recorder.enabled = enabled
+    return recorder
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Records one pipeline stage.
+
+    CPU time is that of the current thread; peak RSS growth is
+    process-wide, so it is approximate when spans run concurrently.
+    A "document" attribute is inherited by nested spans.
+
+    Args:
+        name (str): Stage name (e.g. "pdf.page")
+        **attributes: Span attributes
+
+    Yields:
+        Span: Handle for count() / add_tokens() / set()
+
+    Examples:
+        >>> with span("chunking") as s:
+        ...     s.count("chunks", 3)
+    """
+    recorder = _recorder or get_recorder()
+    if not recorder.enabled:
+        yield _NOOP_SPAN
+        return
+
+    current = Span(name, attributes, _current_span.get())
+    token = _current_span.set(current)
+
+    start_time = time.time()
+    start_wall = time.perf_counter()
+    start_cpu = time.thread_time()
+    start_rss = _peak_rss_kb()
+    try:
+        yield current
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.thread_time() - start_cpu
+        end_rss = _peak_rss_kb()
+        _current_span.reset(token)
+
+        recorder.record(SpanRecord(
+            name=name,
+            span_id=current.span_id,
+            parent_id=current.parent_id,
+            document=current.document,
+            start_time=start_time,
+            wall_seconds=wall,
+            cpu_seconds=cpu,
+            rss_peak_delta_kb=(end_rss - start_rss)
+            if start_rss is not None and end_rss is not None else None,
+            pid=os.getpid(),
+            thread_id=threading.get_ident(),
+            counts=current.counts,
+            tokens=current.tokens,
+            attributes=current.attributes
+        ))
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording each call of a (sync or async) function as a span.
+
+    Args:
+        name (Optional[str]): Stage name (defaults to the function's qualname)
+    """
+    def decorator(func: Callable) -> Callable:
+        stage = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -4,19 +4,49 @@ LangChain client for LLM operations and embeddings.
 Handles all interactions with OpenAI via LangChain abstractions.
 """
 
-from typing import List, Optional
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+import asyncio
+import contextvars
+import threading
+import weakref
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import List, Optional, Any
 from langchain_core.prompts import PromptTemplate
 from langchain.messages import HumanMessage
+from src.embedding_cache import CachedEmbeddings
+from src.llm_cache import LLMResponseCache
+from src.instrumentation import span
 from config.config import (
-    OPENAI_API_KEY,
+    get_settings,
     LLM_MODEL,
     EMBEDDING_MODEL,
+    EMBEDDING_CACHE_ENABLED,
     LLM_TEMPERATURE,
+    LLM_MAX_CONCURRENCY,
+    LLM_CACHE_ENABLED,
     ROLE_EXTRACTION_PROMPT
 )
 
 
+class RoleExtractionError(RuntimeError):
+    """
+    Raised when the LLM call behind role extraction fails (e.g. rate limits).
+
+    Distinguishes a failed extraction from a document without roles, so
+    the pipeline reports an error instead of an empty, valid result.
+    """
+
+
+def _record_token_usage(llm_span, response: Any) -> None:
+    """
+    Adds the token usage reported on a chat response to a span.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    llm_span.add_tokens(
+        input_tokens=usage.get("input_tokens", 0),
+        output_tokens=usage.get("output_tokens", 0)
+    )
+
+
 class LangChainClient:
     """
     Client for interacting with OpenAI models via LangChain.
@@ -24,25 +54,73 @@ class LangChainClient:
     Provides methods for:
     - Text generation (role extraction)
     - Text embeddings (for vector storage)
+    - Async counterparts with a bounded number of in-flight calls
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm: Optional[Any] = None,
+        embeddings: Optional[Any] = None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        use_response_cache: bool = LLM_CACHE_ENABLED,
+        response_cache: Optional[LLMResponseCache] = None
+    ):
         """
         Initialize LangChain client with OpenAI models.
+
+        Args:
+            llm: Chat model to use instead of ChatOpenAI (e.g. a local fake)
+            embeddings: Embeddings model to use instead of OpenAIEmbeddings
+            max_concurrency (int): Maximum concurrent async LLM/embedding calls
+            use_response_cache (bool): Reuse cached responses for identical prompts
+            response_cache (Optional[LLMResponseCache]): Cache to use instead
+                                                         of the default one
         """
         # Initialize Chat LLM for text generation
-        self.llm = ChatOpenAI(
-            model=LLM_MODEL,
-            temperature=LLM_TEMPERATURE,
-            max_completion_tokens=1000,  # Sufficient for role extraction
-            timeout=60  # 60 second timeout
-        )
+        if llm is not None:
+            self.llm = llm
+        else:
+            # OpenAI models are the only path that needs the API key
+            from langchain_openai import ChatOpenAI
+
+            self.llm = ChatOpenAI(
+                model=LLM_MODEL,
+                temperature=LLM_TEMPERATURE,
+                max_completion_tokens=1000,  # Sufficient for role extraction
+                timeout=60,  # 60 second timeout
+                api_key=get_settings().require_openai_api_key()
+            )
 
-        # Initialize embeddings model
-        self.embeddings = OpenAIEmbeddings(
-            model=EMBEDDING_MODEL,
+        # Model identity for the response cache key
+        self.model_name = str(getattr(
+            self.llm, "model_name", None) or type(self.llm).__name__)
+        self.temperature = float(getattr(self.llm, "temperature", None) or 0.0)
 
-        )
+        # Persistent response cache (opt out with LLM_CACHE_ENABLED=false)
+        self.response_cache: Optional[LLMResponseCache] = None
+        if use_response_cache:
+            self.response_cache = response_cache or LLMResponseCache()
+
+        if embeddings is not None:
+            self.embeddings = embeddings
+        else:
+            from langchain_openai import OpenAIEmbeddings
+
+            # Initialize embeddings model
+            self.embeddings = OpenAIEmbeddings(
+                model=EMBEDDING_MODEL,
+                api_key=get_settings().require_openai_api_key()
+            )
+
+            # Serve repeated chunks from the persistent embedding cache
+            if EMBEDDING_CACHE_ENABLED:
+                self.embeddings = CachedEmbeddings(
+                    self.embeddings, model=EMBEDDING_MODEL)
+
+        # asyncio.Semaphore binds to one event loop, so keep one per loop
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
 
         # Create prompt template for role extraction
         self.role_extraction_template = PromptTemplate(
@@ -61,6 +139,9 @@ class LangChainClient:
 
         Returns:
             str: Comma-separated list of roles or 'None' if no roles found
+
+        Raises:
+            RoleExtractionError: If the LLM call fails
         """
         if not document_text or not document_text.strip():
             print("⚠️  No document text provided for role extraction")
@@ -72,12 +153,8 @@ class LangChainClient:
                 document_content=document_text
             )
 
-            # Create message and invoke LLM
-            message = HumanMessage(content=prompt)
-            response = self.llm.invoke([message])
-
-            # Extract content from response
-            roles_text = str(response.content).strip()
+            # Invoke LLM (or reuse a cached response)
+            roles_text = self._invoke_llm(prompt)
 
             print(f"📝 LLM extracted roles: {roles_text[:100]}...")
 
@@ -85,7 +162,67 @@ class LangChainClient:
 
         except Exception as e:
             print(f"❌ Error during LLM role extraction: {e}")
-            return "None"
+            raise RoleExtractionError(f"LLM role extraction failed: {e}") from e
+
+    def extract_roles_from_chunks(
+        self,
+        chunks: List[str],
+        max_workers: Optional[int] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> List[str]:
+        """
+        Extracts roles from several chunks concurrently (map step).
+
+        Each chunk gets its own prompt, so documents larger than the
+        context window can be processed and total latency is bounded by
+        the slowest chunk rather than the document length.
+
+        Args:
+            chunks (List[str]): Document chunks to analyze
+            max_workers (Optional[int]): Maximum concurrent LLM calls
+                                         (default: max_concurrency)
+            cancelled (Optional[threading.Event]): When set, chunks whose
+                                                   call has not started yet
+                                                   are skipped
+
+        Returns:
+            List[str]: Raw LLM response per chunk, in chunk order
+
+        Raises:
+            RoleExtractionError: If the LLM call for any chunk fails
+            CancelledError: If cancelled was set before every call started
+        """
+        if not chunks:
+            return []
+
+        if max_workers is None:
+            max_workers = self.max_concurrency
+
+        # Run each call in a copy of the caller's context so its
+        # instrumentation spans stay attached to the current document
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._extract_unless_cancelled,
+                    chunk,
+                    cancelled
+                )
+                for chunk in chunks
+            ]
+            return [future.result() for future in futures]
+
+    def _extract_unless_cancelled(
+        self,
+        chunk: str,
+        cancelled: Optional[threading.Event]
+    ) -> str:
+        """
+        Runs one map call, unless the extraction was cancelled meanwhile.
+        """
+        if cancelled is not None and cancelled.is_set():
+            raise CancelledError("Role extraction was cancelled")
+        return self.extract_roles_from_text(chunk)
 
     def generate_embeddings(self, text: str) -> Optional[List[float]]:
         """
@@ -156,8 +293,79 @@ class LangChainClient:
             return "No relevant context found to answer the query."
 
         try:
-            # Create a prompt for context-based Q&A
-            qa_prompt = f"""Based on the following document excerpts, answer the question.
+            return self._invoke_llm(self._build_qa_prompt(query, context))
+
+        except Exception as e:
+            print(f"❌ Error during context-based query: {e}")
+            return f"Error generating response: {str(e)}"
+
+    def _invoke_llm(self, prompt: str) -> str:
+        """
+        Sends a prompt to the LLM, serving repeats from the response cache.
+
+        Args:
+            prompt (str): Fully rendered prompt
+
+        Returns:
+            str: Stripped response text
+        """
+        with span("llm.call", model=self.model_name) as llm_span:
+            llm_span.count("prompt_chars", len(prompt))
+
+            if self.response_cache is not None:
+                cached = self.response_cache.get(
+                    self.model_name, self.temperature, prompt)
+                if cached is not None:
+                    print("♻️  Reusing cached LLM response")
+                    llm_span.set(cached=True)
+                    return cached
+
+            response = self.llm.invoke([HumanMessage(content=prompt)])
+            _record_token_usage(llm_span, response)
+        response_text = str(response.content).strip()
+
+        if self.response_cache is not None:
+            self.response_cache.put(
+                self.model_name, self.temperature, prompt, response_text)
+
+        return response_text
+
+    async def _ainvoke_llm(self, prompt: str) -> str:
+        """
+        Async version of _invoke_llm(); cache misses count against the
+        concurrency limit, cache hits do not. Response cache reads and
+        writes are blocking SQLite calls, so they run in worker threads
+        instead of on the event loop.
+        """
+        with span("llm.call", model=self.model_name) as llm_span:
+            llm_span.count("prompt_chars", len(prompt))
+
+            if self.response_cache is not None:
+                cached = await asyncio.to_thread(
+                    self.response_cache.get,
+                    self.model_name, self.temperature, prompt)
+                if cached is not None:
+                    print("♻️  Reusing cached LLM response")
+                    llm_span.set(cached=True)
+                    return cached
+
+            async with self._get_semaphore():
+                response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            _record_token_usage(llm_span, response)
+        response_text = str(response.content).strip()
+
+        if self.response_cache is not None:
+            await asyncio.to_thread(
+                self.response_cache.put,
+                self.model_name, self.temperature, prompt, response_text)
+
+        return response_text
+
+    def _build_qa_prompt(self, query: str, context: str) -> str:
+        """
+        Creates a prompt for context-based Q&A.
+        """
+        return f"""Based on the following document excerpts, answer the question.
             If the answer cannot be found in the context, say "I cannot find this information in the provided documents."
 
             Context:
@@ -167,15 +375,107 @@ class LangChainClient:
 
             Answer:"""
 
-            message = HumanMessage(content=qa_prompt)
-            response = self.llm.invoke([message])
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the concurrency-limiting semaphore for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def aextract_roles_from_text(self, document_text: str) -> str:
+        """
+        Async version of extract_roles_from_text().
 
-            return str(response.content).strip()
+        At most max_concurrency calls are in flight per event loop.
+
+        Args:
+            document_text (str): The document content to analyze
+
+        Returns:
+            str: Comma-separated list of roles or 'None' if no roles found
+
+        Raises:
+            RoleExtractionError: If the LLM call fails
+        """
+        if not document_text or not document_text.strip():
+            print("⚠️  No document text provided for role extraction")
+            return "None"
+
+        try:
+            prompt = self.role_extraction_template.format(
+                document_content=document_text
+            )
+
+            roles_text = await self._ainvoke_llm(prompt)
+
+            print(f"📝 LLM extracted roles: {roles_text[:100]}...")
+
+            return roles_text
+
+        except Exception as e:
+            print(f"❌ Error during LLM role extraction: {e}")
+            raise RoleExtractionError(f"LLM role extraction failed: {e}") from e
+
+    async def aextract_roles_from_chunks(self, chunks: List[str]) -> List[str]:
+        """
+        Async version of extract_roles_from_chunks().
+
+        Args:
+            chunks (List[str]): Document chunks to analyze
+
+        Returns:
+            List[str]: Raw LLM response per chunk, in chunk order
+        """
+        return list(await asyncio.gather(
+            *(self.aextract_roles_from_text(chunk) for chunk in chunks)
+        ))
+
+    async def aquery_with_context(self, query: str, context: str) -> str:
+        """
+        Async version of query_with_context().
+
+        Args:
+            query (str): The user's question
+            context (str): Retrieved context from vector store
+
+        Returns:
+            str: LLM's answer based on the context
+        """
+        if not context or not context.strip():
+            return "No relevant context found to answer the query."
+
+        try:
+            return await self._ainvoke_llm(self._build_qa_prompt(query, context))
 
         except Exception as e:
             print(f"❌ Error during context-based query: {e}")
             return f"Error generating response: {str(e)}"
 
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async version of generate_embeddings_batch().
+
+        Args:
+            texts (List[str]): List of texts to embed
+
+        Returns:
+            List[List[float]]: List of embedding vectors
+        """
+        if not texts:
+            return []
+
+        try:
+            async with self._get_semaphore():
+                return await self.embeddings.aembed_documents(texts)
+
+        except Exception as e:
+            print(f"❌ Error generating batch embeddings: {e}")
+            return []
+
     def get_embedding_dimension(self) -> int:
         """
         Returns the dimension of the embedding vectors.
@@ -0,0 +1,88 @@
+# src/llm_cache.py
+"""
+Persistent cache of LLM responses.
+Keyed by (model, temperature, rendered prompt) so identical deterministic calls skip the API.
+"""
+
+from typing import Optional, Dict, Any
+from src.cache_store import SQLiteCache, hash_key
+from config.config import (
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES
+)
+
+
+class LLMResponseCache:
+    """
+    Response cache for chat model calls.
+
+    With temperature 0.0 the same prompt sent to the same model gives a
+    reusable answer, so re-validating unchanged documents needs no API
+    call. Entries expire after ttl_seconds and the least recently used
+    ones are evicted beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        db_path: str = LLM_CACHE_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES
+    ):
+        """
+        Initialize the LLM response cache.
+
+        Args:
+            db_path (str): Path to the SQLite cache file
+            ttl_seconds (float): Entry lifetime in seconds (0 = never expire)
+            max_entries (int): Maximum cached responses (0 = unbounded)
+        """
+        self.store = SQLiteCache(
+            db_path,
+            "llm_responses",
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds
+        )
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> str:
+        """
+        Builds the cache key for a rendered prompt.
+        """
+        return hash_key(model, repr(float(temperature)), prompt)
+
+    def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        """
+        Returns the cached response for a prompt, if any.
+
+        Args:
+            model (str): Model name
+            temperature (float): Sampling temperature
+            prompt (str): Fully rendered prompt
+
+        Returns:
+            Optional[str]: Cached response text or None on a miss
+        """
+        value = self.store.get(self.make_key(model, temperature, prompt))
+        return value.decode('utf-8') if value is not None else None
+
+    def put(self, model: str, temperature: float, prompt: str, response: str) -> None:
+        """
+        Stores a response for a prompt.
+
+        Args:
+            model (str): Model name
+            temperature (float): Sampling temperature
+            prompt (str): Fully rendered prompt
+            response (str): Response text to cache
+        """
+        self.store.put(
+            self.make_key(model, temperature, prompt),
+            response.encode('utf-8')
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns cache hit/miss statistics.
+        """
+        return self.store.stats()
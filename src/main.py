@@ -4,33 +4,40 @@ Command-line interface for the AI Role Validator.
 Runs the complete validation pipeline without Streamlit UI.
 """
 
-from config.config import (
-    FUZZY_MATCH_THRESHOLD,
-    DEFAULT_XML_XPATH,
-    CHROMA_PERSIST_DIR
-)
-from src.role_comparer import RoleComparer
-from src.pdf_extractor_rag import RAGPDFExtractor
-from src.xml_parser import extract_roles_from_xml
+from config.config import DEFAULT_XML_XPATH, get_settings
+from src.xml_parser import XmlRoleSource
+from src.utils import normalize_role
+from src.instrumentation import enable_instrumentation
+import argparse
 import os
 import sys
+import time
+from typing import List, Optional
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# The LLM / vector store / PDF stack (LangChain, Chroma, PyMuPDF) is
+# imported inside the commands that use it, so --help and XML-only
+# commands start without loading it.
 
-def ensure_data_directories():
+
+def ensure_data_directories(include_vector_store: bool = True):
     """
     Ensures that required data directories exist.
     Creates them if they don't exist.
+
+    Args:
+        include_vector_store (bool): Also create the Chroma directory
     """
     directories = [
         'data/xml_data',
-        'data/pdf_data',
-        CHROMA_PERSIST_DIR
+        'data/pdf_data'
     ]
+    if include_vector_store:
+        directories.append(get_settings().chroma_persist_dir)
 
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
@@ -94,12 +101,257 @@ def validate_pdf_exists(pdf_filepath: str) -> bool:
     return True
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses command-line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments (defaults to sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Validate PDF job roles against an XML role catalog."
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        default=settings.validate_only,
+        help="Skip vector indexing and the RAG query demo "
+             "(no embedding calls, no Chroma writes)"
+    )
+    parser.add_argument(
+        "--report", metavar="PATH",
+        help="Write a per-stage timing/resource report as JSON"
+    )
+    parser.add_argument(
+        "--trace", metavar="PATH",
+        help="Write a Chrome trace file (chrome://tracing, ui.perfetto.dev)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Validate a directory or glob of PDFs against one XML catalog "
+             "(validation-only, no vector indexing)"
+    )
+    batch_parser.add_argument(
+        "xml", help="Path to the XML role catalog or a compiled catalog (compile-catalog)")
+    batch_parser.add_argument(
+        "pdfs", help="Directory of PDFs or glob pattern (quote it, e.g. 'data/**/*.pdf')")
+    batch_parser.add_argument(
+        "-o", "--output", default="batch_results.jsonl",
+        help="JSON Lines output file (default: batch_results.jsonl)")
+    batch_parser.add_argument(
+        "-w", "--workers", type=int, default=settings.batch_workers,
+        help=f"Documents validated concurrently (default: {settings.batch_workers})")
+    batch_parser.add_argument(
+        "--executor", choices=["thread", "process"], default=settings.batch_executor,
+        help=f"Worker pool type (default: {settings.batch_executor})")
+    batch_parser.add_argument(
+        "--threshold", type=int, default=settings.fuzzy_match_threshold,
+        help=f"Fuzzy match threshold (default: {settings.fuzzy_match_threshold})")
+    batch_parser.add_argument(
+        "--xpath", default=DEFAULT_XML_XPATH,
+        help=f"XPath for XML roles (default: {DEFAULT_XML_XPATH})")
+
+    batch_parser.add_argument(
+        "--no-cache", dest="use_cache", action="store_false",
+        default=settings.validation_cache_enabled,
+        help="Re-validate every document instead of reusing cached results")
+
+    inspect_parser = subparsers.add_parser(
+        "inspect-xml",
+        help="Show the roles an XML catalog yields (no LLM or PDF work)"
+    )
+    inspect_parser.add_argument("xml", help="Path to the XML role catalog")
+    inspect_parser.add_argument(
+        "--xpath", default=DEFAULT_XML_XPATH,
+        help=f"XPath for XML roles (default: {DEFAULT_XML_XPATH})")
+
+    compile_parser = subparsers.add_parser(
+        "compile-catalog",
+        help="Compile an XML role catalog into a binary artifact for fast loading"
+    )
+    compile_parser.add_argument("xml", help="Path to the XML role catalog")
+    compile_parser.add_argument(
+        "-o", "--output",
+        help="Artifact path (default: the XML path with a .rvcat extension)")
+    compile_parser.add_argument(
+        "--xpath", default=DEFAULT_XML_XPATH,
+        help=f"XPath for XML roles (default: {DEFAULT_XML_XPATH})")
+    compile_parser.add_argument(
+        "--attributes", nargs="+", default=[], metavar="NAME",
+        help="Role element attributes to store (e.g. level department)")
+
+    cache_parser = subparsers.add_parser(
+        "cache", help="Inspect or evict cached validation results")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+
+    list_parser = cache_subparsers.add_parser(
+        "list", help="List cached results, most recently used first")
+    list_parser.add_argument(
+        "-n", "--limit", type=int, default=20,
+        help="Maximum entries to show (0 = all, default: 20)")
+
+    evict_parser = cache_subparsers.add_parser(
+        "evict", help="Remove cached results by key (prefix) or all of them")
+    evict_parser.add_argument(
+        "keys", nargs="*", help="Cache keys or key prefixes shown by 'cache list'")
+    evict_parser.add_argument(
+        "--all", action="store_true", help="Remove every cached result")
+
+    return parser.parse_args(argv)
+
+
+def inspect_xml(xml_filepath: str, xml_role_xpath: str = DEFAULT_XML_XPATH) -> int:
+    """
+    Prints the roles extracted from an XML catalog and duplicate groups.
+
+    Args:
+        xml_filepath (str): Path to the XML catalog
+        xml_role_xpath (str): XPath expression for XML roles
+
+    Returns:
+        int: Exit status (0 = roles found, 1 = no roles)
+    """
+    if not os.path.exists(xml_filepath):
+        print(f"❌ Error: XML file not found at {xml_filepath}")
+        return 1
+
+    # Roles, well-formedness and statistics all come from one parse
+    source = XmlRoleSource(xml_filepath)
+    xml_roles = source.roles(xml_role_xpath)
+    if not xml_roles:
+        print("⚠️  No roles extracted from XML.")
+        return 1
+    stats = source.statistics(xml_role_xpath)
+
+    # Roles that collapse to the same name after normalization
+    groups = {}
+    for role in xml_roles:
+        groups.setdefault(normalize_role(role), []).append(role)
+    duplicates = {norm: roles for norm, roles in groups.items() if len(roles) > 1}
+
+    print(f"\n📊 XML Catalog: {xml_filepath}")
+    print(f"  • Well-formed: {'yes' if source.is_well_formed() else 'no (recovered)'}")
+    print(f"  • Root element: <{stats['root_tag']}> ({stats['total_elements']} elements)")
+    print(f"  • Roles: {len(xml_roles)}")
+    print(f"  • Unique (normalized): {len(groups)}")
+    print(f"  • Duplicate groups: {len(duplicates)}")
+
+    if duplicates:
+        print("\n🔁 Duplicates:")
+        for norm, roles in sorted(duplicates.items()):
+            print(f"  • {norm}: {', '.join(roles)}")
+
+    return 0
+
+
+def compile_catalog_command(
+    xml_filepath: str,
+    output_path: Optional[str] = None,
+    xml_role_xpath: str = DEFAULT_XML_XPATH,
+    attributes: Optional[List[str]] = None
+) -> int:
+    """
+    Compiles an XML catalog into a binary artifact.
+
+    Args:
+        xml_filepath (str): Path to the XML catalog
+        output_path (Optional[str]): Artifact path (defaults to <xml>.rvcat)
+        xml_role_xpath (str): XPath expression for XML roles
+        attributes (Optional[List[str]]): Role attributes to store
+
+    Returns:
+        int: Exit status (0 = compiled, 1 = failure)
+    """
+    from src.catalog_artifact import CATALOG_EXTENSION, compile_catalog
+
+    if not os.path.exists(xml_filepath):
+        print(f"❌ Error: XML file not found at {xml_filepath}")
+        return 1
+
+    output_path = output_path or os.path.splitext(xml_filepath)[0] + CATALOG_EXTENSION
+    try:
+        header = compile_catalog(xml_filepath, output_path, xml_role_xpath, attributes)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"\n📦 Compiled catalog: {output_path}")
+    print(f"  • Roles: {header['role_count']}")
+    print(f"  • Attributes: {', '.join(header['attributes']) or 'none'}")
+    print(f"  • Size: {os.path.getsize(output_path) / 1024:.1f} KiB")
+    print(f"  • Source SHA-256: {header['source_sha256']}")
+    return 0
+
+
+def cache_command(args: argparse.Namespace) -> int:
+    """
+    Lists or evicts entries of the validation result cache.
+
+    Args:
+        args (argparse.Namespace): Parsed "cache" subcommand arguments
+
+    Returns:
+        int: Exit status (0 = success, 1 = nothing matched / bad arguments)
+    """
+    from src.validation_cache import ValidationResultCache
+
+    cache = ValidationResultCache()
+
+    if args.cache_command == "list":
+        entries = cache.list_entries(limit=args.limit)
+        print(f"\n🗄️  Validation cache: {len(cache.store)} entries")
+        for entry in entries:
+            status = "valid" if entry["is_valid"] else "invalid"
+            accessed = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(entry["accessed_at"]))
+            print(f"  • {entry['key'][:16]}  {status:<7}  {accessed}  "
+                  f"{entry['pdf_path']}")
+            print(f"      model={entry['model']} threshold={entry['fuzzy_threshold']} "
+                  f"xpath={entry['xml_xpath']} xml={entry['xml_hash'][:12]} "
+                  f"pdf={entry['pdf_hash'][:12]}")
+        return 0
+
+    if args.all:
+        removed = cache.clear()
+    elif args.keys:
+        removed = cache.evict(args.keys)
+    else:
+        print("❌ Give cache keys (or prefixes) to evict, or --all")
+        return 1
+
+    print(f"🗑️  Evicted {removed} cached results")
+    return 0 if removed or args.all else 1
+
+
+def main(validate_only: Optional[bool] = None):
     """
     Main execution function for the role validation pipeline.
+
+    Args:
+        validate_only (Optional[bool]): Go straight from extraction to LLM to
+                                        comparison, skipping the vector store
+                                        (None = VALIDATE_ONLY)
     """
+    from src.role_comparer import RoleComparer
+    from src.pdf_extractor_rag import RAGPDFExtractor
+    from src.pipeline import validate_concurrently
+
+    settings = get_settings()
+    if validate_only is None:
+        validate_only = settings.validate_only
+    fuzzy_threshold = settings.fuzzy_match_threshold
+
     print("\n" + "=" * 60)
     print("    🤖 AI ROLE VALIDATOR - CLI MODE")
+    if validate_only:
+        print("    (validation-only: vector indexing skipped)")
     print("=" * 60)
 
     # --- Configuration ---
@@ -110,7 +362,7 @@ def main():
 
     # --- Setup ---
     print("\n📂 Setting up directories...")
-    ensure_data_directories()
+    ensure_data_directories(include_vector_store=not validate_only)
 
     print("\n📝 Preparing XML file...")
     create_sample_xml(xml_filepath)
@@ -122,14 +374,33 @@ def main():
 
     print(f"✅ Using PDF file: {pdf_filepath}")
 
-    # --- Step 1: Extract roles from XML ---
+    # --- Steps 1-3: XML parsing, PDF indexing and role extraction ---
+    # The three stages are independent, so they run concurrently; the
+    # comparison starts as soon as both role lists exist and indexing
+    # may still be finishing in the background.
     print("\n" + "=" * 60)
-    print("STEP 1: EXTRACTING ROLES FROM XML")
+    print("STEPS 1-3: XML PARSING, PDF INDEXING & ROLE EXTRACTION")
     print("=" * 60)
 
-    xml_roles = extract_roles_from_xml(xml_filepath, xml_role_xpath)
+    # The vector store is only opened when indexing or querying
+    pdf_extractor = RAGPDFExtractor()
+
+    if validate_only:
+        print("\n⏭️  Validation-only mode: skipping vector indexing")
 
+    result, indexing = validate_concurrently(
+        xml_filepath,
+        pdf_filepath,
+        pdf_id=None if validate_only else pdf_id,
+        xml_role_xpath=xml_role_xpath,
+        fuzzy_threshold=fuzzy_threshold,
+        pdf_extractor=pdf_extractor
+    )
+
+    xml_roles = result["xml_roles"]
     if not xml_roles:
+        if result.get("error") and result["error"] != "No XML roles":
+            print(f"❌ {result['error']}")
         print("⚠️  Warning: No roles extracted from XML.")
         print("   Please check the XML file and XPath expression.")
         return
@@ -138,34 +409,11 @@ def main():
     for i, role in enumerate(xml_roles, 1):
         print(f"  {i}. {role}")
 
-    # --- Step 2: Initialize RAG PDF Extractor ---
-    print("\n" + "=" * 60)
-    print("STEP 2: INITIALIZING PDF EXTRACTOR & VECTOR STORE")
-    print("=" * 60)
-
-    pdf_extractor = RAGPDFExtractor()
-
-    # --- Step 3: Process PDF ---
-    print("\n" + "=" * 60)
-    print("STEP 3: PROCESSING PDF DOCUMENT")
-    print("=" * 60)
-
-    # Clear previous data for this PDF
-    print(f"\n🗑️  Clearing previous data for PDF ID: {pdf_id}")
-    pdf_extractor.clear_pdf_data(pdf_id)
-
-    # Process and index PDF
-    print(f"\n📊 Indexing PDF into vector store...")
-    success = pdf_extractor.process_pdf(pdf_filepath, pdf_id)
-
-    if not success:
-        print("❌ Failed to process PDF. Exiting.")
+    if result["status"] != "ok":
+        print(f"❌ Failed to extract roles from PDF: {result['error']}")
         return
 
-    # Extract roles from PDF
-    print(f"\n🔍 Extracting roles from PDF using LLM...")
-    pdf_roles = pdf_extractor.extract_roles_from_pdf(pdf_filepath)
-
+    pdf_roles = result["pdf_roles"]
     if not pdf_roles:
         print("⚠️  Warning: No roles extracted from PDF.")
         print("   This might indicate:")
@@ -177,16 +425,12 @@ def main():
         for i, role in enumerate(pdf_roles, 1):
             print(f"  {i}. {role}")
 
-    # --- Step 4: Compare Roles ---
-    print("\n" + "=" * 60)
-    print("STEP 4: COMPARING ROLES")
-    print("=" * 60)
-
-    comparer = RoleComparer(fuzzy_threshold=FUZZY_MATCH_THRESHOLD)
-
-    is_incorrect, matched_roles, incorrect_pdf_roles, fuzzy_matches = comparer.compare_roles(
-        xml_roles, pdf_roles
-    )
+    # --- Step 4: Compare Roles (done by the pipeline) ---
+    comparer = RoleComparer(fuzzy_threshold=fuzzy_threshold)
+    is_incorrect = result["is_incorrect"]
+    matched_roles = result["matched_roles"]
+    incorrect_pdf_roles = result["incorrect_roles"]
+    fuzzy_matches = result["fuzzy_matches"]
 
     # --- Step 5: Generate Report ---
     print("\n" + "=" * 60)
@@ -202,24 +446,35 @@ def main():
         pdf_roles=pdf_roles
     )
 
-    # --- Optional: Demonstrate RAG Query ---
-    print("\n" + "=" * 60)
-    print("OPTIONAL: RAG QUERY DEMONSTRATION")
-    print("=" * 60)
+    if result.get("cached") and not validate_only:
+        print("\n⏭️  Cached result: vector indexing and RAG query demo skipped")
 
-    print("\n💬 Testing RAG query on PDF content...")
-    query = "What are the different job roles mentioned in the document?"
-    answer = pdf_extractor.query_pdf_with_rag(query, pdf_id=pdf_id, top_k=5)
+    if indexing is not None:
+        # The RAG demo needs the index, so wait for background indexing
+        print("\n⏳ Waiting for background indexing to finish...")
+        if not indexing.result():
+            print("❌ Failed to index PDF; skipping RAG query.")
+            indexing = None
 
-    print(f"\n❓ Query: {query}")
-    print(f"💡 Answer: {answer}")
+    if indexing is not None:
+        # --- Optional: Demonstrate RAG Query ---
+        print("\n" + "=" * 60)
+        print("OPTIONAL: RAG QUERY DEMONSTRATION")
+        print("=" * 60)
 
-    # --- Statistics ---
-    stats = pdf_extractor.get_pdf_statistics(pdf_id)
-    print(f"\n📊 PDF Statistics:")
-    print(f"  • Chunks indexed: {stats.get('chunk_count', 0)}")
-    print(f"  • Total characters: {stats.get('total_characters', 0)}")
-    print(f"  • Average chunk size: {stats.get('average_chunk_size', 0)}")
+        print("\n💬 Testing RAG query on PDF content...")
+        query = "What are the different job roles mentioned in the document?"
+        answer = pdf_extractor.query_pdf_with_rag(query, pdf_id=pdf_id, top_k=5)
+
+        print(f"\n❓ Query: {query}")
+        print(f"💡 Answer: {answer}")
+
+        # --- Statistics ---
+        stats = pdf_extractor.get_pdf_statistics(pdf_id)
+        print(f"\n📊 PDF Statistics:")
+        print(f"  • Chunks indexed: {stats.get('chunk_count', 0)}")
+        print(f"  • Total characters: {stats.get('total_characters', 0)}")
+        print(f"  • Average chunk size: {stats.get('average_chunk_size', 0)}")
 
     # --- Completion ---
     print("\n" + "=" * 60)
@@ -227,9 +482,58 @@ def main():
     print("=" * 60 + "\n")
 
 
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Runs the selected command.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Exit status
+    """
+    if args.command == "inspect-xml":
+        return inspect_xml(args.xml, args.xpath)
+    if args.command == "batch":
+        from src.batch import main_batch
+
+        return main_batch(
+            args.xml,
+            args.pdfs,
+            output_path=args.output,
+            xml_role_xpath=args.xpath,
+            fuzzy_threshold=args.threshold,
+            workers=args.workers,
+            executor_type=args.executor,
+            use_cache=args.use_cache
+        )
+    if args.command == "compile-catalog":
+        return compile_catalog_command(
+            args.xml, args.output, args.xpath, args.attributes)
+    if args.command == "cache":
+        return cache_command(args)
+    main(validate_only=args.validate_only)
+    return 0
+
+
 if __name__ == "__main__":
     try:
-        main()
+        args = parse_args()
+
+        recorder = None
+        if args.report or args.trace:
+            recorder = enable_instrumentation()
+
+        try:
+            exit_code = run_command(args)
+        finally:
+            if recorder is not None:
+                if args.report:
+                    recorder.write_json_report(args.report)
+                if args.trace:
+                    recorder.write_chrome_trace(args.trace)
+
+        sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\n\n⚠️  Process interrupted by user. Exiting...")
         sys.exit(0)
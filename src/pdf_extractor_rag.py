@@ -4,14 +4,64 @@ PDF extractor with RAG (Retrieval-Augmented Generation) capabilities.
 Handles PDF text extraction, chunking, vector storage, and role extraction.
 """
 
-import fitz  # PyMuPDF
-import uuid
-from typing import List, Dict, Optional
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple, Set, TYPE_CHECKING
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from src.langchain_client import LangChainClient
-from src.vectorstore_client import VectorStoreClient
-from src.utils import clean_extracted_roles
-from config.config import PDF_CHUNK_SIZE, PDF_CHUNK_OVERLAP
+from src.utils import clean_extracted_roles, merge_role_lists, make_chunk_id
+from src.instrumentation import span
+from src.gazetteer import GazetteerScan
+from src.span_filter import select_spans, effective_budget
+from src.role_catalog import RoleCatalogIndex
+from src.extraction_cache import (
+    ExtractedDocument,
+    ExtractedPage,
+    ExtractionCache,
+    compute_file_hash
+)
+from config.config import (
+    PDF_CHUNK_SIZE,
+    PDF_CHUNK_OVERLAP,
+    PDF_EXTRACTION_WORKERS,
+    PDF_PAGE_RANGE_SIZE,
+    PDF_STREAMING_INDEX,
+    PDF_INDEX_BATCH_SIZE,
+    PDF_INCREMENTAL_INDEX,
+    ROLE_EXTRACTION_MODE,
+    ROLE_EXTRACTION_POLICY,
+    ROLE_EXTRACTION_MAX_CHARS,
+    ROLE_EXTRACTION_CHUNK_SIZE,
+    ROLE_EXTRACTION_CHUNK_OVERLAP,
+    ROLE_SPAN_FILTER_ENABLED,
+    ROLE_SPAN_FILTER_MAX_CHARS,
+    ROLE_SPAN_FILTER_MAX_TOKENS,
+    ROLE_SPAN_FILTER_NEIGHBORS
+)
+
+if TYPE_CHECKING:
+    from src.vectorstore_client import VectorStoreClient
+
+ROLE_EXTRACTION_POLICIES = ("llm", "gazetteer", "gazetteer_first", "merge")
+
+
+@dataclass
+class _RoleExtractionPlan:
+    """
+    What a role extraction sends to the LLM.
+
+    Attributes:
+        roles: Final roles when no LLM call is needed, else None
+        scan: Gazetteer scan whose roles are merged into the LLM's
+        text: Prompt text for a single LLM call
+        chunks: Prompt texts for map-reduce (None for a single call)
+    """
+    roles: Optional[List[str]] = None
+    scan: Optional[GazetteerScan] = None
+    text: str = ""
+    chunks: Optional[List[str]] = None
 
 
 class RAGPDFExtractor:
@@ -26,17 +76,46 @@ class RAGPDFExtractor:
     - Query documents using semantic search
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        extraction_workers: int = PDF_EXTRACTION_WORKERS,
+        page_range_size: int = PDF_PAGE_RANGE_SIZE,
+        index_batch_size: int = PDF_INDEX_BATCH_SIZE,
+        role_extraction_mode: str = ROLE_EXTRACTION_MODE,
+        role_extraction_policy: str = ROLE_EXTRACTION_POLICY,
+        langchain_client: Optional[LangChainClient] = None,
+        keep_documents: bool = True,
+        span_filter_enabled: bool = ROLE_SPAN_FILTER_ENABLED
+    ):
         """
         Initialize RAG PDF Extractor with LangChain and vector store.
+
+        Args:
+            extraction_workers (int): Processes used for page extraction
+                                      (1 = sequential, 0 = one per CPU)
+            page_range_size (int): Pages handled per extraction worker task
+            index_batch_size (int): Chunks sent to the vector store per batch
+            role_extraction_mode (str): "auto", "single" or "map_reduce"
+            role_extraction_policy (str): "llm", "gazetteer", "gazetteer_first"
+                                          or "merge" (see config)
+            langchain_client (Optional[LangChainClient]): Client to use instead
+                                                          of a default one
+            keep_documents (bool): Keep extracted documents in memory for reuse
+                                   (disable for long batch runs; the disk
+                                   cache still applies)
+            span_filter_enabled (bool): Send the LLM only the spans most
+                                        likely to name roles (see config)
         """
+        self.extraction_workers = extraction_workers
+        self.page_range_size = page_range_size
+        self.index_batch_size = max(1, index_batch_size)
+
         # Initialize LangChain client for LLM and embeddings
-        self.langchain_client = LangChainClient()
+        self.langchain_client = langchain_client or LangChainClient()
 
-        # Initialize vector store with embeddings function
-        self.vectorstore_client = VectorStoreClient(
-            embeddings_function=self.langchain_client.embeddings
-        )
+        # Vector store is created on first use, so validation-only runs
+        # never open Chroma
+        self._vectorstore_client: Optional["VectorStoreClient"] = None
 
         # Initialize text splitter for chunking
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -47,142 +126,509 @@ class RAGPDFExtractor:
             separators=["\n\n", "\n", ". ", " ", ""]
         )
 
+        # Larger chunks for map-reduce role extraction (one LLM call each)
+        self.role_text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=ROLE_EXTRACTION_CHUNK_SIZE,
+            chunk_overlap=ROLE_EXTRACTION_CHUNK_OVERLAP,
+            length_function=len,
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+        self.role_extraction_mode = role_extraction_mode
+
+        if role_extraction_policy not in ROLE_EXTRACTION_POLICIES:
+            raise ValueError(
+                f"Unknown role extraction policy {role_extraction_policy!r}; "
+                f"expected one of {', '.join(ROLE_EXTRACTION_POLICIES)}")
+        self.role_extraction_policy = role_extraction_policy
+
+        # Character budget for LLM prompts (0 = send the whole text)
+        self.span_filter_budget = effective_budget(
+            ROLE_SPAN_FILTER_MAX_CHARS, ROLE_SPAN_FILTER_MAX_TOKENS
+        ) if span_filter_enabled else 0
+
+        # Extracted documents keyed by PDF content hash
+        self.extraction_cache = ExtractionCache()
+        self._documents: Dict[str, ExtractedDocument] = {}
+        self.keep_documents = keep_documents
+
+        # One lock per PDF hash, so concurrent stages (indexing and role
+        # extraction) wait for a single parse instead of parsing twice
+        self._document_locks: Dict[str, threading.Lock] = {}
+        self._document_locks_guard = threading.Lock()
+
         print("✅ RAG PDF Extractor initialized")
 
-    def _extract_text_and_tables_from_pdf(self, pdf_path: str) -> str:
+    @property
+    def vectorstore_client(self) -> "VectorStoreClient":
         """
-        Extracts text content from a PDF file, including tables.
+        Vector store client, initialized with the embeddings on first access.
+        """
+        if self._vectorstore_client is None:
+            # Chroma is only imported by code paths that index or query
+            from src.vectorstore_client import VectorStoreClient
+
+            self._vectorstore_client = VectorStoreClient(
+                embeddings_function=self.langchain_client.embeddings
+            )
+        return self._vectorstore_client
+
+    def _parse_pdf(self, pdf_path: str, pdf_hash: str) -> ExtractedDocument:
+        """
+        Parses a PDF into per-page text blocks and tables.
 
         Uses PyMuPDF (fitz) to extract:
         - Text blocks
         - Tables (structured data)
         - Preserves formatting for better context
+
+        Large documents are split into page ranges and extracted in a
+        process pool (see PDF_EXTRACTION_WORKERS / PDF_PAGE_RANGE_SIZE).
+
+        Args:
+            pdf_path (str): Path to the PDF file
+            pdf_hash (str): SHA-256 of the PDF bytes
+
+        Returns:
+            ExtractedDocument: Parsed document content
+        """
+        import fitz  # PyMuPDF
+        from src.pdf_pages import extract_pages
+
+        pdf_document = fitz.open(pdf_path)
+        page_count = pdf_document.page_count
+        pdf_document.close()
+
+        print(f"📄 Processing PDF: {pdf_path} ({page_count} pages)")
+
+        with span("pdf.extract", workers=self.extraction_workers) as extract_span:
+            pages = extract_pages(
+                pdf_path,
+                page_count,
+                workers=self.extraction_workers,
+                range_size=self.page_range_size
+            )
+            extract_span.count("pages", len(pages))
+
+        return ExtractedDocument(pdf_hash=pdf_hash, source=pdf_path, pages=pages)
+
+    def extract_document(self, pdf_path: str) -> Optional[ExtractedDocument]:
         """
-        full_text = []
+        Returns the extracted content of a PDF, parsing it at most once.
+
+        Documents are keyed by the SHA-256 of the PDF bytes and looked up
+        in memory first, then in the on-disk extraction cache. Concurrent
+        callers for the same PDF share one parse.
+
+        Args:
+            pdf_path (str): Path to the PDF file
 
+        Returns:
+            Optional[ExtractedDocument]: Extracted document or None on failure
+        """
         try:
-            pdf_document = fitz.open(pdf_path)
-            print(
-                f"📄 Processing PDF: {pdf_path} ({pdf_document.page_count} pages)")
-
-            # Iterate through all pages
-            for page_num in range(pdf_document.page_count):
-                page = pdf_document.load_page(page_num)
-
-                # --- Extract text blocks ---
-                text_blocks = page.get_text("blocks")
-                for block in text_blocks:
-                    text_content = block[4].strip()
-                    if text_content:
-                        full_text.append(text_content)
-
-                # --- Extract tables (new API) ---
-                try:
-                    # type: ignore[attr-defined]
-                    table_finder = page.find_tables()  # type:ignore
-                    tables = getattr(table_finder, "tables", [])
-                except Exception:
-                    tables = []
-
-                if tables:
-                    for table in tables:
-                        table_rows = []
-                        for row_data in table.extract():
-                            row_text = " | ".join([
-                                str(cell) if cell is not None else ""
-                                for cell in row_data
-                            ])
-                            table_rows.append(row_text)
-
-                        # Format table nicely
-                        table_str = "\n".join(table_rows)
-                        formatted_table = (
-                            f"\n--- TABLE: ROLES AND INFORMATION ---\n"
-                            f"{table_str.strip()}\n"
-                            f"--- END OF TABLE ---\n"
-                        )
-                        full_text.append(formatted_table)
-
-            pdf_document.close()
-
-            full_document_text = "\n\n".join(full_text)
-
-            print(f"✅ Extracted {len(full_document_text)} characters from PDF")
-            if 'tables' in locals():
-                print(f"📊 Found {len(tables)} tables")
-
-            return full_document_text
+            pdf_hash = compute_file_hash(pdf_path)
+
+            with self._document_lock(pdf_hash):
+                document = self._lookup_document(pdf_hash, pdf_path)
+                if document is None:
+                    document = self._parse_pdf(pdf_path, pdf_hash)
+                    self.extraction_cache.put(document)
+                    if self.keep_documents:
+                        self._documents[pdf_hash] = document
+
+                    print(f"✅ Extracted {len(document.text)} characters from PDF")
+                    print(f"📊 Found {document.table_count} tables")
+
+            return document
 
         except Exception as e:
             print(f"❌ Error extracting text from PDF: {e}")
-            return ""
+            return None
+
+    def _document_lock(self, pdf_hash: str) -> threading.Lock:
+        """
+        Returns the lock serializing extraction of one PDF.
+        """
+        with self._document_locks_guard:
+            lock = self._document_locks.get(pdf_hash)
+            if lock is None:
+                lock = self._document_locks[pdf_hash] = threading.Lock()
+            return lock
 
-    def process_pdf(self, pdf_path: str, pdf_id: str) -> bool:
+    def _lookup_document(
+        self,
+        pdf_hash: str,
+        pdf_path: str
+    ) -> Optional[ExtractedDocument]:
+        """
+        Returns an already extracted document from memory or the disk cache.
+
+        Args:
+            pdf_hash (str): SHA-256 of the PDF bytes
+            pdf_path (str): Path to the PDF file (for logging)
+
+        Returns:
+            Optional[ExtractedDocument]: Cached document or None on a miss
+        """
+        document = self._documents.get(pdf_hash)
+        if document is None:
+            document = self.extraction_cache.get(pdf_hash)
+            if document is not None:
+                print(f"♻️  Reusing cached extraction for: {pdf_path}")
+                if self.keep_documents:
+                    self._documents[pdf_hash] = document
+        return document
+
+    def _iter_pages(self, pdf_path: str, streaming: bool) -> Iterator[ExtractedPage]:
+        """
+        Yields the pages of a PDF for indexing.
+
+        Cached extractions are always reused. Otherwise, streaming mode
+        reads pages lazily one at a time instead of parsing the whole
+        document first; once the last page has been read, the pages are
+        stored like an extract_document() result, so role extraction
+        reuses them instead of parsing the PDF again.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+            streaming (bool): Read uncached PDFs page by page
+
+        Yields:
+            ExtractedPage: Extracted pages in page order
+        """
+        if streaming:
+            pdf_hash = compute_file_hash(pdf_path)
+            document = self._lookup_document(pdf_hash, pdf_path)
+            if document is None:
+                from src.pdf_pages import iter_pages
+
+                print(f"📄 Streaming PDF pages: {pdf_path}")
+                pages: List[ExtractedPage] = []
+                for page in iter_pages(pdf_path):
+                    pages.append(page)
+                    yield page
+
+                # Only complete documents are cached
+                document = ExtractedDocument(
+                    pdf_hash=pdf_hash, source=pdf_path, pages=pages)
+                self.extraction_cache.put(document)
+                if self.keep_documents:
+                    self._documents[pdf_hash] = document
+                return
+        else:
+            document = self.extract_document(pdf_path)
+            if document is None:
+                return
+
+        yield from document.pages
+
+    def _iter_chunks(
+        self,
+        pages: Iterable[ExtractedPage]
+    ) -> Iterator[Tuple[ExtractedPage, int, str]]:
+        """
+        Splits pages into chunks as they arrive.
+
+        Chunks never span page boundaries, so only one page of text is
+        held in memory at a time.
+
+        Args:
+            pages (Iterable[ExtractedPage]): Extracted pages
+
+        Yields:
+            Tuple[ExtractedPage, int, str]: (page, chunk index within page, chunk text)
+        """
+        for page in pages:
+            page_text = page.text
+            if not page_text.strip():
+                continue
+            with span("chunking", page=page.page_number) as chunk_span:
+                chunks = self.text_splitter.split_text(page_text)
+                chunk_span.count("chunks", len(chunks))
+            for i, chunk in enumerate(chunks):
+                yield page, i, chunk
+
+    def _iter_changed_pages(
+        self,
+        pages: Iterable[ExtractedPage],
+        stored_hashes: Dict[int, str],
+        current_hashes: Dict[int, str]
+    ) -> Iterator[ExtractedPage]:
+        """
+        Filters pages down to those whose content hash differs from the index.
+
+        Args:
+            pages (Iterable[ExtractedPage]): Extracted pages
+            stored_hashes (Dict[int, str]): Page number -> indexed page hash
+            current_hashes (Dict[int, str]): Collects the hash of every page seen
+
+        Yields:
+            ExtractedPage: New or changed pages
+        """
+        for page in pages:
+            current_hashes[page.page_number] = page.content_hash
+            if stored_hashes.get(page.page_number) != page.content_hash:
+                yield page
+
+    def _extract_text_and_tables_from_pdf(self, pdf_path: str) -> str:
+        """
+        Extracts text content from a PDF file, including tables.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+
+        Returns:
+            str: Full document text, or an empty string on failure
+        """
+        document = self.extract_document(pdf_path)
+        return document.text if document else ""
+
+    def process_pdf(
+        self,
+        pdf_path: str,
+        pdf_id: str,
+        streaming: bool = PDF_STREAMING_INDEX,
+        incremental: bool = PDF_INCREMENTAL_INDEX
+    ) -> bool:
         """
         Processes PDF: extracts text, chunks it, and stores in vector database.
 
-        This is the main method for indexing a PDF for RAG.
+        This is the main method for indexing a PDF for RAG. Pages flow
+        through a generator pipeline (pages -> chunks -> fixed-size batches)
+        so indexing starts before the last page is read.
+
+        Each chunk records its page's content hash, written only after
+        every chunk of the page is stored. In incremental mode only pages
+        whose hash changed (or whose earlier write did not complete) are
+        re-embedded on re-ingest; chunks of changed or removed pages are
+        deleted and unchanged pages are left untouched, so no prior
+        clear_pdf_data() call is needed.
 
         Args:
             pdf_path (str): Path to the PDF file
             pdf_id (str): Unique identifier for this PDF
+            streaming (bool): Read uncached PDFs page by page with bounded memory
+            incremental (bool): Re-index only pages whose content changed
 
         Returns:
             bool: Success status
         """
         print(f"\n🔄 Processing PDF: {pdf_path}")
 
-        # Extract text from PDF
-        text = self._extract_text_and_tables_from_pdf(pdf_path)
+        chunk_count = 0
+        indexed_count = 0
+        batch_texts: List[str] = []
+        batch_metadatas: List[Dict] = []
+        batch_ids: List[str] = []
+
+        stored_hashes: Dict[int, str] = {}
+        current_hashes: Dict[int, str] = {}
+        stale_pages: List[int] = []
+        cleared_pages: Set[int] = set()
+        # Page number -> (page hash, [(chunk ID, metadata)]) for pages whose
+        # hash is not recorded yet; filled in once all their chunks are stored
+        unhashed_pages: Dict[int, Tuple[str, List[Tuple[str, Dict]]]] = {}
+        write_failed = False
 
-        if not text.strip():
-            print(
-                f"⚠️  No content extracted from {pdf_path}. Skipping indexing.")
-            return False
-
-        # Split text into chunks using LangChain's text splitter
-        chunks = self.text_splitter.split_text(text)
-        print(f"✂️  Split document into {len(chunks)} chunks")
+        try:
+            pages: Iterable[ExtractedPage] = self._iter_pages(pdf_path, streaming)
+
+            if incremental:
+                stored_hashes = self._load_page_hashes(pdf_id)
+                pages = self._iter_changed_pages(
+                    pages, stored_hashes, current_hashes)
+
+            for page, page_chunk_index, chunk in self._iter_chunks(pages):
+                # Content-addressed ID: identical chunks keep identical IDs
+                chunk_id = make_chunk_id(
+                    pdf_id, chunk, page.page_number, page_chunk_index)
+
+                # Store chunk with metadata
+                metadata = {
+                    "pdf_id": pdf_id,
+                    "chunk_index": page_chunk_index,
+                    "chunk_id": chunk_id,
+                    "page_number": page.page_number,
+                    "page_hash": "",
+                    "source": pdf_path
+                }
+                batch_texts.append(chunk)
+                batch_metadatas.append(metadata)
+                batch_ids.append(chunk_id)
+                chunk_count += 1
+                unhashed_pages.setdefault(
+                    page.page_number, (page.content_hash, []))[1].append((chunk_id, metadata))
+
+                if page.page_number in stored_hashes \
+                        and page.page_number not in cleared_pages:
+                    stale_pages.append(page.page_number)
+                    cleared_pages.add(page.page_number)
+
+                if len(batch_texts) >= self.index_batch_size:
+                    # Old chunks of a changed page go before its new ones land
+                    self._delete_pages(pdf_id, stale_pages)
+                    stale_pages = []
+                    added = self._index_batch(
+                        batch_texts, batch_metadatas, batch_ids)
+                    indexed_count += added
+                    write_failed = write_failed or added < len(batch_texts)
+                    batch_texts, batch_metadatas, batch_ids = [], [], []
+                    if not write_failed:
+                        # Earlier pages are complete; this one may continue
+                        self._record_page_hashes(
+                            unhashed_pages, keep=page.page_number)
+
+            if incremental and not current_hashes:
+                # Nothing was extracted (unreadable PDF or parse error); that
+                # is not evidence that the indexed pages were removed
+                print(f"⚠️  No pages extracted from {pdf_path}; index left unchanged")
+                return False
+
+            # Pages that were removed, or changed and now produce no chunks
+            stale_pages.extend(
+                page_number for page_number, page_hash in stored_hashes.items()
+                if page_number not in cleared_pages
+                and current_hashes.get(page_number) != page_hash
+            )
+            self._delete_pages(pdf_id, stale_pages)
+
+            if batch_texts:
+                added = self._index_batch(
+                    batch_texts, batch_metadatas, batch_ids)
+                indexed_count += added
+                write_failed = write_failed or added < len(batch_texts)
+
+            if not write_failed:
+                self._record_page_hashes(unhashed_pages)
 
-        if not chunks:
-            print("⚠️  No chunks created. Skipping indexing.")
+        except Exception as e:
+            print(f"❌ Error processing PDF {pdf_path}: {e}")
             return False
 
-        # Prepare data for vector store
-        chunk_texts = []
-        chunk_metadatas = []
-        chunk_ids = []
+        print(f"✂️  Split document into {chunk_count} chunks")
 
-        for i, chunk in enumerate(chunks):
-            # Generate unique ID for each chunk
-            chunk_id = f"{pdf_id}-{uuid.uuid4().hex[:8]}-chunk{i}"
+        if incremental and stored_hashes:
+            unchanged = sum(
+                1 for page_number, page_hash in current_hashes.items()
+                if stored_hashes.get(page_number) == page_hash
+            )
+            print(
+                f"♻️  Incremental index: {unchanged} unchanged pages kept, "
+                f"{chunk_count} chunks re-embedded")
+            if not chunk_count:
+                print(f"✅ Index already up to date for PDF: {pdf_id}")
+                return True
 
-            # Store chunk with metadata
-            chunk_texts.append(chunk)
-            chunk_metadatas.append({
-                "pdf_id": pdf_id,
-                "chunk_index": i,
-                "chunk_id": chunk_id,
-                "source": pdf_path
-            })
-            chunk_ids.append(chunk_id)
-
-        # Add documents to vector store
-        added_ids = self.vectorstore_client.add_documents(
-            texts=chunk_texts,
-            metadatas=chunk_metadatas,
-            ids=chunk_ids
-        )
+        if not chunk_count:
+            print(
+                f"⚠️  No content extracted from {pdf_path}. Skipping indexing.")
+            return False
 
-        if added_ids:
+        if indexed_count == chunk_count:
             print(
-                f"✅ Successfully indexed {len(added_ids)} chunks for PDF: {pdf_id}")
+                f"✅ Successfully indexed {indexed_count} chunks for PDF: {pdf_id}")
             return True
         else:
-            print(f"❌ Failed to index chunks for PDF: {pdf_id}")
+            print(
+                f"❌ Failed to index chunks for PDF: {pdf_id} "
+                f"({indexed_count}/{chunk_count} indexed)")
             return False
 
-    def extract_roles_from_pdf(self, pdf_path: str) -> List[str]:
+    def _record_page_hashes(
+        self,
+        unhashed_pages: Dict[int, Tuple[str, List[Tuple[str, Dict]]]],
+        keep: Optional[int] = None
+    ) -> None:
+        """
+        Records the hash of every fully stored page on its chunks.
+
+        Pages are removed from unhashed_pages once recorded. Until then
+        their chunks carry an empty page hash, so a page whose write is
+        interrupted is re-embedded by the next incremental run.
+
+        Args:
+            unhashed_pages (Dict): Page number -> (page hash, [(chunk ID, metadata)])
+            keep (Optional[int]): Page still being written, left unrecorded
+        """
+        ids: List[str] = []
+        metadatas: List[Dict] = []
+        for page_number in [number for number in unhashed_pages if number != keep]:
+            page_hash, chunks = unhashed_pages.pop(page_number)
+            for chunk_id, metadata in chunks:
+                ids.append(chunk_id)
+                metadatas.append({**metadata, "page_hash": page_hash})
+
+        if ids and not self.vectorstore_client.set_page_hash(ids, metadatas):
+            raise RuntimeError("could not record page hashes")
+
+    def _load_page_hashes(self, pdf_id: str) -> Dict[int, str]:
+        """
+        Loads the page hashes recorded for an indexed PDF.
+
+        Chunks indexed before page hashes were recorded cannot be diffed,
+        so in that case the PDF's chunks are cleared for a full rebuild.
+        Errors reading the index propagate, so a failed read never clears it.
+
+        Args:
+            pdf_id (str): The PDF identifier
+
+        Returns:
+            Dict[int, str]: Page number -> page content hash ("" for pages
+                            whose previous write did not complete)
+        """
+        page_hashes = self.vectorstore_client.get_page_hashes(pdf_id)
+
+        if page_hashes is None:
+            print(f"⚠️  Index for {pdf_id} predates page hashes; rebuilding")
+            self.vectorstore_client.delete_by_filter({"pdf_id": pdf_id})
+            return {}
+
+        return page_hashes
+
+    def _delete_pages(self, pdf_id: str, page_numbers: List[int]) -> None:
+        """
+        Deletes the indexed chunks of the given pages.
+        """
+        if page_numbers:
+            with span("chroma.delete") as delete_span:
+                delete_span.count("pages", len(set(page_numbers)))
+                self.vectorstore_client.delete_by_filter({
+                    "$and": [
+                        {"pdf_id": pdf_id},
+                        {"page_number": {"$in": sorted(set(page_numbers))}}
+                    ]
+                })
+
+    def _index_batch(
+        self,
+        texts: List[str],
+        metadatas: List[Dict],
+        ids: List[str]
+    ) -> int:
+        """
+        Adds one batch of chunks to the vector store.
+
+        Returns:
+            int: Number of chunks indexed
+        """
+        # Includes embedding of new chunks (see the nested "embedding" span)
+        with span("chroma.write") as write_span:
+            added_ids = self.vectorstore_client.add_documents(
+                texts=texts,
+                metadatas=metadatas,
+                ids=ids
+            )
+            write_span.count("chunks", len(texts))
+        return len(added_ids)
+
+    def extract_roles_from_pdf(
+        self,
+        pdf_path: str,
+        chunks: Optional[List[str]] = None,
+        document: Optional[ExtractedDocument] = None,
+        catalog: Optional[RoleCatalogIndex] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> List[str]:
         """
         Extracts job roles from PDF using LLM.
 
@@ -191,36 +637,249 @@ class RAGPDFExtractor:
         2. Sends text to LLM with role extraction prompt
         3. Parses and cleans the LLM response
 
+        Documents longer than ROLE_EXTRACTION_MAX_CHARS (or any document
+        when ROLE_EXTRACTION_MODE is "map_reduce") are split into chunks
+        that are sent to the LLM concurrently; the per-chunk role lists
+        are then merged and de-duplicated.
+
+        With a catalog and a role extraction policy other than "llm", the
+        text is first scanned for catalog roles with the catalog's
+        gazetteer; depending on the policy those roles replace the LLM
+        call, replace it only when they cover the document, or are merged
+        with the LLM's roles. With the span filter enabled, documents over
+        its budget are reduced to their most role-like sentences and
+        table rows before they reach the LLM.
+
         Args:
             pdf_path (str): Path to the PDF file
+            chunks (Optional[List[str]]): Pre-split chunks to map over instead
+                                          of splitting the document here (each
+                                          is span-filtered like the document)
+            document (Optional[ExtractedDocument]): Already extracted content
+                                                    of pdf_path
+            catalog (Optional[RoleCatalogIndex]): XML roles for the gazetteer
+                                                  and the span filter
+            cancelled (Optional[threading.Event]): Checked before each LLM
+                                                   call; once set, no further
+                                                   calls are made
 
         Returns:
             List[str]: List of unique job roles found
+
+        Raises:
+            CancelledError: If cancelled was set before the LLM calls finished
         """
         print(f"\n🔍 Extracting roles from PDF: {pdf_path}")
 
-        # Extract full text from PDF
-        extracted_text = self._extract_text_and_tables_from_pdf(pdf_path)
+        # Extract full text from PDF (reuses the parse from process_pdf)
+        if document is None:
+            document = self.extract_document(pdf_path)
+
+        plan = self._plan_role_extraction(pdf_path, document, chunks, catalog)
+        if plan.roles is not None:
+            return plan.roles
+
+        if plan.chunks is not None:
+            # Map: one LLM call per chunk, bounded worker pool
+            responses = self.langchain_client.extract_roles_from_chunks(
+                plan.chunks, cancelled=cancelled)
+        else:
+            if cancelled is not None and cancelled.is_set():
+                raise CancelledError("Role extraction was cancelled")
+            responses = [self.langchain_client.extract_roles_from_text(plan.text)]
+
+        return self._finish_role_extraction(plan, responses)
+
+    async def aextract_roles_from_pdf(
+        self,
+        pdf_path: str,
+        chunks: Optional[List[str]] = None,
+        document: Optional[ExtractedDocument] = None,
+        catalog: Optional[RoleCatalogIndex] = None
+    ) -> List[str]:
+        """
+        Async version of extract_roles_from_pdf().
+
+        PDF parsing runs in a worker thread and LLM calls go through the
+        client's async API, so many documents can share one event loop.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+            chunks (Optional[List[str]]): Pre-split chunks to map over
+            document (Optional[ExtractedDocument]): Already extracted content
+                                                    of pdf_path
+            catalog (Optional[RoleCatalogIndex]): XML roles for the gazetteer
+                                                  and the span filter
+
+        Returns:
+            List[str]: List of unique job roles found
+        """
+        print(f"\n🔍 Extracting roles from PDF: {pdf_path}")
+
+        if document is None:
+            document = await asyncio.to_thread(self.extract_document, pdf_path)
+
+        plan = self._plan_role_extraction(pdf_path, document, chunks, catalog)
+        if plan.roles is not None:
+            return plan.roles
+
+        if plan.chunks is not None:
+            responses = await self.langchain_client.aextract_roles_from_chunks(
+                plan.chunks)
+        else:
+            responses = [await self.langchain_client.aextract_roles_from_text(plan.text)]
+
+        return self._finish_role_extraction(plan, responses)
+
+    def _plan_role_extraction(
+        self,
+        pdf_path: str,
+        document: Optional[ExtractedDocument],
+        chunks: Optional[List[str]],
+        catalog: Optional[RoleCatalogIndex]
+    ) -> _RoleExtractionPlan:
+        """
+        Prepares the LLM prompts of a role extraction (everything before the call).
+
+        Runs the gazetteer scan and the span filter, and decides between
+        one prompt and map-reduce over chunks.
+
+        Returns:
+            _RoleExtractionPlan: Prompts to send, or the final roles when
+                                 no LLM call is needed
+        """
+        extracted_text = document.text if document else ""
 
         if not extracted_text.strip():
             print(
                 f"⚠️  No content extracted from {pdf_path} for role extraction.")
-            return []
+            return _RoleExtractionPlan(roles=[])
+
+        scan = self._scan_catalog_roles(extracted_text, catalog)
+        if scan is not None and not self._needs_llm(scan):
+            self._log_extracted_roles(scan.roles)
+            return _RoleExtractionPlan(roles=scan.roles)
+
+        extracted_text = self._filter_spans(extracted_text, catalog)
 
-        # Use LLM to extract roles
-        raw_roles_str = self.langchain_client.extract_roles_from_text(
-            extracted_text)
+        if not self._use_map_reduce(extracted_text):
+            return _RoleExtractionPlan(scan=scan, text=extracted_text)
 
-        # Clean and parse the LLM response
-        roles = clean_extracted_roles(raw_roles_str)
+        if chunks is None:
+            chunks = self.role_text_splitter.split_text(extracted_text)
+        else:
+            # Caller-split chunks get the same per-prompt budget;
+            # chunks without any candidate span are not sent at all
+            chunks = [chunk for chunk in (self._filter_spans(chunk, catalog)
+                                          for chunk in chunks) if chunk.strip()]
+
+        print(f"🗺️  Map-reduce role extraction over {len(chunks)} chunks")
+        return _RoleExtractionPlan(scan=scan, chunks=chunks)
 
+    def _finish_role_extraction(
+        self,
+        plan: _RoleExtractionPlan,
+        responses: List[str]
+    ) -> List[str]:
+        """
+        Turns the raw LLM responses of a plan into the final role list.
+        """
+        if plan.chunks is not None:
+            # Reduce: merge and de-duplicate per-chunk role lists
+            roles = merge_role_lists(
+                clean_extracted_roles(raw_roles_str)
+                for raw_roles_str in responses
+            )
+        else:
+            # Clean and parse the LLM response
+            roles = clean_extracted_roles(responses[0])
+
+        if plan.scan is not None:
+            roles = merge_role_lists([roles, plan.scan.roles])
+
+        self._log_extracted_roles(roles)
+
+        return roles
+
+    def _scan_catalog_roles(
+        self,
+        text: str,
+        catalog: Optional[RoleCatalogIndex]
+    ) -> Optional[GazetteerScan]:
+        """
+        Scans text for catalog roles unless the policy is "llm".
+
+        Returns:
+            Optional[GazetteerScan]: Scan result, or None if the gazetteer
+                                     is not used (LLM only)
+        """
+        if self.role_extraction_policy == "llm":
+            return None
+        if catalog is None:
+            print(f"⚠️  No catalog for the '{self.role_extraction_policy}' "
+                  "role extraction policy; using the LLM only")
+            return None
+
+        with span("extract.gazetteer") as scan_span:
+            scan = catalog.gazetteer.scan(text)
+            scan_span.count("roles", len(scan.roles))
+            scan_span.count("uncovered", len(scan.uncovered_mentions))
+        print(f"📇 Gazetteer found {len(scan.roles)} catalog roles "
+              f"({len(scan.uncovered_mentions)} uncovered job-title words)")
+        return scan
+
+    def _filter_spans(self, text: str, catalog: Optional[RoleCatalogIndex]) -> str:
+        """
+        Shrinks text to the span filter budget (no-op when disabled or within it).
+        """
+        if not self.span_filter_budget or len(text) <= self.span_filter_budget:
+            return text
+
+        with span("extract.span_filter") as filter_span:
+            selection = select_spans(
+                text,
+                self.span_filter_budget,
+                vocabulary=catalog.vocabulary if catalog is not None else frozenset(),
+                neighbors=ROLE_SPAN_FILTER_NEIGHBORS
+            )
+            filter_span.count("spans", len(selection.spans))
+            filter_span.count("selected", len(selection.selected))
+        print(f"✂️  Span filter kept {len(selection.selected)}/{len(selection.spans)} spans "
+              f"({len(selection.text)}/{selection.original_chars} chars, "
+              f"-{selection.savings_percentage}%)")
+        return selection.text
+
+    def _needs_llm(self, scan: GazetteerScan) -> bool:
+        """
+        Decides whether the LLM still has to run after a gazetteer scan.
+        """
+        if self.role_extraction_policy == "gazetteer":
+            return False
+        if self.role_extraction_policy == "gazetteer_first":
+            if scan.fully_covered:
+                print("⚡ All job-title mentions are catalog roles; LLM call skipped")
+                return False
+            return True
+        # merge: always combine with the LLM's roles
+        return True
+
+    def _log_extracted_roles(self, roles: List[str]) -> None:
         if roles:
             print(f"✅ Extracted {len(roles)} unique roles from PDF")
             print(f"📋 Roles: {', '.join(roles)}")
         else:
             print("⚠️  No roles found in PDF")
 
-        return roles
+    def _use_map_reduce(self, text: str) -> bool:
+        """
+        Decides whether role extraction should map over chunks.
+        """
+        if self.role_extraction_mode == "map_reduce":
+            return True
+        if self.role_extraction_mode == "single":
+            return False
+        # auto: only when the document would not fit one prompt
+        return len(text) > ROLE_EXTRACTION_MAX_CHARS
 
     def query_pdf_with_rag(
         self,
@@ -251,11 +910,13 @@ class RAGPDFExtractor:
         filter_dict = {"pdf_id": pdf_id} if pdf_id else None
 
         # Retrieve relevant documents
-        results = self.vectorstore_client.similarity_search_with_score(
-            query=query,
-            k=top_k,
-            filter=filter_dict
-        )
+        with span("chroma.query", top_k=top_k) as query_span:
+            results = self.vectorstore_client.similarity_search_with_score(
+                query=query,
+                k=top_k,
+                filter=filter_dict
+            )
+            query_span.count("results", len(results))
 
         if not results:
             return "No relevant information found in the PDF documents."
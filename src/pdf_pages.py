@@ -0,0 +1,291 @@
+# src/pdf_pages.py
+"""
+Page-level PDF extraction helpers.
+Kept free of LangChain imports so process-pool workers start quickly.
+"""
+
+import os
+import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Iterator
+from src.extraction_cache import ExtractedPage
+from src.instrumentation import span, get_recorder, enable_instrumentation
+from config.config import PDF_TABLE_PRECHECK, PDF_TABLE_MIN_EDGES
+
+# Edges contributed by each drawing command: line, rectangle, quad
+_DRAWING_EDGES = {"l": 1, "re": 4, "qu": 4}
+
+
+def page_may_contain_tables(page, min_edges: int = PDF_TABLE_MIN_EDGES) -> bool:
+    """
+    Cheap pre-filter deciding whether a page is worth full table detection.
+
+    page.find_tables() (default "lines" strategy) builds table cells from
+    the page's vector graphics. Counting line/rect edges in the drawing
+    list is far cheaper, and a page with fewer than min_edges edges cannot
+    produce a table, so skipping it leaves table recall unchanged.
+
+    Args:
+        page: Loaded fitz.Page
+        min_edges (int): Minimum ruling edges needed to attempt detection
+
+    Returns:
+        bool: True if the page may contain a table
+    """
+    try:
+        drawings = page.get_cdrawings()
+    except Exception:
+        # If the display list can't be read, fall back to full detection
+        return True
+
+    edges = 0
+    for drawing in drawings:
+        for item in drawing.get("items", ()):
+            edges += _DRAWING_EDGES.get(item[0], 0)
+            if edges >= min_edges:
+                return True
+    return False
+
+
+def extract_page(
+    page,
+    page_num: int,
+    table_precheck: bool = PDF_TABLE_PRECHECK,
+    min_edges: int = PDF_TABLE_MIN_EDGES
+) -> ExtractedPage:
+    """
+    Extracts text blocks and tables from a single PyMuPDF page.
+
+    Args:
+        page: Loaded fitz.Page
+        page_num (int): Zero-based page number
+        table_precheck (bool): Skip table detection on pages without rulings
+        min_edges (int): Minimum ruling edges for the precheck
+
+    Returns:
+        ExtractedPage: Blocks and formatted tables for the page
+    """
+    extracted_page = ExtractedPage(page_number=page_num)
+
+    with span("pdf.page", page=page_num) as page_span:
+        # --- Extract text blocks ---
+        text_blocks = page.get_text("blocks")
+        for block in text_blocks:
+            text_content = block[4].strip()
+            if text_content:
+                extracted_page.blocks.append(text_content)
+        page_span.count("blocks", len(extracted_page.blocks))
+
+        # --- Extract tables (new API) ---
+        tables = []
+        with span("pdf.tables", page=page_num) as table_span:
+            if not table_precheck or page_may_contain_tables(page, min_edges):
+                try:
+                    # type: ignore[attr-defined]
+                    table_finder = page.find_tables()  # type:ignore
+                    tables = getattr(table_finder, "tables", [])
+                except Exception:
+                    tables = []
+            else:
+                table_span.set(skipped_by_precheck=True)
+            table_span.count("tables", len(tables))
+
+        for table in tables:
+            table_rows = []
+            for row_data in table.extract():
+                row_text = " | ".join([
+                    str(cell) if cell is not None else ""
+                    for cell in row_data
+                ])
+                table_rows.append(row_text)
+
+            # Format table nicely
+            table_str = "\n".join(table_rows)
+            formatted_table = (
+                f"\n--- TABLE: ROLES AND INFORMATION ---\n"
+                f"{table_str.strip()}\n"
+                f"--- END OF TABLE ---\n"
+            )
+            extracted_page.tables.append(formatted_table)
+
+    return extracted_page
+
+
+def extract_page_range(
+    pdf_path: str,
+    start: int,
+    end: int,
+    table_precheck: bool = PDF_TABLE_PRECHECK,
+    min_edges: int = PDF_TABLE_MIN_EDGES
+) -> List[ExtractedPage]:
+    """
+    Extracts pages [start, end) from a PDF.
+
+    Runs inside pool workers: each call opens its own document handle,
+    since PyMuPDF documents cannot be shared across processes.
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        start (int): First page number (inclusive)
+        end (int): Last page number (exclusive)
+        table_precheck (bool): Skip table detection on pages without rulings
+        min_edges (int): Minimum ruling edges for the precheck
+
+    Returns:
+        List[ExtractedPage]: Extracted pages in page order
+    """
+    pdf_document = fitz.open(pdf_path)
+    try:
+        return [
+            extract_page(
+                pdf_document.load_page(page_num),
+                page_num,
+                table_precheck=table_precheck,
+                min_edges=min_edges
+            )
+            for page_num in range(start, end)
+        ]
+    finally:
+        pdf_document.close()
+
+
+def iter_pages(
+    pdf_path: str,
+    table_precheck: bool = PDF_TABLE_PRECHECK,
+    min_edges: int = PDF_TABLE_MIN_EDGES
+) -> Iterator[ExtractedPage]:
+    """
+    Lazily yields extracted pages one at a time.
+
+    Only the current page is held in memory, so callers can start
+    downstream work before the last page is read.
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        table_precheck (bool): Skip table detection on pages without rulings
+        min_edges (int): Minimum ruling edges for the precheck
+
+    Yields:
+        ExtractedPage: Extracted pages in page order
+    """
+    pdf_document = fitz.open(pdf_path)
+    try:
+        for page_num in range(pdf_document.page_count):
+            yield extract_page(
+                pdf_document.load_page(page_num),
+                page_num,
+                table_precheck=table_precheck,
+                min_edges=min_edges
+            )
+    finally:
+        pdf_document.close()
+
+
+def _extract_page_range_traced(
+    pdf_path: str,
+    start: int,
+    end: int,
+    table_precheck: bool,
+    min_edges: int
+) -> Tuple[List[ExtractedPage], list]:
+    """
+    Pool task: extract_page_range() plus the spans it recorded, so the
+    parent process can merge per-page timings from its workers.
+    """
+    recorder = enable_instrumentation()
+    with span("pdf.range", document=pdf_path, start=start, end=end):
+        pages = extract_page_range(pdf_path, start, end, table_precheck, min_edges)
+    return pages, recorder.drain()
+
+
+def split_page_ranges(page_count: int, range_size: int) -> List[Tuple[int, int]]:
+    """
+    Splits a page count into contiguous [start, end) ranges.
+
+    Args:
+        page_count (int): Total number of pages
+        range_size (int): Maximum pages per range
+
+    Returns:
+        List[Tuple[int, int]]: Page ranges in order
+    """
+    range_size = max(1, range_size)
+    return [
+        (start, min(start + range_size, page_count))
+        for start in range(0, page_count, range_size)
+    ]
+
+
+def resolve_worker_count(workers: int) -> int:
+    """
+    Resolves a configured worker count (0 or less means one per CPU).
+    """
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def extract_pages(
+    pdf_path: str,
+    page_count: int,
+    workers: int = 1,
+    range_size: int = 16,
+    table_precheck: bool = PDF_TABLE_PRECHECK,
+    min_edges: int = PDF_TABLE_MIN_EDGES
+) -> List[ExtractedPage]:
+    """
+    Extracts all pages of a PDF, optionally across a process pool.
+
+    Pages are split into ranges handled by independent workers; results
+    are merged back in page order. Small documents and workers=1 run
+    in-process to avoid pool start-up cost.
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        page_count (int): Number of pages in the PDF
+        workers (int): Worker processes (0 = one per CPU, 1 = sequential)
+        range_size (int): Pages handled per worker task
+        table_precheck (bool): Skip table detection on pages without rulings
+        min_edges (int): Minimum ruling edges for the precheck
+
+    Returns:
+        List[ExtractedPage]: Extracted pages in page order
+    """
+    workers = resolve_worker_count(workers)
+    ranges = split_page_ranges(page_count, range_size)
+
+    if workers <= 1 or len(ranges) <= 1:
+        return extract_page_range(
+            pdf_path, 0, page_count, table_precheck, min_edges)
+
+    print(
+        f"⚡ Extracting {page_count} pages with {min(workers, len(ranges))} "
+        f"workers ({len(ranges)} ranges)")
+
+    # Workers only record spans when this process does
+    recorder = get_recorder()
+    task = _extract_page_range_traced if recorder.enabled else extract_page_range
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        futures = [
+            executor.submit(
+                task,
+                pdf_path,
+                start,
+                end,
+                table_precheck,
+                min_edges
+            )
+            for start, end in ranges
+        ]
+        # Futures are consumed in submission order, so pages stay ordered
+        pages: List[ExtractedPage] = []
+        for future in futures:
+            if recorder.enabled:
+                range_pages, spans = future.result()
+                recorder.merge(spans)
+            else:
+                range_pages = future.result()
+            pages.extend(range_pages)
+
+    return pages
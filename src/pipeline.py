@@ -0,0 +1,365 @@
+# src/pipeline.py
+"""
+Validation pipeline orchestration.
+Runs XML parsing, PDF role extraction and comparison for one or many documents.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple, Union
+from src.role_comparer import RoleComparer
+from src.instrumentation import span
+from src.role_catalog import RoleCatalogIndex
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.xml_parser import extract_roles_from_xml
+from src.extraction_cache import compute_file_hash
+from src.validation_cache import ValidationResultCache, extraction_settings_hash
+from config.config import (
+    FUZZY_MATCH_THRESHOLD,
+    DEFAULT_XML_XPATH,
+    PDF_INCREMENTAL_INDEX,
+    VALIDATION_CACHE_ENABLED
+)
+
+
+def _build_result(
+    pdf_path: str,
+    pdf_roles: List[str],
+    catalog: RoleCatalogIndex,
+    comparer: RoleComparer
+) -> Dict[str, Any]:
+    """
+    Compares extracted PDF roles against the catalog and builds the result record.
+    """
+    is_incorrect, matched_roles, incorrect_pdf_roles, fuzzy_matches = comparer.compare_roles(
+        catalog, pdf_roles
+    )
+
+    result = {
+        "pdf_path": pdf_path,
+        "status": "ok",
+        "pdf_roles": pdf_roles,
+        "is_incorrect": is_incorrect,
+        "fuzzy_matches": fuzzy_matches,
+    }
+    result.update(comparer.get_match_statistics(
+        matched_roles, incorrect_pdf_roles, catalog, pdf_roles))
+    return result
+
+
+def _extract_pdf_roles(
+    pdf_extractor: RAGPDFExtractor,
+    pdf_path: str,
+    catalog: Union[RoleCatalogIndex, "Future[RoleCatalogIndex]", None] = None,
+    cancelled: Optional[threading.Event] = None
+) -> List[str]:
+    """
+    Role extraction stage; raises if the PDF cannot be read.
+
+    The catalog (used by gazetteer policies and the span filter) may still be
+    parsing on another thread: it is only waited for once the PDF
+    content is available. Setting cancelled stops the stage before its
+    next LLM call.
+    """
+    with span("extract.roles", document=pdf_path):
+        document = pdf_extractor.extract_document(pdf_path)
+        if document is None:
+            raise ValueError("Could not extract content from PDF")
+        if isinstance(catalog, Future):
+            catalog = catalog.result()
+        return pdf_extractor.extract_roles_from_pdf(
+            pdf_path, document=document, catalog=catalog, cancelled=cancelled)
+
+
+def _parse_catalog(xml_filepath: str, xml_role_xpath: str) -> RoleCatalogIndex:
+    """
+    XML stage: parses the catalog and builds its index.
+    """
+    return RoleCatalogIndex(extract_roles_from_xml(xml_filepath, xml_role_xpath))
+
+
+def _discard(future: Future, cancelled: threading.Event) -> None:
+    """
+    Stops a stage whose result is not needed without waiting for it.
+
+    A stage that has not started is cancelled; a running one sees
+    cancelled before its next LLM call and stops there.
+    """
+    cancelled.set()
+    future.cancel()
+
+
+def _cache_lookup(
+    result_cache: ValidationResultCache,
+    xml_hash: str,
+    xml_xpath: str,
+    pdf_path: str,
+    fuzzy_threshold: int,
+    pdf_extractor: RAGPDFExtractor
+) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    """
+    Hashes the PDF and looks up its cached result.
+
+    The key covers the extraction settings of pdf_extractor, so results
+    are only shared between identically configured extractors.
+
+    Returns:
+        Tuple of (cache key, PDF hash, cached result or None)
+    """
+    pdf_hash = compute_file_hash(pdf_path)
+    key = result_cache.make_key(
+        xml_hash, xml_xpath, pdf_hash, fuzzy_threshold,
+        pdf_extractor.langchain_client.model_name,
+        extraction_settings_hash(pdf_extractor))
+    cached = result_cache.get(key)
+    if cached is not None:
+        cached["pdf_path"] = pdf_path
+    return key, pdf_hash, cached
+
+
+def validate_pdf(
+    pdf_path: str,
+    catalog: RoleCatalogIndex,
+    pdf_extractor: RAGPDFExtractor,
+    comparer: RoleComparer,
+    result_cache: Optional[ValidationResultCache] = None,
+    xml_hash: Optional[str] = None,
+    xml_xpath: str = DEFAULT_XML_XPATH
+) -> Dict[str, Any]:
+    """
+    Extracts roles from one PDF and compares them against the XML roles.
+
+    With result_cache and xml_hash given, a document already validated
+    against the same catalog and settings is answered from the cache
+    without parsing the PDF or calling the LLM.
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        catalog (RoleCatalogIndex): Prebuilt index of the XML roles
+        pdf_extractor (RAGPDFExtractor): Shared extractor
+        comparer (RoleComparer): Shared comparer
+        result_cache (Optional[ValidationResultCache]): Whole-result cache
+        xml_hash (Optional[str]): SHA-256 of the XML catalog bytes
+        xml_xpath (str): XPath the catalog was extracted with
+
+    Returns:
+        Dict: Comparison results and match statistics for the document
+    """
+    try:
+        with span("validate.document", document=pdf_path) as document_span:
+            use_cache = result_cache is not None and xml_hash is not None
+            if use_cache:
+                key, pdf_hash, cached = _cache_lookup(
+                    result_cache, xml_hash, xml_xpath, pdf_path,
+                    comparer.fuzzy_threshold, pdf_extractor)
+                document_span.set(cached=cached is not None)
+                if cached is not None:
+                    return cached
+
+            # An unreadable PDF is an error, not a document without roles
+            pdf_roles = _extract_pdf_roles(pdf_extractor, pdf_path, catalog)
+            result = _build_result(pdf_path, pdf_roles, catalog, comparer)
+
+            if use_cache:
+                result_cache.put(key, result, xml_hash, xml_xpath, pdf_hash,
+                                 comparer.fuzzy_threshold,
+                                 pdf_extractor.langchain_client.model_name)
+            return result
+
+    except Exception as e:
+        print(f"❌ Error validating {pdf_path}: {e}")
+        return {"pdf_path": pdf_path, "status": "error", "error": str(e)}
+
+
+def _index_pdf(pdf_extractor: RAGPDFExtractor, pdf_path: str, pdf_id: str) -> bool:
+    """
+    Indexes a PDF into the vector store (background stage).
+    """
+    with span("index.document", document=pdf_path):
+        # Incremental indexing diffs pages, otherwise rebuild from scratch
+        if not PDF_INCREMENTAL_INDEX:
+            pdf_extractor.clear_pdf_data(pdf_id)
+        return pdf_extractor.process_pdf(pdf_path, pdf_id)
+
+
+def validate_concurrently(
+    xml_filepath: str,
+    pdf_filepath: str,
+    pdf_id: Optional[str] = None,
+    xml_role_xpath: str = DEFAULT_XML_XPATH,
+    fuzzy_threshold: int = FUZZY_MATCH_THRESHOLD,
+    pdf_extractor: Optional[RAGPDFExtractor] = None,
+    result_cache: Optional[ValidationResultCache] = None
+) -> Tuple[Dict[str, Any], Optional["Future[bool]"]]:
+    """
+    Validates one PDF, running independent stages at the same time.
+
+    XML parsing, LLM role extraction and (if pdf_id is given) vector
+    indexing start together on worker threads; the PDF itself is parsed
+    once and shared by extraction and indexing. Comparison runs as soon
+    as both role lists exist, so latency is max(stages) rather than
+    sum(stages). Indexing is not waited for: it keeps running in the
+    background and its future is returned.
+
+    Results are looked up in the validation result cache first (unless
+    VALIDATION_CACHE_ENABLED is off); a hit returns immediately with
+    "cached": True and starts no stage, including indexing.
+
+    Args:
+        xml_filepath (str): Path to the XML catalog
+        pdf_filepath (str): Path to the PDF file
+        pdf_id (Optional[str]): Vector store ID; None skips indexing
+        xml_role_xpath (str): XPath expression for XML roles
+        fuzzy_threshold (int): Minimum similarity score for fuzzy matches
+        pdf_extractor (Optional[RAGPDFExtractor]): Extractor to reuse
+        result_cache (Optional[ValidationResultCache]): Cache to use
+            (defaults to a ValidationResultCache if the cache is enabled)
+
+    Returns:
+        Tuple containing:
+        - result (Dict): Same fields as validate_pdf() plus "xml_roles"
+        - indexing (Optional[Future[bool]]): process_pdf() outcome, or
+          None when indexing was skipped
+    """
+    if result_cache is None and VALIDATION_CACHE_ENABLED:
+        result_cache = ValidationResultCache()
+
+    pdf_extractor = pdf_extractor or RAGPDFExtractor()
+
+    if result_cache is not None:
+        xml_hash = compute_file_hash(xml_filepath)
+        key, pdf_hash, cached = _cache_lookup(
+            result_cache, xml_hash, xml_role_xpath, pdf_filepath,
+            fuzzy_threshold, pdf_extractor)
+        xml_roles = result_cache.get_xml_roles(xml_hash, xml_role_xpath)
+        if cached is not None and xml_roles is not None:
+            print(f"⚡ Using cached validation result for: {pdf_filepath}")
+            cached["xml_roles"] = xml_roles
+            return cached, None
+
+    executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="pipeline")
+    try:
+        catalog_future = executor.submit(
+            _parse_catalog, xml_filepath, xml_role_xpath)
+
+        indexing: Optional["Future[bool]"] = None
+        if pdf_id is not None:
+            indexing = executor.submit(
+                _index_pdf, pdf_extractor, pdf_filepath, pdf_id)
+
+        # Gazetteer policies and the span filter use the catalog's roles
+        uses_catalog = (pdf_extractor.role_extraction_policy != "llm"
+                        or pdf_extractor.span_filter_budget > 0)
+        cancelled = threading.Event()
+        roles_future = executor.submit(
+            _extract_pdf_roles, pdf_extractor, pdf_filepath,
+            catalog_future if uses_catalog else None, cancelled)
+
+        try:
+            catalog = catalog_future.result()
+        except Exception as e:
+            print(f"❌ Error parsing XML {xml_filepath}: {e}")
+            _discard(roles_future, cancelled)
+            return {
+                "pdf_path": pdf_filepath,
+                "status": "error",
+                "error": f"Could not parse XML roles: {e}",
+                "xml_roles": []
+            }, indexing
+
+        xml_roles = catalog.roles
+        if not xml_roles:
+            _discard(roles_future, cancelled)
+            return {
+                "pdf_path": pdf_filepath,
+                "status": "error",
+                "error": "No XML roles",
+                "xml_roles": []
+            }, indexing
+
+        comparer = RoleComparer(fuzzy_threshold=fuzzy_threshold)
+
+        try:
+            pdf_roles = roles_future.result()
+            result = _build_result(pdf_filepath, pdf_roles, catalog, comparer)
+        except Exception as e:
+            print(f"❌ Error validating {pdf_filepath}: {e}")
+            result = {"pdf_path": pdf_filepath, "status": "error", "error": str(e)}
+
+        if result_cache is not None:
+            result_cache.put(key, result, xml_hash, xml_role_xpath, pdf_hash,
+                             fuzzy_threshold, pdf_extractor.langchain_client.model_name,
+                             xml_roles=xml_roles)
+
+        result["xml_roles"] = xml_roles
+        return result, indexing
+
+    finally:
+        # Let background indexing finish without blocking the caller
+        executor.shutdown(wait=False)
+
+
+async def _avalidate_pdf(
+    pdf_path: str,
+    catalog: RoleCatalogIndex,
+    pdf_extractor: RAGPDFExtractor,
+    comparer: RoleComparer
+) -> Dict[str, Any]:
+    """
+    Async version of validate_pdf().
+    """
+    try:
+        with span("validate.document", document=pdf_path):
+            pdf_roles = await pdf_extractor.aextract_roles_from_pdf(
+                pdf_path, catalog=catalog)
+            return _build_result(pdf_path, pdf_roles, catalog, comparer)
+
+    except Exception as e:
+        print(f"❌ Error validating {pdf_path}: {e}")
+        return {"pdf_path": pdf_path, "status": "error", "error": str(e)}
+
+
+async def avalidate(
+    xml_filepath: str,
+    pdf_filepaths: List[str],
+    xml_role_xpath: str = DEFAULT_XML_XPATH,
+    fuzzy_threshold: int = FUZZY_MATCH_THRESHOLD,
+    pdf_extractor: Optional[RAGPDFExtractor] = None
+) -> List[Dict[str, Any]]:
+    """
+    Validates many PDFs against one XML catalog on a single event loop.
+
+    The catalog is parsed and indexed once; each document's LLM calls
+    are awaited concurrently, bounded by the LangChain client's
+    concurrency limit, so network waits of different documents overlap.
+
+    Args:
+        xml_filepath (str): Path to the XML catalog
+        pdf_filepaths (List[str]): PDFs to validate
+        xml_role_xpath (str): XPath expression for XML roles
+        fuzzy_threshold (int): Minimum similarity score for fuzzy matches
+        pdf_extractor (Optional[RAGPDFExtractor]): Extractor to reuse
+
+    Returns:
+        List[Dict]: One result per PDF, in input order
+    """
+    xml_roles = await asyncio.to_thread(
+        extract_roles_from_xml, xml_filepath, xml_role_xpath)
+
+    if not xml_roles:
+        print("⚠️  No roles extracted from XML; nothing to validate against.")
+        return [
+            {"pdf_path": pdf_path, "status": "error", "error": "No XML roles"}
+            for pdf_path in pdf_filepaths
+        ]
+
+    # Catalog-side normalization happens once for all documents
+    catalog = RoleCatalogIndex(xml_roles)
+    pdf_extractor = pdf_extractor or RAGPDFExtractor()
+    comparer = RoleComparer(fuzzy_threshold=fuzzy_threshold)
+
+    return list(await asyncio.gather(*(
+        _avalidate_pdf(pdf_path, catalog, pdf_extractor, comparer)
+        for pdf_path in pdf_filepaths
+    )))
@@ -0,0 +1,227 @@
+# src/role_catalog.py
+"""
+Prebuilt, reusable index over the XML role catalog.
+Built once per catalog and shared across many role comparisons.
+"""
+
+from array import array
+from collections import Counter, defaultdict
+from typing import List, Dict, FrozenSet, Tuple, Union, Optional
+from src.gazetteer import RoleGazetteer
+from src.utils import normalize_role, role_tokens
+
+# Character n-gram size used for the postings lists
+NGRAM_SIZE = 2
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> Counter:
+    """
+    Returns the multiset of character n-grams of a string.
+
+    Args:
+        text (str): Input string
+        n (int): N-gram size
+
+    Returns:
+        Counter: n-gram -> number of occurrences
+
+    Examples:
+        >>> sorted(char_ngrams("abab").items())
+        [('ab', 2), ('ba', 1)]
+    """
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class RoleCatalogIndex:
+    """
+    Precomputed lookup structures for a list of XML roles.
+
+    Holds:
+    - The original role list (used as scoring columns)
+    - Normalized form -> original role (for direct matching)
+    - Token set per role (built on first use)
+    - Role gazetteer automaton for text scanning (built on first use)
+    - Vocabulary of role words (built on first use)
+    - Character n-gram postings (n-gram -> (role indices, counts) arrays)
+    - Length buckets (string length -> role indices)
+
+    The index only contains plain Python containers and arrays, so it
+    pickles cleanly and compactly and can be shipped to worker processes
+    (or compiled to a catalog artifact) once; per-document comparison
+    then only pays for the PDF side.
+    """
+
+    def __init__(self, roles: List[str]):
+        """
+        Build the index from extract_roles_from_xml() output.
+
+        Args:
+            roles (List[str]): XML roles (ground truth)
+        """
+        self.roles: List[str] = list(roles)
+        self.normalized_roles: List[str] = [normalize_role(role) for role in self.roles]
+
+        # Later duplicates win, matching the comparer's original behaviour
+        self.normalized: Dict[str, str] = dict(zip(self.normalized_roles, self.roles))
+        self._token_sets: Optional[List[FrozenSet[str]]] = None
+        self._gazetteer: Optional[RoleGazetteer] = None
+        self._vocabulary: Optional[FrozenSet[str]] = None
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+        self.length_buckets: Dict[int, List[int]] = defaultdict(list)
+
+        for index, role in enumerate(self.roles):
+            for gram, count in char_ngrams(role).items():
+                ids, counts = postings[gram]
+                ids.append(index)
+                counts.append(count)
+            self.length_buckets[len(role)].append(index)
+
+        # Unsigned int arrays: compact in memory and fast to (un)pickle
+        self.ngram_postings: Dict[str, Tuple[array, array]] = {
+            gram: (array('I', ids), array('I', counts))
+            for gram, (ids, counts) in postings.items()
+        }
+        # Plain dicts pickle without the defaultdict factory
+        self.length_buckets = dict(self.length_buckets)
+
+    @property
+    def token_sets(self) -> List[FrozenSet[str]]:
+        """
+        Token set of each role's normalized form (built on first use).
+        """
+        if self._token_sets is None:
+            self._token_sets = [frozenset(norm.split()) for norm in self.normalized_roles]
+        return self._token_sets
+
+    @property
+    def gazetteer(self) -> RoleGazetteer:
+        """
+        Automaton over the catalog roles and their variants (built on first use).
+        """
+        if self._gazetteer is None:
+            self._gazetteer = RoleGazetteer(self.roles)
+        return self._gazetteer
+
+    @property
+    def vocabulary(self) -> FrozenSet[str]:
+        """
+        Lowercase words used by the catalog roles (built on first use).
+        """
+        if self._vocabulary is None:
+            self._vocabulary = frozenset(
+                token for role in self.roles for token in role_tokens(role))
+        return self._vocabulary
+
+    def __getstate__(self) -> dict:
+        # Derived structures are rebuilt on load instead of being stored
+        state = dict(self.__dict__)
+        state["_token_sets"] = None
+        state["_gazetteer"] = None
+        state["_vocabulary"] = None
+        del state["normalized"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # Artifacts compiled before these structures existed lack the slots
+        self.__dict__.setdefault("_gazetteer", None)
+        self.__dict__.setdefault("_vocabulary", None)
+        self.normalized = dict(zip(self.normalized_roles, self.roles))
+
+    def candidates(self, query: str, threshold: int) -> List[int]:
+        """
+        Returns the catalog roles that can reach `threshold` against query.
+
+        Lossless blocking for both fuzz.ratio and fuzz.partial_ratio:
+        a score of at least threshold bounds the edit distance d between
+        query and role (or the aligned window of the longer string), and
+        by the q-gram lemma two strings within edit distance d share at
+        least max(len) - q + 1 - q*d character q-grams. Roles sharing fewer
+        n-grams than that bound are skipped without scoring, so results are
+        identical to exhaustive matching. Only postings of the query's
+        n-grams are touched; length buckets whose bound is not positive
+        (very short strings) are scanned in full.
+
+        Args:
+            query (str): PDF role (scored as-is, like the comparer does)
+            threshold (int): Minimum rounded score (0-100)
+
+        Returns:
+            List[int]: Candidate role indices in ascending order
+        """
+        if threshold <= 0:
+            return list(range(len(self.roles)))
+        if not query:
+            # Two empty strings are a perfect match, anything else scores 0
+            return list(self.length_buckets.get(0, []))
+
+        q = NGRAM_SIZE
+        # Scores are rounded, so a raw score of threshold - 0.5 still matches
+        min_score = (threshold - 0.5) / 100
+        max_loss = 1 - min_score
+        la = len(query)
+
+        # Shared n-gram counts for roles with at least one n-gram in common
+        overlaps: Dict[int, int] = defaultdict(int)
+        for gram, query_count in char_ngrams(query, q).items():
+            posting = self.ngram_postings.get(gram)
+            if posting is None:
+                continue
+            for index, count in zip(*posting):
+                overlaps[index] += min(query_count, count)
+
+        # Per length bucket: minimum overlap needed (None = cannot match,
+        # 0 = every role of this length is a candidate)
+        required: Dict[int, Optional[int]] = {}
+        for length in self.length_buckets:
+            shortest = min(la, length)
+            needed: List[int] = []
+
+            # fuzz.ratio: needs 2*min/(la+L) >= min_score, and d <= loss*(la+L)
+            if 2 * shortest >= min_score * (la + length) - 1e-9:
+                max_distance = int(max_loss * (la + length) + 1e-9)
+                needed.append(max(la, length) - q + 1 - q * max_distance)
+
+            # fuzz.partial_ratio: best window of the longer string, d <= loss*2*min
+            if shortest > 0:
+                max_distance = int(max_loss * 2 * shortest + 1e-9)
+                needed.append(shortest - q + 1 - q * max_distance)
+
+            required[length] = max(0, min(needed)) if needed else None
+
+        candidates = set()
+        for length, needed_overlap in required.items():
+            if needed_overlap == 0:
+                candidates.update(self.length_buckets[length])
+
+        for index, overlap in overlaps.items():
+            needed_overlap = required[len(self.roles[index])]
+            if needed_overlap is not None and overlap >= needed_overlap:
+                candidates.add(index)
+
+        return sorted(candidates)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __repr__(self) -> str:
+        return f"RoleCatalogIndex({len(self.roles)} roles)"
+
+
+def as_catalog_index(xml_roles: Union[List[str], RoleCatalogIndex]) -> RoleCatalogIndex:
+    """
+    Returns xml_roles as a RoleCatalogIndex, building one if given a list.
+    """
+    if isinstance(xml_roles, RoleCatalogIndex):
+        return xml_roles
+    return RoleCatalogIndex(xml_roles)
+
+
+def as_role_list(xml_roles: Union[List[str], RoleCatalogIndex]) -> List[str]:
+    """
+    Returns the plain role list for either a list or a RoleCatalogIndex.
+    """
+    if isinstance(xml_roles, RoleCatalogIndex):
+        return xml_roles.roles
+    return xml_roles
@@ -4,9 +4,43 @@ Role comparison module with fuzzy matching capabilities.
 Compares XML-defined roles against PDF-extracted roles.
 """
 
-from typing import List, Tuple, Dict, Set, Any
-from src.utils import normalize_role, fuzzy_match, fuzzy_partial_match
-from config.config import FUZZY_MATCH_THRESHOLD
+from dataclasses import dataclass
+from typing import List, Tuple, Dict, Set, Any, Union, Optional
+import numpy as np
+from src.utils import normalize_role
+from src.role_catalog import RoleCatalogIndex, as_catalog_index, as_role_list
+from src.instrumentation import span
+from src.role_matcher import (
+    compute_score_matrices,
+    select_best_matches,
+    match_with_candidates,
+    FUZZY
+)
+from config.config import FUZZY_MATCH_THRESHOLD, FUZZY_BLOCKING_MIN_ROLES
+
+
+@dataclass
+class RoleScores:
+    """
+    Threshold-independent comparison state for one (XML, PDF) role pair.
+
+    Produced by RoleComparer.score_roles() and turned into matches by
+    RoleComparer.classify() at any threshold without re-scoring.
+
+    Attributes:
+        xml_roles: XML roles (score matrix columns)
+        pdf_roles: PDF roles as extracted
+        direct_matches: PDF role -> XML role for normalized exact matches
+        unmatched_pdf_roles: Remaining PDF roles (score matrix rows)
+        ratio_scores: fuzz.ratio matrix, uncut (rows x columns)
+        partial_scores: fuzz.partial_ratio matrix, uncut (same shape)
+    """
+    xml_roles: List[str]
+    pdf_roles: List[str]
+    direct_matches: Dict[str, str]
+    unmatched_pdf_roles: List[str]
+    ratio_scores: np.ndarray
+    partial_scores: np.ndarray
 
 
 class RoleComparer:
@@ -20,20 +54,51 @@ class RoleComparer:
     - Detailed reporting
     """
 
-    def __init__(self, fuzzy_threshold: int = FUZZY_MATCH_THRESHOLD):
+    def __init__(
+        self,
+        fuzzy_threshold: int = FUZZY_MATCH_THRESHOLD,
+        blocking_min_roles: int = FUZZY_BLOCKING_MIN_ROLES
+    ):
         """
         Initialize role comparer with fuzzy matching threshold.
 
         Args:
             fuzzy_threshold (int): Minimum similarity score (0-100) for fuzzy matches
+            blocking_min_roles (int): Catalog size from which fuzzy matching
+                                      only scores n-gram blocking candidates
         """
         self.fuzzy_threshold = fuzzy_threshold
+        self.blocking_min_roles = blocking_min_roles
         print(
             f"✅ Role Comparer initialized with fuzzy threshold: {fuzzy_threshold}")
 
+    @staticmethod
+    def load_catalog(
+        artifact_path: str,
+        xml_filepath: Optional[str] = None
+    ) -> RoleCatalogIndex:
+        """
+        Loads a compiled catalog artifact for use with compare_roles().
+
+        Args:
+            artifact_path (str): Artifact written by compile-catalog
+            xml_filepath (Optional[str]): Source XML; if given, the artifact
+                                          must have been compiled from it
+
+        Returns:
+            RoleCatalogIndex: Prebuilt catalog index
+
+        Raises:
+            ValueError: If the artifact is invalid, corrupt or stale
+        """
+        # Imported here: the artifact module pulls in the XML parser
+        from src.catalog_artifact import load_catalog
+
+        return load_catalog(artifact_path, xml_filepath).index
+
     def compare_roles(
         self,
-        xml_roles: List[str],
+        xml_roles: Union[List[str], RoleCatalogIndex],
         pdf_roles: List[str]
     ) -> Tuple[bool, List[str], List[str], Dict[str, str]]:
         """
@@ -44,8 +109,15 @@ class RoleComparer:
         2. Fuzzy matching (for typos like "Managar" vs "Manager")
         3. Partial matching (for abbreviations like "SW Eng" vs "Software Engineer")
 
+        Steps 2 and 3 score every unmatched PDF role against every XML role
+        in one vectorized call and keep the best-scoring XML role per PDF role.
+        For catalogs of at least blocking_min_roles roles, only the XML roles
+        returned by the catalog's n-gram blocking are scored; the outcome
+        is the same as the exhaustive scan.
+
         Args:
-            xml_roles (List[str]): List of roles from XML (ground truth)
+            xml_roles (Union[List[str], RoleCatalogIndex]): Roles from XML (ground
+                truth), or a prebuilt RoleCatalogIndex to skip per-call XML work
             pdf_roles (List[str]): List of roles extracted from PDF
 
         Returns:
@@ -55,90 +127,200 @@ class RoleComparer:
             - incorrect_pdf_roles (List[str]): PDF roles with no match
             - fuzzy_matches (Dict[str, str]): Mapping of PDF role -> XML role for fuzzy matches
         """
-        print("\n⚖️  Comparing XML roles vs PDF roles...")
+        with span("compare") as compare_span:
+            print("\n⚖️  Comparing XML roles vs PDF roles...")
+
+            # Normalized XML roles come from the (possibly prebuilt) catalog index
+            catalog = as_catalog_index(xml_roles)
+            xml_roles = catalog.roles
+            normalized_xml_roles = catalog.normalized
+
+            # Normalize PDF roles and keep mapping to originals
+            normalized_pdf_to_original: Dict[str, str] = {
+                normalize_role(role): role for role in pdf_roles
+            }
+
+            # Track matched roles and fuzzy matches
+            matched_xml_roles: Set[str] = set()
+            fuzzy_match_map: Dict[str, str] = {}  # PDF role -> XML role
+            potentially_incorrect: Set[str] = set(
+                normalized_pdf_to_original.keys())
+
+            # Step 1: Direct (exact) matching after normalization
+            print("🔍 Step 1: Direct matching...")
+            for norm_pdf, orig_pdf in normalized_pdf_to_original.items():
+                if norm_pdf in normalized_xml_roles:
+                    # Exact match found
+                    matched_xml_roles.add(normalized_xml_roles[norm_pdf])
+                    potentially_incorrect.discard(norm_pdf)
+                    print(
+                        f"  ✓ Direct match: '{orig_pdf}' = '{normalized_xml_roles[norm_pdf]}'")
+
+            # Step 2: Fuzzy matching for remaining PDF roles
+            if potentially_incorrect:
+                print(
+                    f"\n🔍 Step 2: Fuzzy matching for {len(potentially_incorrect)} unmatched roles...")
 
-        # Normalize XML roles for comparison
-        normalized_xml_roles: Dict[str, str] = {
-            normalize_role(role): role for role in xml_roles
-        }
+                still_incorrect: Set[str] = set()
 
-        # Normalize PDF roles and keep mapping to originals
-        normalized_pdf_to_original: Dict[str, str] = {
-            normalize_role(role): role for role in pdf_roles
-        }
+                unmatched_norm = sorted(potentially_incorrect)
+                unmatched_pdf = [normalized_pdf_to_original[norm]
+                                 for norm in unmatched_norm]
 
-        # Track matched roles and fuzzy matches
-        matched_xml_roles: Set[str] = set()
-        fuzzy_match_map: Dict[str, str] = {}  # PDF role -> XML role
-        potentially_incorrect: Set[str] = set(
-            normalized_pdf_to_original.keys())
-
-        # Step 1: Direct (exact) matching after normalization
-        print("🔍 Step 1: Direct matching...")
-        for norm_pdf, orig_pdf in normalized_pdf_to_original.items():
-            if norm_pdf in normalized_xml_roles:
-                # Exact match found
-                matched_xml_roles.add(normalized_xml_roles[norm_pdf])
-                potentially_incorrect.discard(norm_pdf)
-                print(
-                    f"  ✓ Direct match: '{orig_pdf}' = '{normalized_xml_roles[norm_pdf]}'")
-
-        # Step 2: Fuzzy matching for remaining PDF roles
-        if potentially_incorrect:
-            print(
-                f"\n🔍 Step 2: Fuzzy matching for {len(potentially_incorrect)} unmatched roles...")
-
-            still_incorrect: Set[str] = set()
-
-            for norm_pdf in potentially_incorrect:
-                orig_pdf = normalized_pdf_to_original[norm_pdf]
-                found_match = False
-
-                # Try fuzzy matching against all XML roles
-                for orig_xml in xml_roles:
-                    # Try full fuzzy match
-                    if fuzzy_match(orig_pdf, orig_xml, self.fuzzy_threshold):
-                        matched_xml_roles.add(orig_xml)
-                        fuzzy_match_map[orig_pdf] = orig_xml
-                        found_match = True
+                if len(xml_roles) >= self.blocking_min_roles:
+                    # Large catalog: only score roles sharing enough n-grams
+                    best_matches = match_with_candidates(
+                        unmatched_pdf, catalog, self.fuzzy_threshold)
+                else:
+                    # Score all unmatched PDF roles against all XML roles at once
+                    ratio_scores, partial_scores = compute_score_matrices(
+                        unmatched_pdf, xml_roles, score_cutoff=self.fuzzy_threshold)
+                    best_matches = select_best_matches(
+                        ratio_scores, partial_scores, self.fuzzy_threshold)
+
+                for norm_pdf, orig_pdf, best in zip(unmatched_norm, unmatched_pdf, best_matches):
+                    if best is None:
+                        still_incorrect.add(norm_pdf)
+                        continue
+
+                    xml_index, kind, _ = best
+                    orig_xml = xml_roles[xml_index]
+                    matched_xml_roles.add(orig_xml)
+                    fuzzy_match_map[orig_pdf] = orig_xml
+
+                    if kind == FUZZY:
                         print(f"  ≈ Fuzzy match: '{orig_pdf}' ≈ '{orig_xml}'")
-                        break
-
-                    # Try partial match (good for abbreviations)
-                    if fuzzy_partial_match(orig_pdf, orig_xml, self.fuzzy_threshold):
-                        matched_xml_roles.add(orig_xml)
-                        fuzzy_match_map[orig_pdf] = orig_xml
-                        found_match = True
+                    else:
                         print(
                             f"  ≈ Partial match: '{orig_pdf}' ≈ '{orig_xml}'")
-                        break
+            else:
+                still_incorrect = set()
+
+            # Determine if PDF has incorrect roles
+            is_incorrect = bool(still_incorrect)
+
+            # Prepare final results
+            final_matched_roles = sorted(list(matched_xml_roles))
+            final_incorrect_roles = sorted([
+                normalized_pdf_to_original[norm] for norm in still_incorrect
+            ])
+
+            compare_span.count("xml_roles", len(xml_roles))
+            compare_span.count("pdf_roles", len(pdf_roles))
+            compare_span.count("fuzzy_matched", len(fuzzy_match_map))
+
+            # Log summary
+            print(f"\n📊 Comparison Summary:")
+            print(f"  • XML Roles: {len(xml_roles)}")
+            print(f"  • PDF Roles: {len(pdf_roles)}")
+            print(f"  • Matched: {len(final_matched_roles)}")
+            print(f"  • Fuzzy Matched: {len(fuzzy_match_map)}")
+            print(f"  • Incorrect: {len(final_incorrect_roles)}")
+
+            return (
+                is_incorrect,
+                final_matched_roles,
+                final_incorrect_roles,
+                fuzzy_match_map
+            )
+
+    def score_roles(
+        self,
+        xml_roles: Union[List[str], RoleCatalogIndex],
+        pdf_roles: List[str]
+    ) -> RoleScores:
+        """
+        Scores PDF roles against XML roles once, for classify() at any threshold.
 
-                if not found_match:
-                    still_incorrect.add(norm_pdf)
-        else:
-            still_incorrect = set()
+        Direct (normalized) matches do not depend on the threshold and are
+        resolved here; every other PDF role gets a full row of ratio and
+        partial-ratio scores against all XML roles (no cutoff, no blocking).
+
+        Args:
+            xml_roles (Union[List[str], RoleCatalogIndex]): Roles from XML
+            pdf_roles (List[str]): List of roles extracted from PDF
+
+        Returns:
+            RoleScores: Direct matches and score matrices
+        """
+        with span("score") as score_span:
+            catalog = as_catalog_index(xml_roles)
+
+            normalized_pdf_to_original: Dict[str, str] = {
+                normalize_role(role): role for role in pdf_roles
+            }
+
+            direct_matches: Dict[str, str] = {}
+            unmatched_norm: List[str] = []
+            for norm_pdf, orig_pdf in normalized_pdf_to_original.items():
+                if norm_pdf in catalog.normalized:
+                    direct_matches[orig_pdf] = catalog.normalized[norm_pdf]
+                else:
+                    unmatched_norm.append(norm_pdf)
+
+            # Same row order as compare_roles() (sorted normalized names)
+            unmatched_pdf = [normalized_pdf_to_original[norm]
+                             for norm in sorted(unmatched_norm)]
+
+            ratio_scores, partial_scores = compute_score_matrices(
+                unmatched_pdf, catalog.roles)
+
+            score_span.count("xml_roles", len(catalog.roles))
+            score_span.count("scored_pdf_roles", len(unmatched_pdf))
+
+            return RoleScores(
+                xml_roles=catalog.roles,
+                pdf_roles=list(pdf_roles),
+                direct_matches=direct_matches,
+                unmatched_pdf_roles=unmatched_pdf,
+                ratio_scores=ratio_scores,
+                partial_scores=partial_scores
+            )
+
+    def classify(
+        self,
+        scores: RoleScores,
+        threshold: Optional[int] = None
+    ) -> Tuple[bool, List[str], List[str], Dict[str, str]]:
+        """
+        Derives matches from precomputed scores at a given threshold.
 
-        # Determine if PDF has incorrect roles
-        is_incorrect = bool(still_incorrect)
+        Gives the same result as compare_roles() with that threshold, but
+        only selects from the stored score matrices, so it is cheap
+        enough to run on every threshold change.
 
-        # Prepare final results
-        final_matched_roles = sorted(list(matched_xml_roles))
-        final_incorrect_roles = sorted([
-            normalized_pdf_to_original[norm] for norm in still_incorrect
-        ])
+        Args:
+            scores (RoleScores): Output of score_roles()
+            threshold (Optional[int]): Minimum similarity score (0-100)
+                                       (defaults to fuzzy_threshold)
+
+        Returns:
+            Tuple: Same as compare_roles() (is_incorrect, matched_roles,
+                   incorrect_pdf_roles, fuzzy_matches)
+        """
+        if threshold is None:
+            threshold = self.fuzzy_threshold
 
-        # Log summary
-        print(f"\n📊 Comparison Summary:")
-        print(f"  • XML Roles: {len(xml_roles)}")
-        print(f"  • PDF Roles: {len(pdf_roles)}")
-        print(f"  • Matched: {len(final_matched_roles)}")
-        print(f"  • Fuzzy Matched: {len(fuzzy_match_map)}")
-        print(f"  • Incorrect: {len(final_incorrect_roles)}")
+        matched_xml_roles: Set[str] = set(scores.direct_matches.values())
+        fuzzy_match_map: Dict[str, str] = {}
+        incorrect_roles: List[str] = []
+
+        best_matches = select_best_matches(
+            scores.ratio_scores, scores.partial_scores, threshold)
+
+        for orig_pdf, best in zip(scores.unmatched_pdf_roles, best_matches):
+            if best is None:
+                incorrect_roles.append(orig_pdf)
+                continue
+
+            orig_xml = scores.xml_roles[best[0]]
+            matched_xml_roles.add(orig_xml)
+            fuzzy_match_map[orig_pdf] = orig_xml
 
         return (
-            is_incorrect,
-            final_matched_roles,
-            final_incorrect_roles,
+            bool(incorrect_roles),
+            sorted(matched_xml_roles),
+            sorted(incorrect_roles),
             fuzzy_match_map
         )
 
@@ -148,7 +330,7 @@ class RoleComparer:
         matched_roles: List[str],
         incorrect_pdf_roles: List[str],
         fuzzy_matches: Dict[str, str],
-        xml_roles: List[str],
+        xml_roles: Union[List[str], RoleCatalogIndex],
         pdf_roles: List[str]
     ) -> str:
         """
@@ -165,6 +347,7 @@ class RoleComparer:
         Returns:
             str: Formatted report text
         """
+        xml_roles = as_role_list(xml_roles)
         report_lines = []
 
         # Header
@@ -262,7 +445,7 @@ class RoleComparer:
         self,
         matched_roles: List[str],
         incorrect_pdf_roles: List[str],
-        xml_roles: List[str],
+        xml_roles: Union[List[str], RoleCatalogIndex],
         pdf_roles: List[str]
     ) -> Dict[str, Any]:
         """
@@ -279,6 +462,7 @@ class RoleComparer:
         Returns:
             Dict: Statistics dictionary
         """
+        xml_roles = as_role_list(xml_roles)
         total_xml = len(set(xml_roles))
         total_pdf = len(set(pdf_roles))
         total_matched = len(matched_roles)
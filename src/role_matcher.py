@@ -0,0 +1,147 @@
+# src/role_matcher.py
+"""
+Batched fuzzy matching engine for role comparison.
+Scores every PDF role against every XML role in one vectorized call,
+or only against n-gram blocking candidates for large catalogs.
+"""
+
+from typing import List, Optional, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process
+from src.role_catalog import RoleCatalogIndex
+
+# Match kinds reported by select_best_matches()
+FUZZY = "fuzzy"
+PARTIAL = "partial"
+
+
+def compute_score_matrices(
+    queries: List[str],
+    choices: List[str],
+    score_cutoff: int = 0,
+    workers: int = -1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes full ratio and partial-ratio score matrices.
+
+    Uses rapidfuzz process.cdist, which runs in native code across all
+    cores. Scores are rounded to integers exactly like thefuzz's
+    fuzz.ratio / fuzz.partial_ratio, so thresholds behave as before.
+
+    Args:
+        queries (List[str]): Row strings (PDF roles)
+        choices (List[str]): Column strings (XML roles)
+        score_cutoff (int): Scores below this are reported as 0
+        workers (int): Threads used by cdist (-1 = all cores)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (ratio, partial_ratio) matrices of
+                                       shape (len(queries), len(choices))
+    """
+    shape = (len(queries), len(choices))
+    if not queries or not choices:
+        return np.zeros(shape, dtype=np.uint8), np.zeros(shape, dtype=np.uint8)
+
+    matrices = []
+    for scorer in (fuzz.ratio, fuzz.partial_ratio):
+        scores = process.cdist(
+            queries,
+            choices,
+            scorer=scorer,
+            workers=workers
+        )
+        scores = np.rint(scores).astype(np.uint8)
+        if score_cutoff:
+            scores[scores < score_cutoff] = 0
+        matrices.append(scores)
+
+    return matrices[0], matrices[1]
+
+
+def select_best_matches(
+    ratio_scores: np.ndarray,
+    partial_scores: np.ndarray,
+    threshold: int
+) -> List[Optional[Tuple[int, str, int]]]:
+    """
+    Picks the best XML role for each PDF role from the score matrices.
+
+    A full-ratio match is preferred (highest ratio wins); otherwise the
+    highest partial ratio is used, which catches abbreviations. Ties go
+    to the first XML role.
+
+    Args:
+        ratio_scores (np.ndarray): Ratio matrix (rows = PDF roles)
+        partial_scores (np.ndarray): Partial-ratio matrix (same shape)
+        threshold (int): Minimum score (0-100) for a match
+
+    Returns:
+        List[Optional[Tuple[int, str, int]]]: Per row, (column index, match
+                                              kind, score) or None if no match
+    """
+    rows = ratio_scores.shape[0]
+    if rows == 0 or ratio_scores.shape[1] == 0:
+        return [None] * rows
+
+    best_ratio_col = ratio_scores.argmax(axis=1)
+    best_ratio = ratio_scores[np.arange(rows), best_ratio_col]
+    best_partial_col = partial_scores.argmax(axis=1)
+    best_partial = partial_scores[np.arange(rows), best_partial_col]
+
+    matches: List[Optional[Tuple[int, str, int]]] = []
+    for row in range(rows):
+        if best_ratio[row] >= threshold:
+            matches.append(
+                (int(best_ratio_col[row]), FUZZY, int(best_ratio[row])))
+        elif best_partial[row] >= threshold:
+            matches.append(
+                (int(best_partial_col[row]), PARTIAL, int(best_partial[row])))
+        else:
+            matches.append(None)
+
+    return matches
+
+
+def match_with_candidates(
+    queries: List[str],
+    catalog: RoleCatalogIndex,
+    threshold: int
+) -> List[Optional[Tuple[int, str, int]]]:
+    """
+    Best-match selection that only scores n-gram blocking candidates.
+
+    Gives the same result as compute_score_matrices() followed by
+    select_best_matches() on the full catalog: candidates are a lossless
+    superset of the roles that can reach threshold, and they are scored
+    in catalog order so ties still go to the first XML role.
+
+    Args:
+        queries (List[str]): PDF roles
+        catalog (RoleCatalogIndex): Prebuilt index of the XML roles
+        threshold (int): Minimum score (0-100) for a match
+
+    Returns:
+        List[Optional[Tuple[int, str, int]]]: Per query, (column index, match
+                                              kind, score) or None if no match
+    """
+    matches: List[Optional[Tuple[int, str, int]]] = []
+    for query in queries:
+        candidate_ids = catalog.candidates(query, threshold)
+        if not candidate_ids:
+            matches.append(None)
+            continue
+
+        ratio_scores, partial_scores = compute_score_matrices(
+            [query],
+            [catalog.roles[index] for index in candidate_ids],
+            score_cutoff=threshold,
+            workers=1
+        )
+        best = select_best_matches(ratio_scores, partial_scores, threshold)[0]
+        if best is None:
+            matches.append(None)
+        else:
+            column, kind, score = best
+            matches.append((candidate_ids[column], kind, score))
+
+    return matches
@@ -0,0 +1,295 @@
+# src/span_filter.py
+"""
+Candidate-span pre-filter for LLM role extraction.
+Keeps the sentences and table rows most likely to name roles, within a size budget.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, FrozenSet, Optional, Tuple
+from src.utils import role_tokens, is_title_suffix
+
+# Bump when scoring or span splitting changes (part of the validation cache key)
+SPAN_FILTER_VERSION = 2
+
+# Rough size of one LLM token in characters for English text
+CHARS_PER_TOKEN = 4
+
+# Catalog words too common to count as evidence of a role
+_STOPWORDS = frozenset({
+    "and", "the", "for", "with", "from", "head", "lead", "chief", "senior",
+    "junior", "team", "staff", "general"
+})
+
+_TABLE_MARKER = re.compile(r'^--- (?:TABLE: .*|END OF TABLE) ---$')
+_TABLE_END = "--- END OF TABLE ---"
+# Sentence ends, except after initials and title abbreviations ("Sr. Developer")
+_SENTENCE_BREAK = re.compile(
+    r'(?<=[.!?;:])(?<!\b[A-Z]\.)(?<!\bSr\.)(?<!\bJr\.)(?<!\bMr\.)(?<!\bMs\.)'
+    r'(?<!\bDr\.)(?<!\bSt\.)(?<!\bNo\.)(?<!\bMrs\.)(?<!\bInc\.)(?<!\bAsst\.)'
+    r'\s+(?=[A-Z0-9"(])'
+)
+# Runs of two or more capitalized words, e.g. "Senior Data Engineer"
+_TITLE_CASE_RUN = re.compile(r'\b[A-Z][\w&/-]*\.?(?:\s+(?:of\s+|&\s+)?[A-Z][\w&/-]*\.?)+')
+
+
+@dataclass
+class TextSpan:
+    """
+    A sentence or table row of the document.
+
+    Attributes:
+        text: Span text
+        is_table_row: True for rows of extracted tables
+        score: Role likelihood (0 = no evidence)
+        table: Opening TABLE marker of the row's table ("" for sentences)
+        table_index: Position of the row's table in the document (-1 for sentences)
+    """
+    text: str
+    is_table_row: bool = False
+    score: float = 0.0
+    table: str = ""
+    table_index: int = -1
+
+
+@dataclass
+class SpanSelection:
+    """
+    Result of filtering one document.
+
+    Attributes:
+        text: Text to send to the LLM
+        spans: All spans of the document, in order
+        selected: Indices of the spans kept, ascending
+        original_chars: Length of the unfiltered text
+    """
+    text: str
+    spans: List[TextSpan] = field(default_factory=list)
+    selected: List[int] = field(default_factory=list)
+    original_chars: int = 0
+
+    @property
+    def filtered(self) -> bool:
+        """
+        True if spans were dropped (False when the text fit the budget).
+        """
+        return len(self.text) < self.original_chars
+
+    @property
+    def savings_percentage(self) -> float:
+        """
+        Share of characters (and so, roughly, prompt tokens) removed.
+        """
+        if not self.original_chars:
+            return 0.0
+        return round((1 - len(self.text) / self.original_chars) * 100, 2)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the LLM token count of text from its length.
+
+    Examples:
+        >>> estimate_tokens("Software Engineer")
+        5
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def effective_budget(max_chars: int, max_tokens: int = 0) -> int:
+    """
+    Returns the character budget implied by a character and a token limit.
+
+    Args:
+        max_chars (int): Character budget (0 = no character limit)
+        max_tokens (int): Token budget (0 = no token limit)
+
+    Returns:
+        int: Characters allowed (0 = unlimited)
+    """
+    limits = [limit for limit in (max_chars, max_tokens * CHARS_PER_TOKEN) if limit > 0]
+    return min(limits) if limits else 0
+
+
+def split_spans(text: str) -> List[TextSpan]:
+    """
+    Splits extracted document text into sentences and table rows.
+
+    Table rows are the lines between the extractor's TABLE markers and
+    remember their table's opening marker, so kept rows can be wrapped
+    in their markers again; other lines are split into sentences.
+
+    Args:
+        text (str): Document text (ExtractedDocument.text)
+
+    Returns:
+        List[TextSpan]: Spans in document order
+    """
+    spans: List[TextSpan] = []
+    table = ""
+    table_index = -1
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _TABLE_MARKER.match(line):
+            if line.startswith("--- TABLE"):
+                table = line
+                table_index += 1
+            else:
+                table = ""
+            continue
+        if table:
+            spans.append(TextSpan(line, is_table_row=True,
+                                  table=table, table_index=table_index))
+            continue
+        for sentence in _SENTENCE_BREAK.split(line):
+            sentence = sentence.strip()
+            if sentence:
+                spans.append(TextSpan(sentence))
+    return spans
+
+
+def _span_evidence(span: TextSpan, vocabulary: FrozenSet[str]) -> Tuple[int, int, int, int]:
+    """
+    Returns (title words, catalog words, Title Case runs, word count) of a span.
+    """
+    tokens = role_tokens(span.text)
+    title_words = sum(1 for token in tokens if is_title_suffix(token))
+    catalog_words = len({
+        token for token in tokens
+        if token in vocabulary and len(token) > 2 and token not in _STOPWORDS
+    })
+    title_case_runs = len(_TITLE_CASE_RUN.findall(span.text))
+    return title_words, catalog_words, title_case_runs, len(tokens)
+
+
+def score_span(span: TextSpan, vocabulary: FrozenSet[str] = frozenset()) -> float:
+    """
+    Scores how likely a span is to name a job role.
+
+    Evidence, strongest first:
+    - Job-title words (ROLE_TITLE_SUFFIXES: Engineer, Manager, ...)
+    - Words shared with the catalog roles
+    - Runs of capitalized words (titles are usually written in Title Case)
+
+    Table rows with any evidence get a small bonus, since role tables
+    tend to list one role per row.
+
+    Args:
+        span (TextSpan): Span to score
+        vocabulary (FrozenSet[str]): Lowercase words of the catalog roles
+
+    Returns:
+        float: Score (0 = no evidence)
+    """
+    title_words, catalog_words, title_case_runs, word_count = _span_evidence(span, vocabulary)
+
+    score = 3.0 * min(title_words, 3) + 1.5 * min(catalog_words, 4) + min(title_case_runs, 3)
+    if score and span.is_table_row:
+        score += 1.0
+    # Prefer dense evidence over long spans that mention a title once
+    return score / (1 + word_count / 40)
+
+
+def select_spans(
+    text: str,
+    max_chars: int,
+    vocabulary: FrozenSet[str] = frozenset(),
+    neighbors: int = 1
+) -> SpanSelection:
+    """
+    Keeps the highest scoring spans and their neighbors within a budget.
+
+    Spans are added best first in three rounds, each only while the
+    total stays within max_chars:
+    1. Spans with a job-title word or a catalog word
+    2. Up to `neighbors` spans on either side of those, for context
+    3. Spans whose only evidence is capitalization
+
+    The kept spans are returned in document order; spans without any
+    evidence are never sent. Text that already fits the budget is
+    returned unchanged.
+
+    Args:
+        text (str): Document text
+        max_chars (int): Character budget for the result (0 = unlimited)
+        vocabulary (FrozenSet[str]): Lowercase words of the catalog roles
+        neighbors (int): Context spans kept before and after each hit
+
+    Returns:
+        SpanSelection: Filtered text and the spans behind it
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return SpanSelection(text=text, original_chars=len(text))
+
+    spans = split_spans(text)
+    strong: List[int] = []
+    weak: List[int] = []
+    for index, span in enumerate(spans):
+        span.score = score_span(span, vocabulary)
+        if span.score <= 0:
+            continue
+        title_words, catalog_words, _, _ = _span_evidence(span, vocabulary)
+        (strong if title_words or catalog_words else weak).append(index)
+
+    def by_score(indices: List[int]) -> List[int]:
+        return sorted(indices, key=lambda index: (-spans[index].score, index))
+
+    strong = by_score(strong)
+    context = [
+        neighbor
+        for index in strong
+        for neighbor in range(max(0, index - neighbors), min(len(spans), index + neighbors + 1))
+    ]
+
+    selected = set()
+    opened_tables = set()
+    used = 0
+    for index in strong + context + by_score(weak):
+        if index in selected:
+            continue
+        span = spans[index]
+        # Upper bound on the separator added by _join_spans
+        cost = len(span.text) + 2
+        if span.is_table_row and span.table_index not in opened_tables:
+            # The first row kept from a table also brings its markers
+            cost += len(span.table) + len(_TABLE_END) + 2
+        if used + cost > max_chars:
+            continue
+        selected.add(index)
+        opened_tables.add(span.table_index)
+        used += cost
+
+    ordered = sorted(selected)
+    return SpanSelection(
+        text=_join_spans(spans, ordered),
+        spans=spans,
+        selected=ordered,
+        original_chars=len(text)
+    )
+
+
+def _join_spans(spans: List[TextSpan], ordered: List[int]) -> str:
+    """
+    Joins kept spans; non-adjacent groups are separated by a blank line
+    and kept table rows are wrapped in their table's markers.
+    """
+    parts: List[str] = []
+    previous: Optional[int] = None
+    for index in ordered:
+        span = spans[index]
+        if previous is not None:
+            previous_span = spans[previous]
+            same_table = span.is_table_row and span.table_index == previous_span.table_index
+            if previous_span.is_table_row and not same_table:
+                parts.append("\n" + _TABLE_END)
+            parts.append("\n" if index == previous + 1 or same_table else "\n\n")
+        if span.is_table_row and (previous is None
+                                  or spans[previous].table_index != span.table_index):
+            parts.append(span.table + "\n")
+        parts.append(span.text)
+        previous = index
+    if previous is not None and spans[previous].is_table_row:
+        parts.append("\n" + _TABLE_END)
+    return "".join(parts)
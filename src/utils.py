@@ -6,8 +6,60 @@ Provides text normalization, fuzzy matching, and text chunking utilities.
 """
 
 import re
-from typing import List
-from thefuzz import fuzz
+import hashlib
+from itertools import product
+from typing import List, Iterable, Tuple
+
+# Head nouns that usually end a job title; a mention of one outside every
+# known role means the text may name a role the catalog does not have
+ROLE_TITLE_SUFFIXES = frozenset({
+    "engineer", "developer", "programmer", "architect", "scientist",
+    "analyst", "manager", "director", "officer", "administrator",
+    "designer", "consultant", "specialist", "coordinator", "lead",
+    "tester", "technician", "supervisor", "assistant", "associate",
+    "executive", "president", "head", "owner", "intern", "recruiter",
+    "accountant", "strategist", "editor", "writer", "researcher",
+    "mgr", "eng", "dev", "admin"
+})
+
+# Known spellings of role words and phrases (normalized, space-separated);
+# each catalog role is also matched with these substitutions applied.
+# Words that are common outside titles ("tech", "dir", "it") are left out.
+ROLE_WORD_VARIANTS = {
+    "senior": ("sr",),
+    "junior": ("jr",),
+    "manager": ("mgr",),
+    "engineer": ("eng", "engr"),
+    "engineering": ("eng",),
+    "developer": ("dev",),
+    "development": ("dev",),
+    "administrator": ("admin",),
+    "assistant": ("asst",),
+    "associate": ("assoc",),
+    "specialist": ("spec",),
+    "operations": ("ops",),
+    "quality assurance": ("qa",),
+    "user experience": ("ux",),
+    "user interface": ("ui",),
+    "human resources": ("hr",),
+    "vice president": ("vp",),
+    "chief executive officer": ("ceo",),
+    "chief technology officer": ("cto",),
+    "chief financial officer": ("cfo",),
+    "chief operating officer": ("coo",),
+}
+
+# Upper bound on generated variants per role (substitutions multiply)
+MAX_ROLE_VARIANTS = 32
+
+# First word -> (phrase, alternatives) pairs, longest phrase first, so
+# "quality assurance" wins over its words
+_VARIANT_PHRASES = {}
+for _phrase in sorted(ROLE_WORD_VARIANTS, key=lambda key: -len(key.split())):
+    _VARIANT_PHRASES.setdefault(_phrase.split()[0], []).append((
+        tuple(_phrase.split()),
+        [tuple(alt.split()) for alt in ROLE_WORD_VARIANTS[_phrase]]
+    ))
 
 
 def normalize_role(role_name: str) -> str:
@@ -47,6 +99,85 @@ def normalize_role(role_name: str) -> str:
     return normalized
 
 
+def role_tokens(text: str) -> List[str]:
+    """
+    Splits text into lowercase word tokens (punctuation separates words).
+
+    Examples:
+        >>> role_tokens("Sr. Full-Stack Developer")
+        ['sr', 'full', 'stack', 'developer']
+    """
+    return re.findall(r'\w+', text.lower())
+
+
+def is_title_suffix(token: str) -> bool:
+    """
+    Returns True if a lowercase token is a job-title head noun (or its plural).
+
+    Examples:
+        >>> is_title_suffix("engineers")
+        True
+        >>> is_title_suffix("software")
+        False
+    """
+    return token in ROLE_TITLE_SUFFIXES or (
+        token.endswith("s") and token[:-1] in ROLE_TITLE_SUFFIXES)
+
+
+def role_variants(role_name: str) -> List[Tuple[str, ...]]:
+    """
+    Returns the token sequences a role may be written as.
+
+    Covers the role's own tokens, its normalize_role() form (hyphenated
+    words joined) and every combination of ROLE_WORD_VARIANTS
+    substitutions, capped at MAX_ROLE_VARIANTS. An abbreviation is only
+    accepted next to another word of the role: a variant that is a
+    single abbreviated word ("dev" for "Developer") is too ambiguous to
+    count as a mention and is not generated.
+
+    Args:
+        role_name (str): Role name as written in the catalog
+
+    Returns:
+        List[Tuple[str, ...]]: Unique token sequences, the role's own first
+
+    Examples:
+        >>> role_variants("Senior QA Engineer")[:3]
+        [('senior', 'qa', 'engineer'), ('senior', 'qa', 'eng'), ('senior', 'qa', 'engr')]
+        >>> role_variants("Developer")
+        [('developer',)]
+    """
+    bases = [tuple(role_tokens(role_name)), tuple(normalize_role(role_name).split())]
+
+    variants: List[Tuple[str, ...]] = []
+    seen = set()
+    for tokens in bases:
+        # Split into segments, each with its alternative spellings
+        segments: List[List[Tuple[str, ...]]] = []
+        i = 0
+        while i < len(tokens):
+            for phrase, alternatives in _VARIANT_PHRASES.get(tokens[i], ()):
+                if tokens[i:i + len(phrase)] == phrase:
+                    segments.append([phrase] + alternatives)
+                    i += len(phrase)
+                    break
+            else:
+                segments.append([(tokens[i],)])
+                i += 1
+
+        for combination in product(*segments):
+            variant = tuple(token for segment in combination for token in segment)
+            if len(variant) == 1 and variant != tokens:
+                continue
+            if variant and variant not in seen:
+                seen.add(variant)
+                variants.append(variant)
+            if len(variants) >= MAX_ROLE_VARIANTS:
+                return variants
+
+    return variants
+
+
 def fuzzy_match(str1: str, str2: str, threshold: int) -> bool:
     """
     Performs fuzzy string matching between two strings.
@@ -68,6 +199,8 @@ def fuzzy_match(str1: str, str2: str, threshold: int) -> bool:
         >>> fuzzy_match("Manager", "Developer", 80)
         False
     """
+    from thefuzz import fuzz  # Only needed by these helpers
+
     # Calculate similarity ratio (0-100)
     similarity = fuzz.ratio(str1, str2)
 
@@ -88,6 +221,8 @@ def fuzzy_partial_match(str1: str, str2: str, threshold: int) -> bool:
     Returns:
         bool: True if partial similarity >= threshold, False otherwise
     """
+    from thefuzz import fuzz  # Only needed by these helpers
+
     similarity = fuzz.partial_ratio(str1, str2)
 
     return similarity >= threshold
@@ -145,6 +280,39 @@ def chunk_text(text: str, chunk_size: int, overlap: int) -> List[str]:
     return chunks
 
 
+def make_chunk_id(
+    pdf_id: str,
+    chunk_text: str,
+    page_number: int,
+    chunk_index: int
+) -> str:
+    """
+    Builds a deterministic, content-addressed ID for a document chunk.
+
+    The ID hashes the PDF ID, the whitespace-normalized chunk text and the
+    chunk's position, so re-ingesting identical content yields identical
+    IDs and vector store upserts become idempotent.
+
+    Args:
+        pdf_id (str): PDF identifier
+        chunk_text (str): Chunk content
+        page_number (int): Page the chunk comes from
+        chunk_index (int): Position of the chunk within its page
+
+    Returns:
+        str: Chunk ID of the form '<pdf_id>-<16 hex chars>'
+
+    Examples:
+        >>> make_chunk_id("doc", "Software  Engineer", 0, 0) == \\
+        ...     make_chunk_id("doc", "Software Engineer", 0, 0)
+        True
+    """
+    normalized_text = re.sub(r'\s+', ' ', chunk_text).strip()
+    key = "\x1f".join([pdf_id, normalized_text, str(page_number), str(chunk_index)])
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return f"{pdf_id}-{digest[:16]}"
+
+
 def clean_extracted_roles(roles_str: str) -> List[str]:
     """
     Cleans and parses roles extracted from LLM response.
@@ -194,6 +362,38 @@ def clean_extracted_roles(roles_str: str) -> List[str]:
     return unique_roles
 
 
+def merge_role_lists(role_lists: Iterable[List[str]]) -> List[str]:
+    """
+    Merges several role lists into one de-duplicated list.
+
+    Used to reduce per-chunk LLM results and to combine LLM and gazetteer
+    roles. The lists are already clean, so roles are kept as they are
+    (no re-parsing: "3D Artist" or "Director, Sales" stay intact);
+    duplicates are removed case-insensitively, keeping first-seen order.
+
+    Args:
+        role_lists (Iterable[List[str]]): Role lists to merge
+
+    Returns:
+        List[str]: Unique roles across all lists
+
+    Examples:
+        >>> merge_role_lists([["Engineer", "Manager"], ["manager", "Analyst"]])
+        ['Engineer', 'Manager', 'Analyst']
+        >>> merge_role_lists([["3D Artist"], ["Director, Sales"]])
+        ['3D Artist', 'Director, Sales']
+    """
+    seen = set()
+    merged = []
+    for roles in role_lists:
+        for role in roles:
+            key = role.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(role.strip())
+    return merged
+
+
 def format_report_section(title: str, items: List[str], indent: int = 0) -> str:
     """
     Formats a section of the report with consistent styling.
@@ -0,0 +1,264 @@
+# src/validation_cache.py
+"""
+Persistent cache of whole validation results.
+Keyed by the XML and PDF content hashes plus every setting that changes the outcome.
+"""
+
+import json
+import time
+from typing import List, Dict, Optional, Any, TYPE_CHECKING
+from src.cache_store import SQLiteCache, hash_key
+from src.gazetteer import GAZETTEER_VERSION
+from src.span_filter import SPAN_FILTER_VERSION
+from config.config import (
+    VALIDATION_CACHE_PATH,
+    VALIDATION_CACHE_MAX_ENTRIES,
+    ROLE_EXTRACTION_MAX_CHARS,
+    ROLE_EXTRACTION_CHUNK_SIZE,
+    ROLE_EXTRACTION_CHUNK_OVERLAP,
+    ROLE_SPAN_FILTER_NEIGHBORS
+)
+
+if TYPE_CHECKING:
+    from src.pdf_extractor_rag import RAGPDFExtractor
+
+# Bump when the stored result layout changes so stale entries are ignored
+VALIDATION_FORMAT_VERSION = 1
+
+
+def extraction_settings_hash(pdf_extractor: "RAGPDFExtractor") -> str:
+    """
+    Hashes the prompt and the settings that shape role extraction.
+
+    Settings are read from the extractor (and its LangChain client), so
+    extractors configured differently from the global config never share
+    cached results.
+
+    Args:
+        pdf_extractor (RAGPDFExtractor): Extractor that produces the roles
+
+    Returns:
+        str: Hex digest identifying the extraction configuration
+    """
+    client = pdf_extractor.langchain_client
+    parts = [
+        client.role_extraction_template.template,
+        repr(float(client.temperature)),
+        pdf_extractor.role_extraction_mode,
+        str(ROLE_EXTRACTION_MAX_CHARS),
+        str(ROLE_EXTRACTION_CHUNK_SIZE),
+        str(ROLE_EXTRACTION_CHUNK_OVERLAP)
+    ]
+    # Default settings keep the keys they had before these options existed
+    if pdf_extractor.role_extraction_policy != "llm":
+        parts += [pdf_extractor.role_extraction_policy, str(GAZETTEER_VERSION)]
+    if pdf_extractor.span_filter_budget:
+        parts += [
+            "span_filter",
+            str(SPAN_FILTER_VERSION),
+            str(pdf_extractor.span_filter_budget),
+            str(ROLE_SPAN_FILTER_NEIGHBORS)
+        ]
+    return hash_key(*parts)
+
+
+class ValidationResultCache:
+    """
+    Result cache for (XML catalog, PDF) validations.
+
+    An entry holds the pipeline result of one document: the
+    compare_roles() outcome (is_incorrect, matched_roles,
+    incorrect_roles, fuzzy_matches), the extracted PDF roles and the
+    match statistics. XML role lists are stored once per (XML hash,
+    XPath) in a second table, so batch runs against a large catalog do
+    not repeat it per document. A hit needs no PDF parsing, LLM call or
+    vector store access.
+    """
+
+    def __init__(
+        self,
+        db_path: str = VALIDATION_CACHE_PATH,
+        max_entries: int = VALIDATION_CACHE_MAX_ENTRIES
+    ):
+        """
+        Initialize the validation result cache.
+
+        Args:
+            db_path (str): Path to the SQLite cache file
+            max_entries (int): Maximum cached results (0 = unbounded)
+        """
+        self.store = SQLiteCache(db_path, "validations", max_entries=max_entries)
+        self.catalogs = SQLiteCache(db_path, "xml_catalogs", max_entries=max_entries)
+
+    @staticmethod
+    def make_key(
+        xml_hash: str,
+        xml_xpath: str,
+        pdf_hash: str,
+        fuzzy_threshold: int,
+        model: str,
+        settings_hash: str
+    ) -> str:
+        """
+        Builds the cache key for one validation.
+
+        Args:
+            xml_hash (str): SHA-256 of the XML bytes
+            xml_xpath (str): XPath expression for XML roles
+            pdf_hash (str): SHA-256 of the PDF bytes
+            fuzzy_threshold (int): Fuzzy match threshold
+            model (str): LLM model name
+            settings_hash (str): extraction_settings_hash() of the extractor
+
+        Returns:
+            str: Cache key
+        """
+        return hash_key(
+            str(VALIDATION_FORMAT_VERSION),
+            xml_hash,
+            xml_xpath,
+            pdf_hash,
+            model,
+            settings_hash,
+            str(fuzzy_threshold)
+        )
+
+    @staticmethod
+    def _catalog_key(xml_hash: str, xml_xpath: str) -> str:
+        return hash_key(str(VALIDATION_FORMAT_VERSION), xml_hash, xml_xpath)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached result for a key, if any.
+
+        Args:
+            key (str): Key from make_key()
+
+        Returns:
+            Optional[Dict]: Pipeline result (with "cached": True) or None on a miss
+        """
+        value = self.store.get(key)
+        if value is None:
+            return None
+
+        entry = json.loads(value.decode('utf-8'))
+        result = entry["result"]
+        result["cached"] = True
+        return result
+
+    def get_xml_roles(self, xml_hash: str, xml_xpath: str) -> Optional[List[str]]:
+        """
+        Returns the cached XML roles of a catalog, if any.
+        """
+        value = self.catalogs.get(self._catalog_key(xml_hash, xml_xpath))
+        return json.loads(value.decode('utf-8')) if value is not None else None
+
+    def put(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        xml_hash: str,
+        xml_xpath: str,
+        pdf_hash: str,
+        fuzzy_threshold: int,
+        model: str,
+        xml_roles: Optional[List[str]] = None
+    ) -> None:
+        """
+        Stores a successful result; error results are never cached.
+
+        Args:
+            key (str): Key from make_key()
+            result (Dict): Pipeline result for the document
+            xml_hash (str): SHA-256 of the XML bytes
+            xml_xpath (str): XPath expression for XML roles
+            pdf_hash (str): SHA-256 of the PDF bytes
+            fuzzy_threshold (int): Fuzzy match threshold
+            model (str): LLM model name (as passed to make_key())
+            xml_roles (Optional[List[str]]): XML roles to store for the catalog
+        """
+        # Failed or partial extractions must be retried, never served
+        if result.get("status") != "ok" or result.get("error"):
+            return
+
+        stored = {
+            k: v for k, v in result.items()
+            if k not in ("xml_roles", "elapsed_seconds", "cached")
+        }
+        entry = {
+            "xml_hash": xml_hash,
+            "xml_xpath": xml_xpath,
+            "pdf_hash": pdf_hash,
+            "model": model,
+            "fuzzy_threshold": fuzzy_threshold,
+            "stored_at": time.time(),
+            "result": stored
+        }
+        self.store.put(key, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+        if xml_roles is not None:
+            self.catalogs.put(
+                self._catalog_key(xml_hash, xml_xpath),
+                json.dumps(xml_roles, ensure_ascii=False).encode('utf-8')
+            )
+
+    def list_entries(self, limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Lists cached results, most recently used first.
+
+        Args:
+            limit (int): Maximum number of entries (0 = all)
+
+        Returns:
+            List[Dict]: Key, timestamps and summary fields per entry
+        """
+        entries = []
+        for row in self.store.entries(limit):
+            entry = json.loads(row["value"].decode('utf-8'))
+            result = entry["result"]
+            entries.append({
+                "key": row["key"],
+                "pdf_path": result.get("pdf_path"),
+                "pdf_hash": entry["pdf_hash"],
+                "xml_hash": entry["xml_hash"],
+                "xml_xpath": entry["xml_xpath"],
+                "model": entry["model"],
+                "fuzzy_threshold": entry["fuzzy_threshold"],
+                "is_valid": result.get("is_valid"),
+                "created_at": row["created_at"],
+                "accessed_at": row["accessed_at"]
+            })
+        return entries
+
+    def evict(self, key_prefixes: List[str]) -> int:
+        """
+        Removes the entries whose key starts with any of the given prefixes.
+
+        Args:
+            key_prefixes (List[str]): Full keys or unambiguous key prefixes
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        for row in self.store.entries():
+            if any(row["key"].startswith(prefix) for prefix in key_prefixes):
+                if self.store.delete(row["key"]):
+                    removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """
+        Removes all cached results and XML role lists.
+
+        Returns:
+            int: Number of results removed
+        """
+        self.catalogs.clear()
+        return self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns cache hit/miss statistics.
+        """
+        return self.store.stats()
@@ -84,18 +84,24 @@ class VectorStoreClient:
         self,
         texts: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        skip_existing: bool = True
     ) -> List[str]:
         """
         Adds documents to the vector store.
 
+        With content-addressed IDs this is an idempotent upsert: chunks
+        whose ID is already stored are skipped, so they are not embedded
+        or written again.
+
         Args:
             texts (List[str]): List of text chunks to add
             metadatas (Optional[List[Dict]]): Metadata for each chunk
             ids (Optional[List[str]]): Unique IDs for each chunk
+            skip_existing (bool): Skip chunks whose ID is already stored
 
         Returns:
-            List[str]: List of IDs for added documents
+            List[str]: IDs of the documents now stored (added or already present)
         """
         if not texts:
             print("⚠️  No texts provided to add to vector store")
@@ -104,24 +110,38 @@ class VectorStoreClient:
         try:
             vectorstore = self._ensure_vectorstore()
 
-            # Create Document objects
-            documents = [
-                Document(
+            existing_ids: List[str] = []
+            if ids and skip_existing:
+                existing_ids = vectorstore.get(ids=ids, include=[])['ids']
+
+            existing = set(existing_ids)
+
+            # Create Document objects for chunks not stored yet
+            documents = []
+            new_ids = []
+            for i, text in enumerate(texts):
+                if ids and ids[i] in existing:
+                    continue
+                documents.append(Document(
                     page_content=text,
                     metadata=metadatas[i] if metadatas else {}
+                ))
+                if ids:
+                    new_ids.append(ids[i])
+
+            added_ids: List[str] = []
+            if documents:
+                # Add documents to vector store
+                added_ids = vectorstore.add_documents(
+                    documents=documents,
+                    ids=new_ids or None
                 )
-                for i, text in enumerate(texts)
-            ]
-
-            # Add documents to vector store
-            added_ids = vectorstore.add_documents(
-                documents=documents,
-                ids=ids
-            )
 
             print(f"✅ Added {len(added_ids)} documents to vector store")
+            if existing_ids:
+                print(f"♻️  Skipped {len(existing_ids)} documents already stored")
 
-            return added_ids
+            return existing_ids + added_ids
 
         except Exception as e:
             print(f"❌ Error adding documents to vector store: {e}")
@@ -320,6 +340,78 @@ class VectorStoreClient:
             print(f"❌ Error retrieving documents by PDF ID: {e}")
             return []
 
+    def get_page_hashes(self, pdf_id: str) -> Optional[Dict[int, str]]:
+        """
+        Returns the page content hashes recorded in a PDF's chunk metadata.
+
+        Used for incremental re-indexing: pages whose hash is unchanged
+        keep their existing chunks and embeddings. Chunks are written with
+        an empty page hash that is only filled in once every chunk of the
+        page is stored (see set_page_hash()), so a page whose write was
+        interrupted maps to "" and never matches its content hash.
+
+        Args:
+            pdf_id (str): The PDF identifier
+
+        Returns:
+            Optional[Dict[int, str]]: Page number -> page hash (empty if the PDF
+                                      is not indexed), or None if some chunks
+                                      predate page hashes
+
+        Raises:
+            Exception: If the vector store cannot be read (the caller must
+                       not mistake this for an index without page hashes)
+        """
+        vectorstore = self._ensure_vectorstore()
+
+        results = vectorstore.get(
+            where={"pdf_id": pdf_id},
+            include=["metadatas"]
+        )
+
+        page_hashes: Dict[int, str] = {}
+        incomplete_pages = set()
+        for metadata in results.get('metadatas') or []:
+            metadata = metadata or {}
+            page_number = metadata.get("page_number")
+
+            if page_number is None or "page_hash" not in metadata:
+                return None
+
+            page_number = int(page_number)
+            if not metadata["page_hash"]:
+                incomplete_pages.add(page_number)
+            page_hashes[page_number] = metadata["page_hash"]
+
+        for page_number in incomplete_pages:
+            page_hashes[page_number] = ""
+
+        return page_hashes
+
+    def set_page_hash(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> bool:
+        """
+        Records page hashes on stored chunks without re-embedding them.
+
+        Args:
+            ids (List[str]): IDs of the stored chunks
+            metadatas (List[Dict]): Full metadata of each chunk, page hash included
+
+        Returns:
+            bool: Success status
+        """
+        if not ids:
+            return True
+
+        try:
+            vectorstore = self._ensure_vectorstore()
+            vectorstore._collection.update(  # type: ignore
+                ids=ids, metadatas=metadatas)
+            return True
+
+        except Exception as e:
+            print(f"❌ Error recording page hashes: {e}")
+            return False
+
     def as_retriever(self, **kwargs: Any) -> VectorStoreRetriever:
         """
         Returns a LangChain retriever for the vector store.
@@ -1,25 +1,359 @@
 # src/xml_parser.py
 """
 XML parser module for extracting job roles.
-Uses lxml for efficient XPath-based extraction.
+Uses lxml for efficient XPath-based extraction, and streaming iterparse
+for very large catalogs.
 """
 
 import os
-from typing import List
+import re
+import threading
+from dataclasses import dataclass
+from typing import List, Iterator, Optional, Tuple, Dict, Any
 from lxml import etree  # type:ignore
+from src.instrumentation import span
+from src.extraction_cache import compute_file_hash
+from config.config import get_settings
 
+_TAG_NAME = re.compile(r"^[A-Za-z_][\w.-]*$")
+_TEXT_STEP = "/text()"
 
-def extract_roles_from_xml(xml_filepath: str, role_xpath: str) -> List[str]:
+# lxml parsers and compiled XPath objects must not be shared between
+# threads, so each thread keeps its own and reuses them across parses
+_thread_state = threading.local()
+
+
+def _get_parser(recover: bool = True) -> etree.XMLParser:
+    """
+    Returns this thread's UTF-8 XML parser (recovering or strict).
+    """
+    parsers = getattr(_thread_state, "parsers", None)
+    if parsers is None:
+        parsers = _thread_state.parsers = {}
+    parser = parsers.get(recover)
+    if parser is None:
+        parser = parsers[recover] = etree.XMLParser(recover=recover, encoding='utf-8')
+    return parser
+
+
+def compile_xpath(expression: str) -> etree.XPath:
+    """
+    Returns a compiled XPath for an expression, cached per thread.
+
+    Args:
+        expression (str): XPath expression
+
+    Returns:
+        etree.XPath: Callable evaluating the expression on a tree or element
+
+    Raises:
+        etree.XPathSyntaxError: If the expression is invalid
+    """
+    compiled = getattr(_thread_state, "xpaths", None)
+    if compiled is None:
+        compiled = _thread_state.xpaths = {}
+    xpath = compiled.get(expression)
+    if xpath is None:
+        xpath = compiled[expression] = etree.XPath(expression)
+    return xpath
+
+
+def _role_texts(role_elements) -> List[str]:
+    """
+    Converts XPath results to stripped, non-empty role names.
+    """
+    roles = []
+    for element in role_elements:
+        if element is not None:
+            # Convert to string and strip whitespace
+            role_text = str(element).strip()
+            if role_text:  # Only add non-empty roles
+                roles.append(role_text)
+    return roles
+
+
+def _roles_with_attributes(role_elements, attributes: List[str]) -> List[dict]:
+    """
+    Builds {'name': ..., attr: ...} records for role elements.
+    """
+    roles_with_attrs = []
+    for element in role_elements:
+        if element is not None:
+            role_data = {
+                'name': element.text.strip() if element.text else ""
+            }
+
+            # Extract requested attributes
+            if attributes:
+                for attr in attributes:
+                    role_data[attr] = element.get(attr, "")
+
+            if role_data['name']:  # Only add if name is not empty
+                roles_with_attrs.append(role_data)
+    return roles_with_attrs
+
+
+@dataclass(frozen=True)
+class RolePath:
+    """
+    Element path that streaming extraction can follow without a tree.
+
+    Attributes:
+        steps: Tag names from outermost to the role element
+        anywhere: True for a leading // (steps may start at any depth)
+        text: True if the path selects text() nodes of the role element
+    """
+    steps: Tuple[str, ...]
+    anywhere: bool
+    text: bool
+
+    def matches(self, tags: List[str]) -> bool:
+        """
+        Checks whether the open-element stack (root first) ends at a role.
+        """
+        if self.anywhere:
+            return len(tags) >= len(self.steps) and tuple(tags[-len(self.steps):]) == self.steps
+        return tuple(tags) == self.steps
+
+
+def parse_role_path(spec: str) -> RolePath:
+    """
+    Parses a tag/path spec for streaming extraction.
+
+    Accepts plain element paths: '//role/text()', '/roles/role/text()',
+    '//department/role', or a bare tag ('role', same as '//role').
+    Without text(), each role element yields its own text.
+
+    Args:
+        spec (str): Tag or path spec
+
+    Returns:
+        RolePath: Parsed path
+
+    Raises:
+        ValueError: If the spec uses predicates, axes, wildcards or other
+                    XPath features that need the whole tree
+    """
+    path = spec.strip()
+    text = path.endswith(_TEXT_STEP)
+    if text:
+        path = path[:-len(_TEXT_STEP)]
+
+    if path.startswith("//"):
+        anywhere, path = True, path[2:]
+    elif path.startswith("/"):
+        anywhere, path = False, path[1:]
+    else:
+        anywhere = True
+
+    steps = tuple(path.split("/"))
+    if not all(_TAG_NAME.match(step) for step in steps):
+        raise ValueError(f"Not a streamable role path: {spec}")
+
+    return RolePath(steps=steps, anywhere=anywhere, text=text)
+
+
+def streamable_role_path(role_xpath: str) -> Optional[RolePath]:
+    """
+    Returns the RolePath equivalent to an XPath, or None if the XPath
+    cannot be evaluated by streaming with identical results.
+
+    Only absolute element paths ending in text() qualify, e.g.
+    '//role/text()' or '/roles/role/text()'.
+    """
+    if not role_xpath.startswith("/") or not role_xpath.endswith(_TEXT_STEP):
+        return None
+    try:
+        return parse_role_path(role_xpath)
+    except ValueError:
+        return None
+
+
+def _element_text_nodes(element) -> Iterator[str]:
+    """
+    Yields an element's own text() nodes: its text and its children's tails.
+    """
+    if element.text is not None:
+        yield element.text
+    for child in element:
+        if child.tail is not None:
+            yield child.tail
+
+
+def _nested_text_nodes(element, role_ids: set) -> Iterator[str]:
+    """
+    Yields the text() nodes of every role in a subtree in document order
+    (roles nested in roles interleave with their parent's text).
+    """
+    is_role = id(element) in role_ids
+    if is_role and element.text is not None:
+        yield element.text
+    for child in element:
+        yield from _nested_text_nodes(child, role_ids)
+        if is_role and child.tail is not None:
+            yield child.tail
+
+
+def _iter_matched_text(
+    xml_filepath: str,
+    role_path: RolePath,
+    counters: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """
+    Streams the raw text of role matches with etree.iterparse.
+
+    Yields every text() node of each role element (its text and the tails
+    of its children, like XPath) or, for element paths, the element's text.
+    Elements are cleared once processed and finished siblings are removed,
+    so memory stays flat regardless of file size.
+
+    Args:
+        xml_filepath (str): Path to the XML file
+        role_path (RolePath): Roles to select
+        counters (Optional[Dict]): Receives root_tag and total_elements
+    """
+    tags: List[str] = []
+    matched: List[bool] = []
+    # Open role elements (and roles nested in them), in document order
+    pending: List[Any] = []
+    open_matches = 0
+    total_elements = 0
+
+    context = etree.iterparse(
+        xml_filepath,
+        events=("start", "end", "comment", "pi"),
+        recover=True,
+        encoding='utf-8',
+        huge_tree=True
+    )
+    for event, element in context:
+        if event in ("comment", "pi"):
+            # Counted like root.iter() does: only inside the root element
+            total_elements += bool(tags)
+            continue
+
+        if event == "start":
+            if not tags and counters is not None:
+                counters["root_tag"] = element.tag
+            tags.append(element.tag)
+            is_match = role_path.matches(tags)
+            matched.append(is_match)
+            if is_match:
+                open_matches += 1
+                pending.append(element)
+            continue
+
+        total_elements += 1
+        tags.pop()
+        open_matches -= matched.pop()
+        if open_matches:
+            # Inside a role: its children's tails are role text
+            continue
+
+        # Outermost role finished: emit it and nested roles in document order
+        if len(pending) == 1 or not role_path.text:
+            for role_element in pending:
+                if role_path.text:
+                    yield from _element_text_nodes(role_element)
+                else:
+                    yield role_element.text or ""
+        elif pending:
+            yield from _nested_text_nodes(pending[0], {id(e) for e in pending})
+        pending.clear()
+
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+    if counters is not None:
+        counters["total_elements"] = total_elements
+
+
+def iter_roles_from_xml(xml_filepath: str, role_path: str) -> Iterator[str]:
+    """
+    Lazily yields role names from an XML file in one streaming pass.
+
+    Memory use does not grow with file size, so this suits multi-hundred-MB
+    catalogs. Roles are stripped and empty ones skipped, as in
+    extract_roles_from_xml().
+
+    Args:
+        xml_filepath (str): Path to the XML file
+        role_path (str): Tag/path spec (see parse_role_path()),
+                         e.g. '//role/text()' or 'role'
+
+    Yields:
+        str: Role names in document order
+
+    Examples:
+        >>> for role in iter_roles_from_xml('roles.xml', 'role'):
+        ...     print(role)
+    """
+    if not os.path.exists(xml_filepath):
+        print(f"❌ Error: XML file not found at {xml_filepath}")
+        return
+
+    path = parse_role_path(role_path)
+    try:
+        for text in _iter_matched_text(xml_filepath, path):
+            role_text = text.strip()
+            if role_text:
+                yield role_text
+
+    except etree.XMLSyntaxError as e:
+        print(f"❌ XML Syntax Error in file {xml_filepath}: {e}")
+
+
+def _streaming_path(
+    xml_filepath: str,
+    role_xpath: str,
+    streaming: Optional[bool]
+) -> Optional[RolePath]:
+    """
+    Decides whether to stream: explicitly, or automatically for files of
+    at least XML_STREAMING_MIN_BYTES. Returns the RolePath to stream with.
+    """
+    if streaming is False:
+        return None
+
+    path = streamable_role_path(role_xpath)
+    if path is None:
+        if streaming:
+            print(f"⚠️  XPath '{role_xpath}' needs the full tree; streaming disabled")
+        return None
+
+    if streaming is None:
+        min_bytes = get_settings().xml_streaming_min_bytes
+        if min_bytes < 0:
+            return None
+        if os.path.getsize(xml_filepath) < min_bytes:
+            return None
+
+    return path
+
+
+def extract_roles_from_xml(
+    xml_filepath: str,
+    role_xpath: str,
+    streaming: Optional[bool] = None
+) -> List[str]:
     """
     Extracts role names from an XML file using XPath.
 
     This function parses an XML file and extracts text content
     from elements matching the specified XPath expression.
 
+    Large files (XML_STREAMING_MIN_BYTES and up) with a plain element
+    XPath such as '//role/text()' are read with streaming iterparse
+    instead of building the whole tree; the roles are the same.
+
     Args:
         xml_filepath (str): Path to the XML file
         role_xpath (str): XPath expression to locate role elements
                          (e.g., '//role/text()' for <role>Software Engineer</role>)
+        streaming (Optional[bool]): Force streaming on / off (None = by file size)
 
     Returns:
         List[str]: List of extracted role names
@@ -35,24 +369,29 @@ def extract_roles_from_xml(xml_filepath: str, role_xpath: str) -> List[str]:
         return []
 
     try:
-        # Create parser with UTF-8 encoding and recovery mode
-        # Recovery mode helps handle minor XML formatting issues
-        parser = etree.XMLParser(recover=True, encoding='utf-8')
-
-        # Parse the XML file
-        tree = etree.parse(xml_filepath, parser=parser)
-
-        # Apply XPath to extract role text
-        role_elements = tree.xpath(role_xpath)
-
-        # Convert to strings and clean up
-        roles = []
-        for element in role_elements:
-            if element is not None:
-                # Convert to string and strip whitespace
-                role_text = str(element).strip()
-                if role_text:  # Only add non-empty roles
-                    roles.append(role_text)
+        role_path = _streaming_path(xml_filepath, role_xpath, streaming)
+
+        with span("xml.parse", path=xml_filepath,
+                  streaming=role_path is not None) as xml_span:
+            if role_path is not None:
+                # Constant-memory pass, no tree is built
+                roles = [
+                    text.strip()
+                    for text in _iter_matched_text(xml_filepath, role_path)
+                    if text.strip()
+                ]
+            else:
+                # Reused UTF-8 parser in recovery mode
+                # Recovery mode helps handle minor XML formatting issues
+                parser = _get_parser(recover=True)
+
+                # Parse the XML file
+                tree = etree.parse(xml_filepath, parser=parser)
+
+                # Apply the (cached, compiled) XPath and clean up the text
+                roles = _role_texts(compile_xpath(role_xpath)(tree))
+
+            xml_span.count("roles", len(roles))
 
         print(f"✅ Extracted {len(roles)} roles from XML")
 
@@ -88,8 +427,7 @@ def validate_xml_structure(xml_filepath: str) -> bool:
         return False
 
     try:
-        parser = etree.XMLParser(encoding='utf-8')
-        etree.parse(xml_filepath, parser=parser)
+        etree.parse(xml_filepath, parser=_get_parser(recover=False))
         print(f"✅ XML file is well-formed: {xml_filepath}")
         return True
 
@@ -126,26 +464,11 @@ def extract_roles_with_attributes(
         return []
 
     try:
-        parser = etree.XMLParser(recover=True, encoding='utf-8')
-        tree = etree.parse(xml_filepath, parser=parser)
+        tree = etree.parse(xml_filepath, parser=_get_parser(recover=True))
 
         # Get role elements (not text nodes)
-        role_elements = tree.xpath(role_xpath)
-
-        roles_with_attrs = []
-        for element in role_elements:
-            if element is not None:
-                role_data = {
-                    'name': element.text.strip() if element.text else ""
-                }
-
-                # Extract requested attributes
-                if attributes:
-                    for attr in attributes:
-                        role_data[attr] = element.get(attr, "")
-
-                if role_data['name']:  # Only add if name is not empty
-                    roles_with_attrs.append(role_data)
+        roles_with_attrs = _roles_with_attributes(
+            compile_xpath(role_xpath)(tree), attributes)
 
         print(f"✅ Extracted {len(roles_with_attrs)} roles with attributes")
 
@@ -156,13 +479,21 @@ def extract_roles_with_attributes(
         return []
 
 
-def get_xml_statistics(xml_filepath: str, role_xpath: str) -> dict:
+def get_xml_statistics(
+    xml_filepath: str,
+    role_xpath: str,
+    streaming: Optional[bool] = None
+) -> dict:
     """
     Returns statistics about the XML file.
 
+    In streaming mode (see extract_roles_from_xml()) all statistics come
+    from a single constant-memory iterparse pass.
+
     Args:
         xml_filepath (str): Path to the XML file
         role_xpath (str): XPath expression for roles
+        streaming (Optional[bool]): Force streaming on / off (None = by file size)
 
     Returns:
         dict: Dictionary containing XML statistics
@@ -171,15 +502,28 @@ def get_xml_statistics(xml_filepath: str, role_xpath: str) -> dict:
         return {"error": "File not found"}
 
     try:
-        parser = etree.XMLParser(recover=True, encoding='utf-8')
-        tree = etree.parse(xml_filepath, parser=parser)
+        role_path = _streaming_path(xml_filepath, role_xpath, streaming)
+        if role_path is not None:
+            counters: Dict[str, Any] = {}
+            total_roles = sum(
+                1 for _ in _iter_matched_text(xml_filepath, role_path, counters))
+            return {
+                "root_tag": counters.get("root_tag"),
+                "total_elements": counters.get("total_elements", 0),
+                "total_roles": total_roles,
+                "file_size_bytes": os.path.getsize(xml_filepath),
+                "file_path": xml_filepath
+            }
+
+        tree = etree.parse(xml_filepath, parser=_get_parser(recover=True))
         root = tree.getroot()
 
-        roles = tree.xpath(role_xpath)
+        roles = compile_xpath(role_xpath)(tree)
 
         stats = {
             "root_tag": root.tag,
-            "total_elements": len(list(root.iter())),
+            # Count without materializing a list of every element
+            "total_elements": sum(1 for _ in root.iter()),
             "total_roles": len(roles),
             "file_size_bytes": os.path.getsize(xml_filepath),
             "file_path": xml_filepath
@@ -189,3 +533,185 @@ def get_xml_statistics(xml_filepath: str, role_xpath: str) -> dict:
 
     except Exception as e:
         return {"error": str(e)}
+
+
+class XmlRoleSource:
+    """
+    One XML catalog parsed once and queried many times.
+
+    The file is parsed on first use with a recovering parser; its error
+    log doubles as the well-formedness check, so roles, attributes,
+    validation status and statistics all come from that single parse.
+    XPath expressions are compiled once, and role lists are memoized per
+    expression. The parse is reused while the file's mtime and size are
+    unchanged; if they change, the content hash decides whether to
+    re-parse (a touched but identical file keeps its parse).
+
+    For multi-hundred-MB catalogs read once, use iter_roles_from_xml()
+    instead, which never holds the tree.
+    """
+
+    def __init__(self, xml_filepath: str):
+        """
+        Args:
+            xml_filepath (str): Path to the XML file
+        """
+        self.xml_filepath = xml_filepath
+        self.parse_count = 0
+        self._lock = threading.RLock()
+        self._stat: Optional[Tuple[int, int]] = None
+        self._content_hash: Optional[str] = None
+        self._tree = None
+        self._errors: List[str] = []
+        self._xpaths: Dict[str, etree.XPath] = {}
+        self._roles: Dict[str, List[str]] = {}
+        self._total_elements: Optional[int] = None
+
+    def _file_stat(self) -> Tuple[int, int]:
+        stat = os.stat(self.xml_filepath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-parses the file if it changed since the last parse.
+
+        Args:
+            force (bool): Re-parse even if the file is unchanged
+
+        Returns:
+            bool: True if the file was (re-)parsed
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        with self._lock:
+            stat = self._file_stat()
+            if not force and self._stat is not None and stat == self._stat:
+                return False
+
+            # mtime / size changed: only re-parse if the content did
+            content_hash = compute_file_hash(self.xml_filepath)
+            if not force and content_hash == self._content_hash:
+                self._stat = stat
+                return False
+
+            self._parse(stat, content_hash)
+            return True
+
+    def _parse(self, stat: Tuple[int, int], content_hash: str) -> None:
+        parser = _get_parser(recover=True)
+        with span("xml.parse", path=self.xml_filepath, source=True):
+            try:
+                tree = etree.parse(self.xml_filepath, parser=parser)
+                errors = [str(error) for error in parser.error_log
+                          if error.level >= etree.ErrorLevels.ERROR]
+            except etree.XMLSyntaxError as e:
+                tree, errors = None, [str(e)]
+
+        if tree is not None and tree.getroot() is None:
+            tree = None
+            errors = errors or ["Document is empty"]
+
+        self._tree = tree
+        self._errors = errors
+        self._stat = stat
+        self._content_hash = content_hash
+        self._roles.clear()
+        self._total_elements = None
+        self.parse_count += 1
+
+    def _xpath(self, expression: str) -> etree.XPath:
+        xpath = self._xpaths.get(expression)
+        if xpath is None:
+            xpath = self._xpaths[expression] = etree.XPath(expression)
+        return xpath
+
+    def _evaluate(self, expression: str) -> list:
+        if self._tree is None:
+            return []
+        return self._xpath(expression)(self._tree)
+
+    @property
+    def content_hash(self) -> str:
+        """
+        SHA-256 of the parsed file content.
+        """
+        with self._lock:
+            self.refresh()
+            return self._content_hash
+
+    def roles(self, role_xpath: str) -> List[str]:
+        """
+        Returns role names, like extract_roles_from_xml().
+
+        Args:
+            role_xpath (str): XPath expression (e.g. '//role/text()')
+
+        Returns:
+            List[str]: Stripped, non-empty role names (a copy)
+        """
+        with self._lock:
+            self.refresh()
+            roles = self._roles.get(role_xpath)
+            if roles is None:
+                roles = self._roles[role_xpath] = _role_texts(self._evaluate(role_xpath))
+            return list(roles)
+
+    def roles_with_attributes(self, role_xpath: str, attributes: List[str]) -> List[dict]:
+        """
+        Returns roles with attributes, like extract_roles_with_attributes().
+
+        Args:
+            role_xpath (str): XPath to locate role elements (not text())
+            attributes (List[str]): Attribute names to extract
+
+        Returns:
+            List[dict]: Role name and requested attributes per role element
+        """
+        with self._lock:
+            self.refresh()
+            return _roles_with_attributes(self._evaluate(role_xpath), attributes)
+
+    def is_well_formed(self) -> bool:
+        """
+        Returns whether the file is well-formed (see validate_xml_structure()).
+        """
+        with self._lock:
+            self.refresh()
+            return not self._errors
+
+    @property
+    def errors(self) -> List[str]:
+        """
+        Parser errors of the last parse (empty if well-formed).
+        """
+        with self._lock:
+            self.refresh()
+            return list(self._errors)
+
+    def statistics(self, role_xpath: str) -> dict:
+        """
+        Returns the same statistics as get_xml_statistics().
+
+        Args:
+            role_xpath (str): XPath expression for roles
+
+        Returns:
+            dict: Root tag, element / role counts, file size and path
+        """
+        with self._lock:
+            self.refresh()
+            if self._tree is None:
+                return {"error": self._errors[0] if self._errors else "Parse failed"}
+
+            root = self._tree.getroot()
+            if self._total_elements is None:
+                self._total_elements = sum(1 for _ in root.iter())
+
+            return {
+                "root_tag": root.tag,
+                "total_elements": self._total_elements,
+                "total_roles": len(self._evaluate(role_xpath)),
+                "file_size_bytes": self._stat[1],
+                "file_path": self.xml_filepath
+            }
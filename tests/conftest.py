@@ -0,0 +1,88 @@
+# tests/conftest.py
+"""
+Shared test setup.
+
+Settings are read from the environment on first use, so every cache and
+store is pointed at a throwaway directory before any src module is
+imported, and no test can reach OpenAI or the real caches.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+_STATE_DIR = tempfile.mkdtemp(prefix="role-validator-tests-")
+
+os.environ.update({
+    "OPENAI_API_KEY": "test-key",
+    "CHROMA_PERSIST_DIR": os.path.join(_STATE_DIR, "chroma"),
+    "EXTRACTION_CACHE_DIR": os.path.join(_STATE_DIR, "extractions"),
+    "EMBEDDING_CACHE_PATH": os.path.join(_STATE_DIR, "embeddings.sqlite3"),
+    "LLM_CACHE_ENABLED": "false",
+    "VALIDATION_CACHE_PATH": os.path.join(_STATE_DIR, "validations.sqlite3"),
+    "PDF_EXTRACTION_WORKERS": "1",
+})
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    Returns a factory writing a one-page PDF with the given text.
+    """
+    import fitz  # PyMuPDF
+
+    def _make_pdf(text: str, name: str = "document.pdf") -> str:
+        path = str(tmp_path / name)
+        document = fitz.open()
+        page = document.new_page()
+        page.insert_text((72, 72), text)
+        document.save(path)
+        document.close()
+        return path
+
+    return _make_pdf
+
+
+@pytest.fixture
+def make_xml(tmp_path):
+    """
+    Returns a factory writing a role catalog XML for the given roles.
+    """
+    from xml.sax.saxutils import escape
+
+    def _make_xml(roles, name: str = "roles.xml") -> str:
+        path = tmp_path / name
+        body = "".join(f"<role>{escape(role)}</role>" for role in roles)
+        path.write_text(f"<roles>{body}</roles>", encoding="utf-8")
+        return str(path)
+
+    return _make_xml
+
+
+@pytest.fixture
+def make_client():
+    """
+    Returns a factory building a LangChainClient around a fake chat model.
+
+    The model answers with the given responses (or pass llm= to use
+    another model). Unless overridden, embeddings are a placeholder and
+    the response cache is off; other keyword arguments go to
+    LangChainClient.
+    """
+    from langchain_core.language_models import FakeListChatModel
+    from src.langchain_client import LangChainClient
+
+    def _make_client(*responses: str, llm=None, **kwargs):
+        if llm is None:
+            llm = FakeListChatModel(responses=list(responses) or ["None"])
+        kwargs.setdefault("embeddings", object())
+        kwargs.setdefault("use_response_cache", False)
+        return LangChainClient(llm=llm, **kwargs)
+
+    return _make_client
@@ -0,0 +1,42 @@
+# tests/test_catalog_artifact.py
+"""
+Tests for compiled catalog artifacts.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import src.catalog_artifact as catalog_artifact
+from src.catalog_artifact import compile_catalog, load_catalog
+
+ROLES = [f"Role {i} Engineer" for i in range(200)]
+
+
+def test_concurrent_compiles_leave_one_valid_artifact(tmp_path, make_xml):
+    xml_path = make_xml(ROLES)
+    output_path = str(tmp_path / "catalog.bin")
+    # A leftover from an interrupted run must not be reused or clobbered
+    (tmp_path / "catalog.bin.tmp").write_bytes(b"stale")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        headers = list(executor.map(
+            lambda _: compile_catalog(xml_path, output_path), range(8)))
+
+    assert all(header["role_count"] == len(ROLES) for header in headers)
+    assert load_catalog(output_path, xml_path).index.roles == ROLES
+    assert sorted(os.listdir(tmp_path)) == ["catalog.bin", "catalog.bin.tmp", "roles.xml"]
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, make_xml, monkeypatch):
+    xml_path = make_xml(ROLES)
+
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(catalog_artifact.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        compile_catalog(xml_path, str(tmp_path / "catalog.bin"))
+
+    assert os.listdir(tmp_path) == ["roles.xml"]
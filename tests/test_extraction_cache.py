@@ -0,0 +1,23 @@
+# tests/test_extraction_cache.py
+"""
+Tests for the on-disk extraction cache.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.extraction_cache import ExtractionCache, ExtractedDocument, ExtractedPage
+
+
+def test_concurrent_puts_of_one_document_leave_a_valid_entry(tmp_path, capsys):
+    cache = ExtractionCache(str(tmp_path), max_bytes=1024 * 1024 * 1024)
+    document = ExtractedDocument(
+        pdf_hash="a" * 64, source="doc.pdf",
+        pages=[ExtractedPage(i, [f"Page {i} text. " * 200]) for i in range(50)])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: cache.put(document), range(32)))
+
+    assert "Could not write" not in capsys.readouterr().out
+    assert os.listdir(tmp_path) == [f"{document.pdf_hash}.json"]
+    assert cache.get(document.pdf_hash) == document
@@ -0,0 +1,60 @@
+# tests/test_gazetteer.py
+"""
+Tests for gazetteer (catalog automaton) role extraction.
+"""
+
+import pytest
+
+from src.gazetteer import RoleGazetteer
+
+
+def test_finds_catalog_roles_and_variants_leftmost_longest():
+    gazetteer = RoleGazetteer(["Software Engineer", "Project Manager", "Manager",
+                               "Senior Developer"])
+    scan = gazetteer.scan("A Sr. Developer and a Software Eng. report to the Project Mgr.")
+
+    assert scan.roles == ["Senior Developer", "Software Engineer", "Project Manager"]
+    assert scan.fully_covered
+
+
+def test_uncovered_title_words_prevent_full_coverage():
+    gazetteer = RoleGazetteer(["Software Engineer"])
+    scan = gazetteer.scan("The Software Engineer works with a UX Designer.")
+
+    assert scan.roles == ["Software Engineer"]
+    assert scan.uncovered_mentions == ["Designer"]
+    assert not scan.fully_covered
+
+
+@pytest.mark.parametrize("roles, text", [
+    (["Technician"], "Please contact the tech team about it."),
+    (["Director"], "Files are stored in the dir listed below."),
+    (["Information Technology Manager"], "Make it manager-approved before release."),
+    (["Developer"], "The dev environment is reset nightly."),
+    (["Administrator"], "Ask an admin for access."),
+])
+def test_common_words_are_not_role_mentions(roles, text):
+    scan = RoleGazetteer(roles).scan(text)
+
+    assert scan.roles == []
+    assert not scan.fully_covered
+
+
+def test_catalog_role_with_comma_is_matched_whole():
+    scan = RoleGazetteer(["Director, Sales"]).scan("Reports go to the Director, Sales.")
+
+    assert scan.roles == ["Director, Sales"]
+
+
+def test_merge_policy_keeps_catalog_role_with_comma(make_pdf, make_client):
+    from src.pdf_extractor_rag import RAGPDFExtractor
+    from src.role_catalog import RoleCatalogIndex
+
+    extractor = RAGPDFExtractor(langchain_client=make_client("Sales Lead"),
+                                role_extraction_policy="merge")
+    catalog = RoleCatalogIndex(["Director, Sales", "Sales Lead"])
+    pdf_path = make_pdf("The Director, Sales approves quotes from the Sales Lead.")
+
+    roles = extractor.extract_roles_from_pdf(pdf_path, catalog=catalog)
+
+    assert roles == ["Sales Lead", "Director, Sales"]
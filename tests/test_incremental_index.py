@@ -0,0 +1,107 @@
+# tests/test_incremental_index.py
+"""
+Tests for incremental (page hash based) PDF indexing.
+"""
+
+import uuid
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.extraction_cache import ExtractedPage
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.vectorstore_client import VectorStoreClient
+
+PAGES = [
+    ExtractedPage(1, ["Alpha sentence one. Alpha sentence two. Alpha sentence three."]),
+    ExtractedPage(2, ["Beta sentence one. Beta sentence two. Beta sentence three."]),
+]
+
+
+@pytest.fixture
+def extractor(make_client, monkeypatch):
+    embeddings = DeterministicFakeEmbedding(size=8)
+    extractor = RAGPDFExtractor(index_batch_size=2,
+                                langchain_client=make_client(embeddings=embeddings))
+    extractor._vectorstore_client = VectorStoreClient(embeddings)
+    # Several chunks per page, so a page spans more than one batch
+    extractor.text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=25, chunk_overlap=0, separators=[". ", " "])
+    monkeypatch.setattr(extractor, "_iter_pages", lambda pdf_path, streaming: iter(PAGES))
+    return extractor
+
+
+def _stored_chunk_count(extractor, pdf_id):
+    return len(extractor.vectorstore_client.get_documents_by_pdf_id(pdf_id))
+
+
+def test_partially_written_page_is_reindexed(extractor, monkeypatch):
+    pdf_id = f"pdf-{uuid.uuid4().hex}"
+    client = extractor.vectorstore_client
+    add_documents = client.add_documents
+    calls = []
+
+    def flaky_add_documents(*args, **kwargs):
+        calls.append(1)
+        # The second batch (end of page 1 / start of page 2) is lost
+        return [] if len(calls) == 2 else add_documents(*args, **kwargs)
+
+    monkeypatch.setattr(client, "add_documents", flaky_add_documents)
+    assert not extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+
+    # No page was recorded as indexed, so none can be mistaken for unchanged
+    stored = client.get_page_hashes(pdf_id)
+    assert stored and all(page_hash == "" for page_hash in stored.values())
+
+    monkeypatch.setattr(client, "add_documents", add_documents)
+    assert extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+    assert client.get_page_hashes(pdf_id) == {
+        page.page_number: page.content_hash for page in PAGES}
+
+    chunk_count = _stored_chunk_count(extractor, pdf_id)
+    chunks = list(extractor._iter_chunks(PAGES))
+    assert chunk_count == len(chunks)
+
+
+def test_failed_hash_lookup_keeps_existing_index(extractor, monkeypatch):
+    pdf_id = f"pdf-{uuid.uuid4().hex}"
+    client = extractor.vectorstore_client
+    assert extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+    chunk_count = _stored_chunk_count(extractor, pdf_id)
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("vector store unavailable")
+
+    monkeypatch.setattr(client.vectorstore, "get", unavailable)
+    assert not extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+
+    monkeypatch.undo()
+    assert _stored_chunk_count(extractor, pdf_id) == chunk_count
+
+
+def test_unchanged_pages_are_not_reembedded(extractor, monkeypatch):
+    pdf_id = f"pdf-{uuid.uuid4().hex}"
+    client = extractor.vectorstore_client
+    assert extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+
+    added = []
+    add_documents = client.add_documents
+    monkeypatch.setattr(client, "add_documents",
+                        lambda texts, **kwargs: added.extend(texts) or add_documents(texts, **kwargs))
+    assert extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+    assert added == []
+
+
+def test_failed_extraction_keeps_existing_index(extractor, monkeypatch):
+    pdf_id = f"pdf-{uuid.uuid4().hex}"
+    assert extractor.process_pdf("doc.pdf", pdf_id, incremental=True)
+    chunk_count = _stored_chunk_count(extractor, pdf_id)
+
+    # A corrupt PDF or a transient parse error yields no document
+    monkeypatch.setattr(extractor, "_iter_pages", RAGPDFExtractor._iter_pages.__get__(extractor))
+    monkeypatch.setattr(extractor, "extract_document", lambda pdf_path: None)
+    assert not extractor.process_pdf("doc.pdf", pdf_id, streaming=False, incremental=True)
+
+    assert chunk_count > 0
+    assert _stored_chunk_count(extractor, pdf_id) == chunk_count
@@ -0,0 +1,158 @@
+# tests/test_llm_concurrency.py
+"""
+Tests that concurrent LLM calls overlap and respect the concurrency limit.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Any
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.messages import AIMessage
+from pydantic import PrivateAttr
+
+from src.pdf_extractor_rag import RAGPDFExtractor
+
+DELAY = 0.1
+CALLS = 8
+LIMIT = 2
+
+
+class SlowChatModel(FakeListChatModel):
+    """
+    Fake chat model with a fixed latency that records peak concurrency.
+    """
+    delay: float = DELAY
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _in_flight: int = PrivateAttr(default=0)
+    max_in_flight: int = 0
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _call(self, *args: Any, **kwargs: Any) -> str:
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            return self.responses[0]
+        finally:
+            self._exit()
+
+    async def _agenerate(self, *args: Any, **kwargs: Any) -> ChatResult:
+        self._enter()
+        try:
+            await asyncio.sleep(self.delay)
+            return ChatResult(generations=[
+                ChatGeneration(message=AIMessage(content=self.responses[0]))])
+        finally:
+            self._exit()
+
+
+@pytest.fixture
+def slow_model():
+    return SlowChatModel(responses=["Software Engineer, Project Manager"])
+
+
+@pytest.fixture
+def client(make_client, slow_model):
+    return make_client(llm=slow_model, max_concurrency=LIMIT)
+
+
+def _assert_overlapped(slow_model, elapsed):
+    assert slow_model.max_in_flight == LIMIT
+    # Sequential calls would take CALLS * DELAY
+    assert elapsed < CALLS * DELAY * 0.75
+
+
+def test_async_chunk_calls_overlap_within_limit(client, slow_model):
+    started = time.perf_counter()
+    results = asyncio.run(client.aextract_roles_from_chunks([f"chunk {i}" for i in range(CALLS)]))
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == CALLS
+    _assert_overlapped(slow_model, elapsed)
+
+
+def test_sync_chunk_calls_overlap_within_limit(client, slow_model):
+    started = time.perf_counter()
+    results = client.extract_roles_from_chunks([f"chunk {i}" for i in range(CALLS)])
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == CALLS
+    _assert_overlapped(slow_model, elapsed)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_map_reduce_extraction_overlaps_within_limit(client, slow_model, make_pdf, use_async):
+    pdf_path = make_pdf("The Software Engineer reports to the Project Manager.")
+    extractor = RAGPDFExtractor(role_extraction_mode="map_reduce", langchain_client=client)
+    chunks = [f"Chunk {i} mentions a Software Engineer." for i in range(CALLS)]
+
+    started = time.perf_counter()
+    if use_async:
+        roles = asyncio.run(extractor.aextract_roles_from_pdf(pdf_path, chunks=chunks))
+    else:
+        roles = extractor.extract_roles_from_pdf(pdf_path, chunks=chunks)
+    elapsed = time.perf_counter() - started
+
+    assert roles == ["Software Engineer", "Project Manager"]
+    _assert_overlapped(slow_model, elapsed)
+
+
+class _ThreadRecordingCache:
+    """Response cache that records which thread each call runs on."""
+
+    def __init__(self):
+        self.threads = []
+
+    def get(self, model, temperature, prompt):
+        self.threads.append(threading.get_ident())
+        return None
+
+    def put(self, model, temperature, prompt, response):
+        self.threads.append(threading.get_ident())
+
+
+def test_async_response_cache_calls_run_off_the_event_loop(make_client):
+    cache = _ThreadRecordingCache()
+    client = make_client("Data Scientist", use_response_cache=True, response_cache=cache)
+
+    loop_threads = []
+
+    async def extract():
+        loop_threads.append(threading.get_ident())
+        return await client.aextract_roles_from_text("A Data Scientist joins.")
+
+    assert asyncio.run(extract()) == "Data Scientist"
+    assert len(cache.threads) == 2
+    assert loop_threads[0] not in cache.threads
+
+
+def test_cancelled_chunk_extraction_skips_remaining_calls(make_client):
+    cancelled = threading.Event()
+    prompts = []
+
+    class _CancellingModel:
+        model_name = "cancelling"
+
+        def invoke(self, messages):
+            prompts.append(messages[0].content)
+            cancelled.set()
+            return AIMessage(content="Data Scientist")
+
+    client = make_client(llm=_CancellingModel())
+
+    with pytest.raises(CancelledError):
+        client.extract_roles_from_chunks(["one", "two", "three"], max_workers=1,
+                                         cancelled=cancelled)
+    assert len(prompts) == 1
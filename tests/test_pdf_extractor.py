@@ -0,0 +1,62 @@
+# tests/test_pdf_extractor.py
+"""
+Tests for PDF extraction reuse across indexing and role extraction.
+"""
+
+import asyncio
+
+import pytest
+
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.role_catalog import RoleCatalogIndex
+
+
+@pytest.fixture
+def make_extractor(make_client):
+    def _make_extractor(**kwargs) -> RAGPDFExtractor:
+        return RAGPDFExtractor(langchain_client=make_client("Data Scientist"), **kwargs)
+    return _make_extractor
+
+
+def _fail_parse(pdf_path, pdf_hash):
+    raise AssertionError("PDF parsed again")
+
+
+@pytest.mark.parametrize("keep_documents", [True, False])
+def test_streamed_pages_are_reused_for_role_extraction(make_pdf, make_extractor, monkeypatch,
+                                                       keep_documents):
+    pdf_path = make_pdf(f"A Data Scientist joins the team. keep={keep_documents}")
+    extractor = make_extractor(keep_documents=keep_documents)
+
+    pages = list(extractor._iter_pages(pdf_path, streaming=True))
+
+    # Served from memory, or from the disk cache when documents are not kept
+    monkeypatch.setattr(extractor, "_parse_pdf", _fail_parse)
+    document = extractor.extract_document(pdf_path)
+    assert document is not None and document.pages == pages
+    assert extractor.extract_roles_from_pdf(pdf_path) == ["Data Scientist"]
+
+
+def test_interrupted_stream_is_not_cached(make_pdf, make_extractor):
+    pdf_path = make_pdf("A Project Manager leads the rollout.", name="interrupted.pdf")
+    extractor = make_extractor()
+
+    stream = extractor._iter_pages(pdf_path, streaming=True)
+    next(stream)
+    stream.close()
+
+    assert extractor._documents == {}
+
+
+@pytest.mark.parametrize("mode", ["single", "map_reduce"])
+@pytest.mark.parametrize("policy", ["llm", "gazetteer", "merge"])
+def test_async_extraction_matches_sync(make_pdf, make_extractor, mode, policy):
+    pdf_path = make_pdf("The Project Manager works with a Data Scientist.")
+    catalog = RoleCatalogIndex(["Project Manager"])
+    extractor = make_extractor(role_extraction_mode=mode, role_extraction_policy=policy)
+
+    sync_roles = extractor.extract_roles_from_pdf(pdf_path, catalog=catalog)
+    async_roles = asyncio.run(extractor.aextract_roles_from_pdf(pdf_path, catalog=catalog))
+
+    assert sync_roles == async_roles
+    assert sync_roles
@@ -0,0 +1,79 @@
+# tests/test_pipeline.py
+"""
+Tests for the concurrent single-document validation pipeline.
+"""
+
+import time
+
+import pytest
+
+import src.pipeline as pipeline
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.role_catalog import RoleCatalogIndex
+
+
+@pytest.fixture
+def extractor(make_client):
+    return RAGPDFExtractor(langchain_client=make_client("Software Engineer"))
+
+
+@pytest.fixture
+def llm_calls(extractor, monkeypatch):
+    """
+    Replaces the LLM call with a slow one and records when calls start.
+    """
+    calls = []
+
+    def extract_roles_from_text(text):
+        calls.append(time.perf_counter())
+        time.sleep(1.0)
+        return "Software Engineer"
+
+    monkeypatch.setattr(extractor.langchain_client, "extract_roles_from_text",
+                        extract_roles_from_text)
+    return calls
+
+
+def test_xml_error_is_an_error_result(make_pdf, make_xml, extractor, llm_calls, monkeypatch):
+    def broken_catalog(xml_filepath, xml_role_xpath):
+        time.sleep(0.05)
+        raise ValueError("unreadable catalog")
+
+    # The PDF is still being parsed when the XML stage fails
+    extract_document = extractor.extract_document
+    monkeypatch.setattr(extractor, "extract_document",
+                        lambda pdf_path: time.sleep(0.2) or extract_document(pdf_path))
+    monkeypatch.setattr(pipeline, "_parse_catalog", broken_catalog)
+
+    started = time.perf_counter()
+    result, indexing = pipeline.validate_concurrently(
+        make_xml(["Software Engineer"]), make_pdf("Software Engineer"),
+        pdf_extractor=extractor)
+    elapsed = time.perf_counter() - started
+
+    assert result["status"] == "error"
+    assert "unreadable catalog" in result["error"]
+    assert result["xml_roles"] == []
+    assert indexing is None
+    assert elapsed < 0.2
+
+    # Once the PDF is parsed, the cancelled stage makes no LLM call
+    time.sleep(0.4)
+    assert llm_calls == []
+
+
+def test_empty_catalog_does_not_wait_for_running_extraction(make_pdf, make_xml, extractor,
+                                                            llm_calls, monkeypatch):
+    # The LLM call is already in flight when the catalog turns out empty
+    monkeypatch.setattr(pipeline, "_parse_catalog",
+                        lambda *args: time.sleep(0.2) or RoleCatalogIndex([]))
+
+    started = time.perf_counter()
+    result, _ = pipeline.validate_concurrently(
+        make_xml([]), make_pdf("Software Engineer"), pdf_extractor=extractor)
+    elapsed = time.perf_counter() - started
+
+    assert result["status"] == "error"
+    assert result["xml_roles"] == []
+    assert len(llm_calls) == 1
+    assert elapsed < 0.8
@@ -0,0 +1,123 @@
+# tests/test_role_matching.py
+"""
+Property tests: n-gram blocking gives the same matches as exhaustive scoring,
+and classifying precomputed scores gives the same matches as compare_roles.
+
+Catalogs and PDF roles are generated from a seeded random generator, so
+failures are reproducible; PDF roles are near misses of catalog roles
+(typos, truncations, dropped words) mixed with unrelated strings.
+"""
+
+import random
+import string
+
+import pytest
+
+from src.role_catalog import RoleCatalogIndex
+from src.role_comparer import RoleComparer
+from src.role_matcher import compute_score_matrices
+
+WORDS = ["Senior", "Junior", "Lead", "Software", "Data", "Project", "Product",
+         "Quality", "Assurance", "Engineer", "Manager", "Analyst", "Developer",
+         "Architect", "Designer", "Scientist", "Officer", "Director", "Sales",
+         "Security", "Cloud", "Network", "Support", "Specialist", "of", "&"]
+
+THRESHOLDS = [50, 70, 80, 90, 100]
+
+
+def _random_role(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def _mutate(rng: random.Random, role: str) -> str:
+    chars = list(role)
+    for _ in range(rng.randint(0, 3)):
+        position = rng.randrange(len(chars) + 1)
+        edit = rng.choice(["insert", "delete", "substitute"])
+        if edit == "insert" or not chars:
+            chars.insert(position, rng.choice(string.ascii_letters + " ."))
+        elif edit == "delete":
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice(string.ascii_lowercase)
+    mutated = "".join(chars)
+
+    shape = rng.random()
+    if shape < 0.2:
+        mutated = mutated[:rng.randint(1, max(1, len(mutated)))]
+    elif shape < 0.35:
+        mutated = " ".join(mutated.split()[:-1]) or mutated
+    elif shape < 0.45:
+        mutated = mutated.upper()
+    return mutated
+
+
+def _random_case(seed: int):
+    rng = random.Random(seed)
+    catalog = list(dict.fromkeys(_random_role(rng) for _ in range(rng.randint(5, 60))))
+    pdf_roles = [
+        _mutate(rng, rng.choice(catalog)) if rng.random() < 0.7
+        else "".join(rng.choice(string.ascii_letters + " ") for _ in range(rng.randint(0, 25)))
+        for _ in range(rng.randint(1, 25))
+    ]
+    return catalog, pdf_roles
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_candidates_include_every_match_above_threshold(seed):
+    catalog, pdf_roles = _random_case(seed)
+    index = RoleCatalogIndex(catalog)
+    ratio_scores, partial_scores = compute_score_matrices(pdf_roles, catalog)
+
+    for threshold in THRESHOLDS:
+        for row, query in enumerate(pdf_roles):
+            candidates = set(index.candidates(query, threshold))
+            matching = {
+                column for column in range(len(catalog))
+                if max(ratio_scores[row, column], partial_scores[row, column]) >= threshold
+            }
+            assert matching <= candidates, (query, threshold, matching - candidates)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_compare_roles_is_identical_with_and_without_blocking(seed):
+    catalog, pdf_roles = _random_case(seed)
+
+    for threshold in THRESHOLDS:
+        blocked = RoleComparer(threshold, blocking_min_roles=0)
+        exhaustive = RoleComparer(threshold, blocking_min_roles=len(catalog) + 1)
+
+        assert blocked.compare_roles(catalog, pdf_roles) == \
+            exhaustive.compare_roles(catalog, pdf_roles)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_classify_matches_compare_roles_at_every_threshold(seed):
+    catalog, pdf_roles = _random_case(seed)
+    comparer = RoleComparer()
+    scores = comparer.score_roles(catalog, pdf_roles)
+
+    # Every score that occurs is a boundary; check it and its neighbors
+    occurring = set(scores.ratio_scores.flatten()) | set(scores.partial_scores.flatten())
+    thresholds = sorted({t for score in occurring for t in (score - 1, score, score + 1)
+                         if 1 <= t <= 100} | set(THRESHOLDS))
+
+    for threshold in thresholds:
+        expected = RoleComparer(threshold).compare_roles(catalog, pdf_roles)
+        assert comparer.classify(scores, threshold) == expected, threshold
+
+
+def test_classify_at_exact_boundary_score():
+    catalog = ["Project Manager"]
+    pdf_roles = ["Project Managar"]
+    comparer = RoleComparer()
+    scores = comparer.score_roles(catalog, pdf_roles)
+    boundary = int(scores.ratio_scores[0, 0])
+
+    matched = comparer.classify(scores, boundary)
+    assert matched == RoleComparer(boundary).compare_roles(catalog, pdf_roles)
+    assert matched[3] == {"Project Managar": "Project Manager"}
+
+    missed = comparer.classify(scores, boundary + 1)
+    assert missed == RoleComparer(boundary + 1).compare_roles(catalog, pdf_roles)
+    assert missed[2] == ["Project Managar"]
@@ -0,0 +1,58 @@
+# tests/test_span_filter.py
+"""
+Tests for the candidate-span pre-filter.
+"""
+
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.span_filter import select_spans
+
+VOCABULARY = frozenset({"software", "engineer", "project", "manager"})
+FILLER = "Invoices are payable within thirty days of receipt. " * 30
+TABLE = ("\n--- TABLE: ROLES AND INFORMATION ---\n"
+         "Name | Role\nAnna | Software Engineer\nBob | Remote\nCarl | Project Manager\n"
+         "--- END OF TABLE ---\n")
+
+
+def test_kept_table_rows_stay_inside_their_markers():
+    text = FILLER + TABLE + FILLER + "\nThe Data Scientist reports weekly."
+    selection = select_spans(text, 300, VOCABULARY, neighbors=0)
+
+    assert selection.text == (
+        "--- TABLE: ROLES AND INFORMATION ---\n"
+        "Anna | Software Engineer\n"
+        "Carl | Project Manager\n"
+        "--- END OF TABLE ---\n"
+        "\n"
+        "The Data Scientist reports weekly."
+    )
+    assert len(selection.text) <= 300
+
+
+def test_separate_tables_keep_separate_markers():
+    text = FILLER + TABLE + "A Scrum Master joins.\n" + TABLE.replace("ROLES", "STAFF")
+    selection = select_spans(text, 400, VOCABULARY, neighbors=0)
+
+    assert selection.text.count("--- TABLE: ROLES AND INFORMATION ---") == 1
+    assert selection.text.count("--- TABLE: STAFF AND INFORMATION ---") == 1
+    assert selection.text.count("--- END OF TABLE ---") == 2
+    assert len(selection.text) <= 400
+
+
+def test_caller_chunks_are_span_filtered(make_pdf, make_client, monkeypatch):
+    client = make_client("Software Engineer")
+    extractor = RAGPDFExtractor(role_extraction_mode="map_reduce", langchain_client=client,
+                                span_filter_enabled=True)
+    extractor.span_filter_budget = 200
+
+    sent = []
+    monkeypatch.setattr(client, "extract_roles_from_chunks",
+                        lambda chunks, **kwargs: sent.extend(chunks) or ["Software Engineer"] * len(chunks))
+
+    chunks = [FILLER + "Our Software Engineer joins in May.", FILLER]
+    roles = extractor.extract_roles_from_pdf(make_pdf("Software Engineer"), chunks=chunks)
+
+    assert roles == ["Software Engineer"]
+    # The filler-only chunk has no candidate span and is not sent
+    assert len(sent) == 1
+    assert "Our Software Engineer joins in May." in sent[0]
+    assert len(sent[0]) <= 200
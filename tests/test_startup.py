@@ -0,0 +1,46 @@
+# tests/test_startup.py
+"""
+Import-time regression tests: the CLI entry points must not load the
+LLM / vector store / PDF stack or read settings until a command needs it.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Module name prefixes that must not be imported eagerly
+HEAVY_PREFIXES = ("langchain", "chromadb", "fitz", "pymupdf")
+
+# Seconds allowed for the imports themselves (interpreter startup excluded)
+IMPORT_BUDGET = 1.0
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = sorted(name for name in sys.modules if name.split(".")[0].startswith({prefixes!r}))
+from config.config import get_settings
+settings_read = get_settings.cache_info().currsize > 0 or "dotenv" in sys.modules
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy, "settings_read": settings_read}}))
+"""
+
+
+@pytest.mark.parametrize("module", ["config.config", "src.main"])
+def test_import_is_light_and_fast(module):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, prefixes=HEAVY_PREFIXES)],
+        cwd=PROJECT_ROOT, env=dict(os.environ), check=True,
+        capture_output=True, text=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["heavy"] == []
+    assert result["settings_read"] is False
+    assert result["elapsed"] < IMPORT_BUDGET
@@ -0,0 +1,22 @@
+# tests/test_utils.py
+"""
+Tests for the text and role-list helpers.
+"""
+
+from src.utils import merge_role_lists, clean_extracted_roles
+
+
+def test_merge_role_lists_dedupes_case_insensitively_in_order():
+    assert merge_role_lists([["Engineer", "Manager"], ["manager", "Analyst"]]) == \
+        ["Engineer", "Manager", "Analyst"]
+
+
+def test_merge_role_lists_keeps_clean_roles_intact():
+    roles = ["3D Artist", ".NET Developer", "2nd Line Support", "Director, Sales"]
+    assert merge_role_lists([roles, ["3d artist"]]) == roles
+
+
+def test_merge_of_cleaned_chunks_matches_single_response():
+    chunks = ["- Software Engineer\n- Project Manager", "software engineer, QA Tester"]
+    merged = merge_role_lists(clean_extracted_roles(chunk) for chunk in chunks)
+    assert merged == ["Software Engineer", "Project Manager", "QA Tester"]
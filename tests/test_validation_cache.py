@@ -0,0 +1,74 @@
+# tests/test_validation_cache.py
+"""
+Tests for the whole-result validation cache.
+"""
+
+from src.pdf_extractor_rag import RAGPDFExtractor
+from src.pipeline import validate_pdf
+from src.role_catalog import RoleCatalogIndex
+from src.role_comparer import RoleComparer
+from src.validation_cache import ValidationResultCache, extraction_settings_hash
+
+
+class _RateLimitedModel:
+    """Chat model whose calls fail, like an API answering 429."""
+
+    model_name = "rate-limited"
+
+    def invoke(self, messages):
+        raise RuntimeError("429 Too Many Requests")
+
+
+def test_failed_llm_call_is_an_error_and_not_cached(tmp_path, make_pdf, make_client):
+    pdf_path = make_pdf("Our Software Engineer works with a UX Designer.")
+    catalog = RoleCatalogIndex(["Software Engineer", "Project Manager"])
+    comparer = RoleComparer(fuzzy_threshold=80)
+    cache = ValidationResultCache(str(tmp_path / "validations.sqlite3"))
+
+    failing = RAGPDFExtractor(langchain_client=make_client(llm=_RateLimitedModel()))
+    result = validate_pdf(pdf_path, catalog, failing, comparer,
+                          result_cache=cache, xml_hash="xml")
+    assert result["status"] == "error"
+    assert cache.list_entries() == []
+
+    working = RAGPDFExtractor(langchain_client=make_client("Software Engineer, UX Designer"))
+    result = validate_pdf(pdf_path, catalog, working, comparer,
+                          result_cache=cache, xml_hash="xml")
+    assert result["status"] == "ok"
+    assert not result.get("cached")
+    assert result["pdf_roles"] == ["Software Engineer", "UX Designer"]
+    assert result["is_incorrect"] is True
+
+
+def test_put_ignores_error_results(tmp_path):
+    cache = ValidationResultCache(str(tmp_path / "validations.sqlite3"))
+    key = cache.make_key("xml", "//role/text()", "pdf", 80, "model", "settings")
+
+    cache.put(key, {"status": "error", "error": "boom"}, "xml", "//role/text()", "pdf", 80, "model")
+    cache.put(key, {"status": "ok", "error": "partial"}, "xml", "//role/text()", "pdf", 80, "model")
+
+    assert cache.get(key) is None
+
+
+def test_settings_hash_follows_the_extractor_not_the_global_config(make_client):
+    def settings_hash(**kwargs):
+        return extraction_settings_hash(RAGPDFExtractor(langchain_client=make_client(), **kwargs))
+
+    default = settings_hash()
+    assert settings_hash() == default
+    assert settings_hash(role_extraction_policy="gazetteer") != default
+    assert settings_hash(role_extraction_mode="map_reduce") != default
+    assert settings_hash(span_filter_enabled=True) != default
+
+
+def test_stored_model_is_the_extractors_model(tmp_path, make_pdf, make_client):
+    cache = ValidationResultCache(str(tmp_path / "validations.sqlite3"))
+    extractor = RAGPDFExtractor(langchain_client=make_client("Software Engineer"))
+    pdf_path = make_pdf("Our Software Engineer starts Monday.")
+
+    result = validate_pdf(pdf_path, RoleCatalogIndex(["Software Engineer"]), extractor,
+                          RoleComparer(), result_cache=cache, xml_hash="xml")
+
+    assert result["status"] == "ok"
+    assert [entry["model"] for entry in cache.list_entries()] == ["FakeListChatModel"]
+    assert extractor.langchain_client.model_name == "FakeListChatModel"
@@ -0,0 +1,133 @@
+# tests/test_xml_parser.py
+"""
+Tests for XML role extraction.
+"""
+
+import os
+
+import pytest
+
+from src.xml_parser import XmlRoleSource, extract_roles_from_xml, get_xml_statistics
+
+NESTED_MIXED = """<?xml version="1.0" encoding="UTF-8"?>
+<company>
+  <!-- Engineering -->
+  <department name="engineering">
+    <role>Software Engineer</role>
+    <role>Senior <b>Software</b> Engineer<i/> II</role>
+    <team>
+      <role>Lead <role>Data Scientist</role> Developer</role>
+      <role><!-- vacant --></role>
+    </team>
+    Remote <role>Project Manager</role> staff
+  </department>
+  <roles>
+    <role>  Quality Assurance  </role>
+    <role>Designer<?note draft?> Intern</role>
+  </roles>
+</company>
+"""
+
+XPATHS = [
+    "//role/text()",
+    "//team/role/text()",
+    "//department/role/text()",
+    "/company/roles/role/text()",
+    "/company/department/text()",
+]
+
+
+@pytest.fixture
+def nested_xml(tmp_path):
+    path = tmp_path / "nested.xml"
+    path.write_text(NESTED_MIXED, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("xpath", XPATHS)
+def test_streaming_matches_tree_on_nested_mixed_content(nested_xml, xpath):
+    tree_roles = extract_roles_from_xml(nested_xml, xpath, streaming=False)
+    streamed_roles = extract_roles_from_xml(nested_xml, xpath, streaming=True)
+
+    assert tree_roles
+    assert streamed_roles == tree_roles
+
+
+@pytest.mark.parametrize("xpath", XPATHS)
+def test_streaming_statistics_match_tree(nested_xml, xpath):
+    tree_stats = get_xml_statistics(nested_xml, xpath, streaming=False)
+    streamed_stats = get_xml_statistics(nested_xml, xpath, streaming=True)
+
+    assert streamed_stats == tree_stats
+
+
+def test_nested_roles_stream_in_document_order(nested_xml):
+    # A role nested in a role falls between its parent's text nodes
+    assert extract_roles_from_xml(nested_xml, "//role/text()", streaming=True) == [
+        "Software Engineer", "Senior", "Engineer", "II",
+        "Lead", "Data Scientist", "Developer",
+        "Project Manager", "Quality Assurance", "Designer", "Intern",
+    ]
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def test_source_reuses_parse_while_file_is_unchanged(make_xml):
+    source = XmlRoleSource(make_xml(["Software Engineer", "Data Scientist"]))
+
+    assert source.roles("//role/text()") == ["Software Engineer", "Data Scientist"]
+    assert source.is_well_formed()
+    source.statistics("//role/text()")
+    assert source.parse_count == 1
+
+
+def test_touched_file_with_identical_content_is_not_reparsed(make_xml):
+    xml_path = make_xml(["Software Engineer"])
+    source = XmlRoleSource(xml_path)
+    source.roles("//role/text()")
+
+    with open(xml_path, "rb") as f:
+        content = f.read()
+    with open(xml_path, "wb") as f:
+        f.write(content)
+    _bump_mtime(xml_path)
+
+    assert source.refresh() is False
+    assert source.roles("//role/text()") == ["Software Engineer"]
+    assert source.parse_count == 1
+
+
+@pytest.mark.parametrize("changed", ["mtime", "size"])
+def test_stat_change_alone_does_not_reparse(make_xml, monkeypatch, changed):
+    xml_path = make_xml(["Software Engineer"])
+    source = XmlRoleSource(xml_path)
+    source.roles("//role/text()")
+    mtime_ns, size = source._file_stat()
+
+    # The stat no longer matches the parse, but the content hash does
+    stat = (mtime_ns + 1, size) if changed == "mtime" else (mtime_ns, size + 1)
+    monkeypatch.setattr(source, "_file_stat", lambda: stat)
+
+    assert source.refresh() is False
+    assert source.parse_count == 1
+    # The new stat is remembered, so the file is not hashed again
+    monkeypatch.setattr("src.xml_parser.compute_file_hash", pytest.fail)
+    assert source.roles("//role/text()") == ["Software Engineer"]
+
+
+def test_changed_content_is_reparsed(make_xml):
+    xml_path = make_xml(["Software Engineer"])
+    source = XmlRoleSource(xml_path)
+    assert source.roles("//role/text()") == ["Software Engineer"]
+    stats = source.statistics("//role/text()")
+
+    # Same size as before, only the content and mtime differ
+    os.replace(make_xml(["Software Engineeq"], name="other.xml"), xml_path)
+    _bump_mtime(xml_path)
+
+    assert source.roles("//role/text()") == ["Software Engineeq"]
+    assert source.statistics("//role/text()") == stats
+    assert source.parse_count == 2